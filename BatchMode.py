@@ -0,0 +1,225 @@
+import json
+import multiprocessing
+import sys
+from collections import OrderedDict
+
+from DiscreteLog import discrete_log, kangaroo
+from ECPoint import ECPoint
+from ECPointInf import ECPointInf
+from EllipticCurve import EllipticCurve
+from FixedBase import default_cache as fixed_base_cache, fixed_base_mul
+from Tools import curve_order, find_prime_subgroups, is_prime, point_order
+
+# Число запросов, передаваемых рабочему процессу за раз.
+BATCH_CHUNK_SIZE = 16
+
+# Запрос mul переходит на таблицу фиксированной точки, когда её основание встретилось
+# столько раз: построение таблицы окупается лишь при повторных умножениях.
+FIXED_BASE_MIN_HITS = 3
+# Число оснований, для которых помнится счётчик умножений (LRU, в каждом процессе - свой).
+BASE_HITS_SIZE = 1024
+
+# Кривые, уже встречавшиеся в потоке запросов (в каждом процессе - свои).
+_curves = {}
+# Счётчики умножений по основаниям запросов mul: ключ FixedBaseCache.key -> число умножений.
+_base_hits = OrderedDict()
+
+
+def get_curve(params):
+    """
+    Возвращает кривую с параметрами (p, a, b), создавая её при первом обращении, чтобы
+    одинаковые кривые в разных строках разделяли кэши таблиц и инвариантов.
+    Как и при вводе кривой в диалоговом режиме, p должен быть простым (и больше 3):
+    над составным модулем подсчёт порядка даёт неверный ответ либо не завершается.
+    """
+    key = tuple(params)
+    # Проверка типов идёт до поиска в словаре: [97.0, 2, 3] равен ключу (97, 2, 3).
+    if len(key) != 3 or not all(_is_int(value) for value in key):
+        raise ValueError("Кривая задаётся тремя целыми числами [p, a, b].")
+    curve = _curves.get(key)
+    if curve is None:
+        if key[0] <= 3 or not is_prime(key[0]):
+            raise ValueError("p должен быть простым числом больше 3.")
+        curve = _curves[key] = EllipticCurve(*key)
+    return curve
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_int(request, name):
+    """
+    Проверяет, что поле name запроса (если оно задано) - целое число.
+    """
+    if name in request and not _is_int(request[name]):
+        raise ValueError(f"Поле {name} должно быть целым числом.")
+
+
+def decode_point(curve, value):
+    """
+    Точка из JSON: [x, y] либо null для бесконечно удалённой точки.
+    """
+    if value is None:
+        return ECPointInf(curve)
+    x, y = value
+    return ECPoint(curve, x, y)
+
+
+def encode_point(P):
+    return None if isinstance(P, ECPointInf) else [P.x, P.y]
+
+
+def _add(curve, request):
+    return encode_point(decode_point(curve, request['P']) + decode_point(curve, request['Q']))
+
+
+def _count_base(P):
+    """
+    Учитывает ещё одно умножение с основанием P и возвращает число таких умножений.
+    """
+    key = fixed_base_cache.key(P)
+    hits = _base_hits.pop(key, 0) + 1
+    _base_hits[key] = hits
+    while len(_base_hits) > BASE_HITS_SIZE:
+        _base_hits.popitem(last=False)
+    return hits
+
+
+def _mul(curve, request):
+    """
+    Разовые умножения выполняются через wNAF (k * P); таблица фиксированной точки
+    строится, только если основание повторяется (FIXED_BASE_MIN_HITS раз) или
+    запрос явно просит её полем "fixed_base": true.
+    """
+    P = decode_point(curve, request['P'])
+    _check_int(request, 'k')
+    k = request['k']
+    if isinstance(P, ECPointInf):
+        return None
+    hits = _count_base(P)
+    if request.get('fixed_base') or hits >= FIXED_BASE_MIN_HITS or P in fixed_base_cache:
+        return encode_point(fixed_base_mul(P, k))
+    return encode_point(k * P)
+
+
+def _order(curve, request):
+    if 'P' not in request:
+        return curve_order(curve)
+    return point_order(decode_point(curve, request['P']))
+
+
+def _subgroups(curve, request):
+    return [{'order': len(subgroup), 'generator': encode_point(subgroup.generator)}
+            for subgroup in find_prime_subgroups(curve, lazy=True)]
+
+
+def _dlog(curve, request):
+    P = decode_point(curve, request['P'])
+    Q = decode_point(curve, request['Q'])
+    _check_int(request, 'n')
+    if 'interval' in request:
+        interval = request['interval']
+        if not isinstance(interval, list) or len(interval) != 2 or not all(map(_is_int, interval)):
+            raise ValueError("Поле interval должно быть парой целых чисел [a, b].")
+        lower, upper = interval
+        return kangaroo(curve, P, Q, lower, upper)
+    return discrete_log(curve, P, Q, request.get('n'))
+
+
+OPERATIONS = {
+    'add': _add,
+    'mul': _mul,
+    'order': _order,
+    'subgroups': _subgroups,
+    'dlog': _dlog,
+}
+
+
+def handle(request):
+    """
+    Выполняет один запрос и возвращает ответ в виде словаря.
+
+    Запрос: {"id": ..., "op": "add" | "mul" | "order" | "subgroups" | "dlog",
+    "curve": [p, a, b], ...}, точки - [x, y] или null. Поля операций:
+      add - P, Q; mul - P, k и необязательный fixed_base; order - P (без P - порядок кривой);
+      subgroups - без полей; dlog - P, Q и необязательные n либо interval [a, b].
+    Ответ: {"id": ..., "result": ...} либо {"id": ..., "error": "..."}.
+    """
+    response = {'id': request.get('id')}
+    try:
+        operation = OPERATIONS.get(request.get('op'))
+        if operation is None:
+            raise ValueError(f"Неизвестная операция: {request.get('op')!r}.")
+        if request.get('curve') is None:
+            raise ValueError("Не задана кривая.")
+        response['result'] = operation(get_curve(request['curve']), request)
+    except Exception as error:
+        # Любая ошибка отдельного запроса становится его ответом и не прерывает поток.
+        response['error'] = str(error) or type(error).__name__
+    return response
+
+
+def read_requests(lines):
+    """
+    Разбирает строки JSON Lines. Пустые строки пропускаются; запрос без поля curve
+    использует кривую предыдущего запроса. Выдаёт пары (запрос, None), а для строк
+    с ошибкой разбора - (None, готовый ответ с ошибкой).
+    """
+    curve = None
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield None, {'id': None, 'line': number, 'error': f"Некорректный JSON: {error}"}
+            continue
+        if not isinstance(request, dict):
+            yield None, {'id': None, 'line': number, 'error': "Запрос должен быть объектом JSON."}
+            continue
+        if 'curve' in request:
+            curve = request['curve']
+        else:
+            request['curve'] = curve
+        yield request, None
+
+
+def _handle_or_report(item):
+    request, failure = item
+    return failure if request is None else handle(request)
+
+
+def process_stream(lines, output, workers=None):
+    """
+    Выполняет поток запросов из lines и пишет ответы в output по мере готовности,
+    по одной строке JSON на запрос. При workers > 1 запросы распределяются по пулу
+    процессов, и ответы могут идти не в порядке запросов (их связывает поле id).
+    Возвращает число обработанных запросов.
+    """
+    requests = read_requests(lines)
+    count = 0
+    if workers is not None and workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            for response in pool.imap_unordered(_handle_or_report, requests, BATCH_CHUNK_SIZE):
+                output.write(json.dumps(response, ensure_ascii=False) + '\n')
+                output.flush()
+                count += 1
+        return count
+    for item in requests:
+        output.write(json.dumps(_handle_or_report(item), ensure_ascii=False) + '\n')
+        output.flush()
+        count += 1
+    return count
+
+
+def run(path=None, workers=None, output=None):
+    """
+    Пакетный режим: читает запросы из файла path (или из stdin при path=None или '-').
+    """
+    output = output if output is not None else sys.stdout
+    if path is None or path == '-':
+        return process_stream(sys.stdin, output, workers)
+    with open(path, encoding='utf-8') as lines:
+        return process_stream(lines, output, workers)
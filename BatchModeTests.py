@@ -0,0 +1,101 @@
+from BatchMode import OPERATIONS, process_stream, handle, get_curve
+from EllipticCurve import EllipticCurve
+from ECPoint import ECPoint
+from Tools import curve_order, find_points, point_order
+import io
+import json
+
+
+def run_lines(requests, workers=None):
+    lines = [json.dumps(r) if not isinstance(r, str) else r for r in requests]
+    output = io.StringIO()
+    count = process_stream(lines, output, workers)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert count == len(responses)
+    return {response['id']: response for response in responses}
+
+
+REQUESTS = [
+    {'id': 1, 'op': 'add', 'curve': [97, 2, 3], 'P': [3, 6], 'Q': [3, 91]},
+    {'id': 2, 'op': 'mul', 'P': [3, 6], 'k': 2},
+    {'id': 3, 'op': 'order', 'P': [3, 6]},
+    {'id': 4, 'op': 'order'},
+    {'id': 5, 'op': 'subgroups', 'curve': [101, 1, 1]},
+    {'id': 6, 'op': 'dlog', 'curve': [97, 2, 3], 'P': [3, 6], 'Q': [80, 10]},
+    {'id': 7, 'op': 'dlog', 'P': [3, 6], 'Q': [80, 10], 'interval': [0, 4]},
+    {'id': 8, 'op': 'nope'},
+    {'id': 9, 'op': 'add', 'P': [1, 1], 'Q': None},
+]
+
+
+def check(responses):
+    curve = EllipticCurve(97, 2, 3)
+    P = ECPoint(curve, 3, 6)
+    assert responses[1]['result'] is None
+    assert responses[2]['result'] == [(2 * P).x, (2 * P).y]
+    assert responses[3]['result'] == point_order(P) == 5
+    assert responses[4]['result'] == curve_order(curve)
+    assert [g['order'] for g in responses[5]['result']] == [3, 5, 7]
+    assert responses[6]['result'] == responses[7]['result'] == 2
+    assert 'error' in responses[8] and 'error' in responses[9]
+
+
+def test_process_stream():
+    check(run_lines(REQUESTS))
+
+
+def test_process_stream_pool():
+    check(run_lines(REQUESTS, workers=2))
+
+
+def test_malformed_lines_and_curve_reuse():
+    output = io.StringIO()
+    process_stream(['', 'not json', '[1, 2]'], output)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [r['line'] for r in responses] == [2, 3]
+    assert get_curve([97, 2, 3]) is get_curve((97, 2, 3))
+    assert 'error' in handle({'id': 1, 'op': 'order', 'curve': None})
+
+
+def test_unexpected_errors_do_not_stop_stream(monkeypatch):
+    def broken(curve, request):
+        raise OverflowError("переполнение")
+    monkeypatch.setitem(OPERATIONS, 'broken', broken)
+    responses = run_lines([
+        {'id': 1, 'op': 'broken', 'curve': [97, 2, 3]},
+        {'id': 2, 'op': 'add', 'P': {'x': 3}, 'Q': None},
+        {'id': 3, 'op': 'add', 'P': [3, 6], 'Q': None},
+    ])
+    assert responses[1]['error'] == "переполнение"
+    assert 'error' in responses[2]
+    assert responses[3]['result'] == [3, 6]
+
+
+def test_mul_uses_fixed_base_only_for_repeated_bases():
+    from BatchMode import FIXED_BASE_MIN_HITS
+    from FixedBase import default_cache, evict_fixed_base
+    curve = EllipticCurve(1009, 2, 3)
+    P = find_points(curve)[7]
+    evict_fixed_base()
+    for k in range(1, FIXED_BASE_MIN_HITS):
+        assert handle({'op': 'mul', 'curve': [1009, 2, 3], 'P': [P.x, P.y], 'k': k})['result'] == [(k * P).x, (k * P).y]
+        assert P not in default_cache  # разовые умножения идут через wNAF
+    k = FIXED_BASE_MIN_HITS
+    assert handle({'op': 'mul', 'curve': [1009, 2, 3], 'P': [P.x, P.y], 'k': k})['result'] == [(k * P).x, (k * P).y]
+    assert P in default_cache
+    Q = 2 * P
+    handle({'op': 'mul', 'curve': [1009, 2, 3], 'P': [Q.x, Q.y], 'k': 5, 'fixed_base': True})
+    assert Q in default_cache
+    evict_fixed_base()
+
+
+def test_rejects_composite_modulus_and_bad_scalars():
+    for params in ([15, 1, 1], [10001 * 10007, 1, 1], [3, 1, 1], [97.0, 2, 3], [97, 2]):
+        response = handle({'id': 1, 'op': 'order', 'curve': params})
+        assert 'error' in response and 'result' not in response
+    base = {'curve': [97, 2, 3], 'P': [3, 6]}
+    assert 'error' in handle(dict(base, op='mul', k=1.5))
+    assert 'error' in handle(dict(base, op='mul', k='7'))
+    assert 'error' in handle(dict(base, op='dlog', Q=[80, 10], n=5.0))
+    assert 'error' in handle(dict(base, op='dlog', Q=[80, 10], interval=[0, 4.5]))
+    assert 'error' in handle(dict(base, op='dlog', Q=[80, 10], interval=[0]))
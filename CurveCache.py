@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+# Версия формата записей: записи другой версии считаются устаревшими и пересчитываются.
+CACHE_VERSION = 1
+# Число кривых, хранимых в памяти.
+CURVE_CACHE_SIZE = 256
+# Переменная окружения с путём к файлу sqlite; если она не задана, кэш только в памяти.
+CACHE_PATH_ENV = 'ELLIPTIC_CURVES_CACHE'
+
+
+class CurveCache:
+    """
+    Кэш инвариантов кривых (порядок группы, его разложение, образующие подгрупп и т. п.)
+    с ключом (p, a, b).
+
+    Первый уровень - LRU-словарь в памяти на memory_size кривых, второй (необязательный) -
+    файл sqlite по пути path, переживающий перезапуски. Каждое значение хранится под
+    своим именем в виде JSON вместе с версией формата CACHE_VERSION; записи другой
+    версии игнорируются. Значения должны сериализоваться в JSON (словари с
+    нестроковыми ключами следует передавать списками пар).
+
+    Соединение с sqlite открывается при первом обращении к файлу и заново открывается
+    в процессе, порождённом fork: соединение sqlite нельзя использовать после fork,
+    а пулы процессов DiscreteLog и BatchMode наследуют общий кэш.
+    """
+    def __init__(self, memory_size=CURVE_CACHE_SIZE, path=None):
+        self.memory_size = memory_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._db = None
+        self._pid = None
+
+    def _connection(self):
+        """
+        Соединение с файлом кэша (None, если файл не задан), открытое в текущем процессе.
+        """
+        if self.path is None:
+            return None
+        if self._db is None or self._pid != os.getpid():
+            # Соединение, унаследованное от родительского процесса, не закрывается:
+            # им продолжает пользоваться родитель.
+            self._db = sqlite3.connect(self.path)
+            self._pid = os.getpid()
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS invariants ("
+                "p TEXT, a TEXT, b TEXT, name TEXT, version INTEGER, value TEXT, "
+                "PRIMARY KEY (p, a, b, name))")
+            self._db.commit()
+        return self._db
+
+    @staticmethod
+    def key(curve):
+        return (curve.p, curve.a, curve.b)
+
+    def _entries(self, curve):
+        key = self.key(curve)
+        entries = self._memory.get(key)
+        if entries is None:
+            entries = self._memory[key] = {}
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+        else:
+            self._memory.move_to_end(key)
+        return entries
+
+    def get(self, curve, name, default=None):
+        """
+        Возвращает значение name для кривой либо default, если его нет ни в памяти, ни в файле.
+        """
+        entries = self._entries(curve)
+        if name in entries:
+            self.hits += 1
+            return entries[name]
+        db = self._connection()
+        if db is not None:
+            row = db.execute(
+                "SELECT version, value FROM invariants WHERE p = ? AND a = ? AND b = ? AND name = ?",
+                tuple(map(str, self.key(curve))) + (name,)).fetchone()
+            if row is not None and row[0] == CACHE_VERSION:
+                self.hits += 1
+                entries[name] = value = json.loads(row[1])
+                return value
+        self.misses += 1
+        return default
+
+    def put(self, curve, name, value):
+        """
+        Сохраняет значение name для кривой в памяти и, если задан файл, на диске.
+        """
+        self._entries(curve)[name] = value
+        db = self._connection()
+        if db is not None:
+            db.execute(
+                "INSERT OR REPLACE INTO invariants VALUES (?, ?, ?, ?, ?, ?)",
+                tuple(map(str, self.key(curve))) + (name, CACHE_VERSION, json.dumps(value)))
+            db.commit()
+        return value
+
+    def invalidate(self, curve=None, name=None):
+        """
+        Удаляет значение name кривой, все значения кривой (name=None)
+        либо весь кэш (curve=None) - в памяти и на диске.
+        """
+        db = self._connection()
+        if curve is None:
+            self._memory.clear()
+            if db is not None:
+                db.execute("DELETE FROM invariants")
+                db.commit()
+            return
+        key = self.key(curve)
+        if name is None:
+            self._memory.pop(key, None)
+        else:
+            self._memory.get(key, {}).pop(name, None)
+        if db is not None:
+            query = "DELETE FROM invariants WHERE p = ? AND a = ? AND b = ?"
+            args = tuple(map(str, key))
+            if name is not None:
+                query += " AND name = ?"
+                args += (name,)
+            db.execute(query, args)
+            db.commit()
+
+    def close(self):
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+    def __len__(self):
+        return len(self._memory)
+
+
+default_cache = CurveCache(path=os.environ.get(CACHE_PATH_ENV))
+
+
+def configure(path=None, memory_size=CURVE_CACHE_SIZE):
+    """
+    Заменяет общий кэш новым: path - файл sqlite для хранения между запусками
+    (None - только память). Возвращает новый кэш.
+    """
+    global default_cache
+    default_cache.close()
+    default_cache = CurveCache(memory_size, path)
+    return default_cache
+
+
+def get_cache():
+    return default_cache
@@ -0,0 +1,493 @@
+import math
+import multiprocessing
+import os
+import queue
+import random
+import time
+
+from ECPoint import ECPoint, mod_inverse
+from ECPointInf import ECPointInf
+from EllipticCurve import EllipticCurve
+from Tools import bsgs, factorize, point_order
+
+# Подгруппы простого порядка меньше этого порога решаются алгоритмом bsgs,
+# большие - ро-методом Полларда.
+BSGS_THRESHOLD = 2**12
+# Число ветвей r-аддитивного случайного блуждания.
+RHO_PARTITIONS = 20
+# Предел числа шагов параллельного ро-метода: RHO_STEP_FACTOR * sqrt(n) плюс запас
+# на путь каждого процесса до отличительной точки. Ожидаемое число шагов - около 1.25 * sqrt(n).
+RHO_STEP_FACTOR = 32
+# Предел числа прыжков параллельного метода кенгуру: KANGAROO_STEP_FACTOR * sqrt(ширины)
+# плюс запас на путь каждого кенгуру до отличительной точки. Ожидаемое число
+# прыжков при решении в отрезке - около 2 * sqrt(ширины).
+KANGAROO_STEP_FACTOR = 32
+
+
+def point_key(P):
+    """
+    Ключ точки для сравнений и словарей: координаты либо None для бесконечно удалённой точки.
+    """
+    return None if isinstance(P, ECPointInf) else (P.x, P.y)
+
+
+def pollard_rho(curve, P, Q, n, partitions=RHO_PARTITIONS, max_restarts=50):
+    """
+    Ро-метод Полларда для дискретного логарифма в подгруппе простого порядка n:
+    ищет d, такое что d * P = Q.
+
+    Используется r-аддитивное блуждание X -> X + R_i, где R_i = a_i * P + b_i * Q,
+    а ветвь i выбирается по абсциссе X. Точка X всегда хранится вместе с
+    коэффициентами (a, b), X = a * P + b * Q; цикл находится методом Брента,
+    после чего d получается из равенства двух представлений одной точки.
+    Память постоянна. Если Q не лежит в подгруппе, порождённой P, возвращается None.
+    """
+    if not isinstance(n * Q, ECPointInf):
+        return None
+    if isinstance(Q, ECPointInf):
+        return 0
+    for _ in range(max_restarts):
+        coefficients = [(random.randrange(n), random.randrange(n)) for _ in range(partitions)]
+        steps = [a * P + b * Q for a, b in coefficients]
+
+        def walk(state):
+            X, a, b = state
+            i = 0 if isinstance(X, ECPointInf) else X.x % partitions
+            da, db = coefficients[i]
+            return X + steps[i], (a + da) % n, (b + db) % n
+
+        a0, b0 = random.randrange(n), random.randrange(n)
+        tortoise = (a0 * P + b0 * Q, a0, b0)
+        hare = walk(tortoise)
+        power = length = 1
+        while point_key(tortoise[0]) != point_key(hare[0]):
+            if power == length:
+                tortoise = hare
+                power *= 2
+                length = 0
+            hare = walk(hare)
+            length += 1
+        _, a1, b1 = tortoise
+        _, a2, b2 = hare
+        if (b1 - b2) % n == 0:
+            continue  # вырожденное совпадение - повторяем с новым блужданием
+        d = ((a2 - a1) * mod_inverse(b1 - b2, n)) % n
+        if point_key(d * P) == point_key(Q):
+            return d
+    return None
+
+
+class RhoStatistics:
+    """
+    Счётчики параллельного ро-метода: число шагов блужданий, число
+    отличительных точек, время работы и производительность.
+    """
+    def __init__(self, workers, dp_bits):
+        self.workers = workers
+        self.dp_bits = dp_bits
+        self.steps = 0
+        self.distinguished = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.finished = False
+
+    @property
+    def steps_per_second(self):
+        return self.steps / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'workers': self.workers,
+            'dp_bits': self.dp_bits,
+            'steps': self.steps,
+            'distinguished': self.distinguished,
+            'elapsed': self.elapsed,
+            'steps_per_second': self.steps_per_second,
+            'finished': self.finished,
+        }
+
+
+def _rho_worker(curve_params, P_xy, Q_xy, n, coefficients, dp_bits, seed, report_every, results, stop):
+    """
+    Рабочий процесс параллельного ро-метода: выполняет независимые блуждания
+    из случайных точек a * P + b * Q и отправляет сборщику отличительные точки
+    (абсцисса которых делится на 2^dp_bits), после каждой начиная новое блуждание.
+    """
+    curve = EllipticCurve(*curve_params)
+    P = ECPoint(curve, *P_xy)
+    Q = ECPoint(curve, *Q_xy)
+    steps = [a * P + b * Q for a, b in coefficients]
+    partitions = len(coefficients)
+    mask = (1 << dp_bits) - 1
+    max_walk = 20 << dp_bits  # блуждание, зациклившееся без отличительных точек, перезапускается
+    rng = random.Random(seed)
+    counted = 0
+    while not stop.is_set():
+        a, b = rng.randrange(n), rng.randrange(n)
+        X = a * P + b * Q
+        for _ in range(max_walk):
+            if isinstance(X, ECPointInf):
+                break
+            i = X.x % partitions
+            da, db = coefficients[i]
+            X = X + steps[i]
+            a, b = (a + da) % n, (b + db) % n
+            counted += 1
+            if not isinstance(X, ECPointInf) and X.x & mask == 0:
+                results.put(('dp', X.x, X.y, a, b, counted))
+                counted = 0
+                break
+            if counted >= report_every:
+                results.put(('steps', counted))
+                counted = 0
+                if stop.is_set():
+                    return
+
+
+def parallel_pollard_rho(curve, P, Q, n, workers=None, dp_bits=None, partitions=RHO_PARTITIONS,
+                         progress=None, timeout=None, report_every=10000, max_steps=None):
+    """
+    Параллельный ро-метод Полларда с отличительными точками (ван Ооршот - Винер)
+    для подгруппы простого порядка n: ищет d, такое что d * P = Q.
+
+    Рабочие процессы (по умолчанию по числу ядер) ведут независимые r-аддитивные
+    блуждания с общими ветвями R_i = a_i * P + b_i * Q и сообщают сборщику точки,
+    абсцисса которых делится на 2^dp_bits. Как только одна отличительная точка
+    получена из двух разных представлений a * P + b * Q, логарифм найден.
+    Каждый процесс хранит лишь текущую точку, сборщик - около sqrt(n) / 2^dp_bits точек,
+    поэтому скорость растёт почти линейно с числом процессов.
+
+    progress -- необязательная функция, получающая RhoStatistics при каждом обновлении
+    счётчиков и по завершении. timeout -- предельное время работы в секундах.
+    max_steps -- предельное суммарное число шагов всех процессов (по умолчанию
+    RHO_STEP_FACTOR * sqrt(n) с запасом на отличительные точки): так, если Q
+    проходит проверку n * Q = O, но не лежит в <P>, поиск завершается, как
+    и у pollard_rho после max_restarts перезапусков.
+    Возвращает d либо None, если Q не лежит в подгруппе, предел шагов исчерпан
+    или время истекло.
+    """
+    if not isinstance(n * Q, ECPointInf):
+        return None
+    if isinstance(Q, ECPointInf):
+        return 0
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if dp_bits is None:
+        dp_bits = n.bit_length() // 4
+    if max_steps is None:
+        max_steps = RHO_STEP_FACTOR * (math.isqrt(n) + 1) + (8 * workers << dp_bits)
+    stats = RhoStatistics(workers, dp_bits)
+    coefficients = [(random.randrange(n), random.randrange(n)) for _ in range(partitions)]
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    stop = context.Event()
+    args = ((curve.p, curve.a, curve.b), (P.x, P.y), (Q.x, Q.y), n, coefficients, dp_bits)
+    processes = [context.Process(target=_rho_worker,
+                                 args=args + (random.getrandbits(64), report_every, results, stop),
+                                 daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    seen = {}
+    d = None
+    try:
+        while d is None:
+            stats.elapsed = time.perf_counter() - stats.started
+            if timeout is not None and stats.elapsed > timeout:
+                break
+            if stats.steps > max_steps:
+                break
+            try:
+                message = results.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if message[0] == 'steps':
+                stats.steps += message[1]
+            else:
+                _, x, y, a, b, counted = message
+                stats.steps += counted
+                stats.distinguished += 1
+                if (x, y) in seen:
+                    a2, b2 = seen[(x, y)]
+                    if (b - b2) % n:
+                        candidate = ((a2 - a) * mod_inverse(b - b2, n)) % n
+                        if point_key(candidate * P) == point_key(Q):
+                            d = candidate
+                else:
+                    seen[(x, y)] = (a, b)
+            if progress is not None:
+                progress(stats)
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        results.close()
+        results.cancel_join_thread()
+    stats.elapsed = time.perf_counter() - stats.started
+    stats.finished = True
+    if progress is not None:
+        progress(stats)
+    return d
+
+
+def _kangaroo_jumps(width, kangaroos):
+    """
+    Длины прыжков кенгуру - степени двойки 1, 2, ..., 2^(k-1); k выбирается так,
+    чтобы средняя длина прыжка была не меньше kangaroos * sqrt(width) / 4.
+    """
+    target = max(1, kangaroos * math.isqrt(width) // 4)
+    k = 1
+    while ((1 << k) - 1) // k < target:
+        k += 1
+    return [1 << i for i in range(k)]
+
+
+def _jump_index(X, k):
+    return 0 if isinstance(X, ECPointInf) else X.x % k
+
+
+def kangaroo(curve, P, Q, lower, upper, workers=None, dp_bits=None, max_attempts=8,
+             progress=None, timeout=None, max_steps=None):
+    """
+    Лямбда-метод (метод кенгуру) Полларда: ищет d из отрезка [lower, upper],
+    такое что d * P = Q.
+
+    Ручной кенгуру стартует из upper * P и делает около 2 * sqrt(upper - lower)
+    псевдослучайных прыжков X -> X + s_i * P (длина s_i выбирается по абсциссе X),
+    оставляя в конце ловушку с известным логарифмом. Дикий кенгуру стартует из Q
+    и прыгает по тем же правилам; попав на след ручного, он приходит в ловушку,
+    и d получается из пройденных расстояний. Время O(sqrt(upper - lower)), память O(1).
+    При неудаче попытка повторяется с перемешанными длинами прыжков.
+
+    При workers > 1 используется параллельный вариант (parallel_kangaroo).
+    Возвращает d либо None, если в отрезке решения нет.
+    """
+    if workers is not None and workers > 1:
+        return parallel_kangaroo(curve, P, Q, lower, upper, workers, dp_bits,
+                                 progress=progress, timeout=timeout, max_steps=max_steps)
+    width = upper - lower
+    if width < 0:
+        raise ValueError("Нижняя граница отрезка больше верхней.")
+    target = point_key(Q)
+    if width < 16:
+        X = lower * P
+        for d in range(lower, upper + 1):
+            if point_key(X) == target:
+                return d
+            X = X + P
+        return None
+    sizes = _kangaroo_jumps(width, 1)
+    k = len(sizes)
+    for _ in range(max_attempts):
+        random.shuffle(sizes)
+        jumps = [s * P for s in sizes]
+        # Ручной кенгуру: около 2 * sqrt(width) прыжков, считая от upper * P.
+        T = upper * P
+        tame = 0
+        for _ in range(2 * math.isqrt(width) + 1):
+            i = _jump_index(T, k)
+            T = T + jumps[i]
+            tame += sizes[i]
+        trap = point_key(T)
+        # Дикий кенгуру: от Q, пока не пройдёт мимо ловушки.
+        W = Q
+        wild = 0
+        while wild <= width + tame:
+            if point_key(W) == trap:
+                d = upper + tame - wild
+                if point_key(d * P) == target:
+                    return d
+                break
+            i = _jump_index(W, k)
+            W = W + jumps[i]
+            wild += sizes[i]
+    return None
+
+
+TAME, WILD = 0, 1
+
+
+def _kangaroo_worker(curve_params, P_xy, Q_xy, lower, width, sizes, dp_bits, herd, seed,
+                     report_every, results, commands, stop):
+    """
+    Рабочий процесс параллельного метода кенгуру: ведёт стадо ручных
+    (X = e * P) либо диких (X = Q + e * P) кенгуру, по очереди делая ими прыжки,
+    и сообщает сборщику отличительные точки вместе с показателем e. По команде
+    сборщика кенгуру, попавший на след своего же стада, переносится в новую точку.
+    """
+    curve = EllipticCurve(*curve_params)
+    P = ECPoint(curve, *P_xy)
+    Q = ECPoint(curve, *Q_xy)
+    jumps = [s * P for s in sizes]
+    k = len(sizes)
+    mask = (1 << dp_bits) - 1
+    rng = random.Random(seed)
+
+    def spawn():
+        if herd == TAME:
+            e = lower + rng.randrange(width + 1)
+            return e * P, e
+        e = rng.randrange(width // 2 + 1)
+        return Q + e * P, e
+
+    kangaroos = [spawn() for _ in range(2)]
+    counted = 0
+    while not stop.is_set():
+        for index, (X, e) in enumerate(kangaroos):
+            i = _jump_index(X, k)
+            X = X + jumps[i]
+            e += sizes[i]
+            kangaroos[index] = (X, e)
+            counted += 1
+            if not isinstance(X, ECPointInf) and X.x & mask == 0:
+                results.put(('dp', X.x, X.y, herd, e, seed, index, counted))
+                counted = 0
+        if counted >= report_every:
+            results.put(('steps', counted))
+            counted = 0
+            try:
+                while True:
+                    index = commands.get_nowait()
+                    kangaroos[index] = spawn()
+            except queue.Empty:
+                pass
+
+
+def parallel_kangaroo(curve, P, Q, lower, upper, workers=None, dp_bits=None,
+                      progress=None, timeout=None, report_every=1000, max_steps=None):
+    """
+    Параллельный метод кенгуру с отличительными точками (ван Ооршот - Винер):
+    ищет d из отрезка [lower, upper], такое что d * P = Q.
+
+    Половина рабочих процессов ведёт ручных кенгуру со случайными стартами
+    e * P, e из [lower, upper], вторая половина - диких, стартующих из Q + e * P.
+    Все прыгают по общим правилам и сообщают точки, абсцисса которых делится
+    на 2^dp_bits. Встреча ручного и дикого кенгуру в одной отличительной точке
+    даёт d = e_ручного - e_дикого; кенгуру, догнавший своё же стадо, перезапускается.
+
+    progress и timeout - как у parallel_pollard_rho. Поиск прекращается, когда
+    суммарное число прыжков всех кенгуру превысит max_steps (по умолчанию
+    KANGAROO_STEP_FACTOR * sqrt(upper - lower) с запасом на отличительные точки):
+    так, как и у последовательного варианта, отсутствие решения в отрезке
+    не приводит к бесконечному поиску. Возвращает d либо None, если решение
+    не найдено за max_steps прыжков или за время timeout.
+    """
+    width = upper - lower
+    if width < 0:
+        raise ValueError("Нижняя граница отрезка больше верхней.")
+    if isinstance(Q, ECPointInf) or width < 16:
+        return kangaroo(curve, P, Q, lower, upper)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(2, workers)
+    if dp_bits is None:
+        dp_bits = max(0, width.bit_length() // 4 - 1)
+    if max_steps is None:
+        max_steps = KANGAROO_STEP_FACTOR * (math.isqrt(width) + 1) + (8 * workers << dp_bits)
+    stats = RhoStatistics(workers, dp_bits)
+    sizes = _kangaroo_jumps(width, 2 * workers)
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    stop = context.Event()
+    args = ((curve.p, curve.a, curve.b), (P.x, P.y), (Q.x, Q.y), lower, width, sizes, dp_bits)
+    processes = []
+    channels = {}
+    for worker in range(workers):
+        seed = random.getrandbits(64)
+        channels[seed] = context.Queue()
+        processes.append(context.Process(
+            target=_kangaroo_worker,
+            args=args + (worker % 2, seed, report_every, results, channels[seed], stop),
+            daemon=True))
+    for process in processes:
+        process.start()
+    seen = {}
+    target = point_key(Q)
+    d = None
+    try:
+        while d is None:
+            stats.elapsed = time.perf_counter() - stats.started
+            if timeout is not None and stats.elapsed > timeout:
+                break
+            if stats.steps > max_steps:
+                break
+            try:
+                message = results.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if message[0] == 'steps':
+                stats.steps += message[1]
+            else:
+                _, x, y, herd, e, seed, index, counted = message
+                stats.steps += counted
+                stats.distinguished += 1
+                if (x, y) not in seen:
+                    seen[(x, y)] = (herd, e)
+                    continue
+                herd2, e2 = seen[(x, y)]
+                if herd2 == herd:
+                    channels[seed].put(index)  # след своего стада - перезапуск
+                    continue
+                candidate = e - e2 if herd == TAME else e2 - e
+                if lower <= candidate <= upper and point_key(candidate * P) == target:
+                    d = candidate
+            if progress is not None:
+                progress(stats)
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        for channel in list(channels.values()) + [results]:
+            channel.close()
+            channel.cancel_join_thread()
+    stats.elapsed = time.perf_counter() - stats.started
+    stats.finished = True
+    if progress is not None:
+        progress(stats)
+    return d
+
+
+def _prime_order_log(curve, P, Q, q, bsgs_threshold, workers):
+    if q < bsgs_threshold:
+        return bsgs(curve, P, Q, q)
+    if workers is not None and workers > 1:
+        return parallel_pollard_rho(curve, P, Q, q, workers)
+    return pollard_rho(curve, P, Q, q)
+
+
+def discrete_log(curve, P, Q, n=None, bsgs_threshold=BSGS_THRESHOLD, workers=None):
+    """
+    Решает задачу дискретного логарифма d * P = Q методом Полига-Хеллмана.
+
+    Порядок n точки P (если не задан, вычисляется point_order) раскладывается
+    на простые множители q^e. Для каждого из них d mod q^e находится по цифрам
+    в системе счисления с основанием q, каждая цифра - логарифм в подгруппе простого
+    порядка q (bsgs для малых q, ро-метод Полларда для больших; при workers > 1 -
+    параллельный ро-метод). Результаты объединяются по китайской теореме об остатках.
+    Если Q не лежит в подгруппе, порождённой P, возвращается None.
+    """
+    if n is None:
+        n = point_order(P)
+    residues = []
+    for q, e in factorize(n).items():
+        generator = (n // q) * P  # точка порядка q
+        d_q = 0
+        for j in range(e):
+            # Q_j = (n / q^(j+1)) * (Q - d_q * P) лежит в подгруппе порядка q
+            target = (n // q ** (j + 1)) * (Q + (-d_q) * P)
+            digit = _prime_order_log(curve, generator, target, q, bsgs_threshold, workers)
+            if digit is None:
+                return None
+            d_q += digit * q ** j
+        residues.append((d_q, q ** e))
+    d = 0
+    for r, m in residues:
+        M = n // m
+        d = (d + r * M * mod_inverse(M, m)) % n
+    if point_key(d * P) != point_key(Q):
+        return None
+    return d
@@ -0,0 +1,109 @@
+from EllipticCurve import EllipticCurve
+from DiscreteLog import discrete_log, kangaroo, parallel_kangaroo, pollard_rho, parallel_pollard_rho
+from PointCounting import random_point
+from Tools import find_points, point_order, curve_order_factorization, bsgs
+import random
+import pytest
+
+# Кривая над 40-битным полем порядка 2^2 * 5 * 4289 * 12817811.
+CURVE = EllipticCurve(1099511627791, 3, 7)
+LARGE_PRIME = 12817811
+
+
+def test_discrete_log_small_curve():
+    curve = EllipticCurve(97, 2, 3)
+    for P in find_points(curve)[1:20]:
+        n = point_order(P)
+        for d in range(0, n, 7):
+            assert discrete_log(curve, P, d * P) == d
+            assert discrete_log(curve, P, d * P, n, bsgs_threshold=0) == d
+
+
+def test_pollard_rho_prime_subgroup():
+    random.seed(2)
+    order, _ = curve_order_factorization(CURVE)
+    G = (order // LARGE_PRIME) * random_point(CURVE)
+    assert point_order(G) == LARGE_PRIME
+    d = random.randrange(LARGE_PRIME)
+    assert pollard_rho(CURVE, G, d * G, LARGE_PRIME) == d
+
+
+def test_discrete_log_pohlig_hellman():
+    random.seed(3)
+    P = random_point(CURVE)
+    n = point_order(P)
+    d = random.randrange(n)
+    assert discrete_log(CURVE, P, d * P) == d
+    # bsgs остаётся доступен для малых подгрупп.
+    G = (n // 4289) * P
+    assert bsgs(CURVE, G, 1234 * G) == 1234
+
+
+def test_discrete_log_not_in_subgroup():
+    curve = EllipticCurve(97, 2, 3)
+    points = find_points(curve)[1:]
+    P = next(P for P in points if point_order(P) == 2)
+    Q = next(Q for Q in points if point_order(Q) > 2)
+    assert discrete_log(curve, P, Q) is None
+
+
+def test_parallel_pollard_rho():
+    random.seed(4)
+    order, _ = curve_order_factorization(CURVE)
+    G = (order // LARGE_PRIME) * random_point(CURVE)
+    d = random.randrange(LARGE_PRIME)
+    updates = []
+    assert parallel_pollard_rho(CURVE, G, d * G, LARGE_PRIME, workers=2, dp_bits=4,
+                                progress=updates.append) == d
+    stats = updates[-1]
+    assert stats.finished and stats.workers == 2 and stats.dp_bits == 4
+    assert stats.distinguished > 0 and stats.steps >= stats.distinguished
+    assert stats.as_dict()['steps_per_second'] > 0
+
+
+def test_parallel_pollard_rho_not_in_subgroup():
+    random.seed(5)
+    order, _ = curve_order_factorization(CURVE)
+    G = (order // LARGE_PRIME) * random_point(CURVE)
+    assert parallel_pollard_rho(CURVE, G, random_point(CURVE), LARGE_PRIME, workers=2) is None
+
+
+def test_parallel_pollard_rho_outside_cyclic_subgroup():
+    # 3-примарная часть кривой - Z3 × Z3: 3 * Q = O, но Q не лежит в <P>,
+    # и поиск должен завершиться по пределу шагов.
+    curve = EllipticCurve(13, 7, 0)
+    points = [R for R in find_points(curve)[1:] if point_order(R) == 3]
+    P = points[0]
+    Q = next(R for R in points if R != P and R != -P)
+    assert parallel_pollard_rho(curve, P, Q, 3, workers=2) is None
+    assert discrete_log(curve, P, Q, 3, bsgs_threshold=0, workers=2) is None
+
+
+def test_kangaroo_interval():
+    random.seed(7)
+    P = random_point(CURVE)
+    n = point_order(P)
+    for width in (5, 1000, 10**6):
+        lower = random.randrange(n - width)
+        d = lower + random.randrange(width + 1)
+        assert kangaroo(CURVE, P, d * P, lower, lower + width) == d
+    assert kangaroo(CURVE, P, 5 * P, 100, 10**5) is None
+    with pytest.raises(ValueError):
+        kangaroo(CURVE, P, P, 10, 5)
+
+
+def test_parallel_kangaroo():
+    random.seed(8)
+    P = random_point(CURVE)
+    lower = 10**9
+    d = lower + random.randrange(10**7)
+    assert kangaroo(CURVE, P, d * P, lower, lower + 10**7, workers=2) == d
+    assert parallel_kangaroo(CURVE, P, d * P, lower, lower + 10**7, workers=3, dp_bits=4) == d
+
+
+def test_parallel_kangaroo_outside_interval():
+    random.seed(9)
+    P = random_point(CURVE)
+    # Решение вне отрезка: поиск должен завершиться по пределу прыжков, а не зависнуть.
+    assert kangaroo(CURVE, P, 5 * P, 100, 10**6, workers=2) is None
+    assert parallel_kangaroo(CURVE, P, 5 * P, 100, 10**6, workers=2, max_steps=10**4) is None
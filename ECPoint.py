@@ -1,12 +1,36 @@
+import math
+
 from ECPointInf import ECPointInf
+from ECPointJacobian import ECPointJacobian
+from PrimeField import mod_inverse
+
+# Ширина окна wNAF для таблиц, прикрепляемых к точке методом precompute.
+WNAF_WIDTH = 5
+
 
 class ECPoint:
+    __slots__ = ('curve', 'x', 'y', '_wnaf_table')
+
     def __init__(self, curve, x, y):
         self.curve = curve
         self.x = x % curve.p
         self.y = y % curve.p
         if not curve.is_on_curve((self.x, self.y)):
             raise ValueError("Точка не принадлежит кривой.")
+        self._wnaf_table = None
+
+    @classmethod
+    def _unchecked(cls, curve, x, y):
+        """
+        Создаёт точку по приведённым по модулю p координатам, о которых заранее
+        известно, что они лежат на кривой, минуя проверку is_on_curve.
+        """
+        point = cls.__new__(cls)
+        point.curve = curve
+        point.x = x
+        point.y = y
+        point._wnaf_table = None
+        return point
 
     def __add__(self, other):
         if isinstance(other, ECPointInf):
@@ -19,19 +43,23 @@ class ECPoint:
                 # Удвоение точки
                 return self.double()
         # Формулы сложения
-        m = ((other.y - self.y) * mod_inverse(other.x - self.x, self.curve.p)) % self.curve.p
-        x3 = (m**2 - self.x - other.x) % self.curve.p
-        y3 = (m * (self.x - x3) - self.y) % self.curve.p
-        return ECPoint(self.curve, x3, y3)
+        field = self.curve.field
+        p = field.modulus
+        m = ((other.y - self.y) * field.inv(other.x - self.x)) % p
+        x3 = (m * m - self.x - other.x) % p
+        y3 = (m * (self.x - x3) - self.y) % p
+        return ECPoint._unchecked(self.curve, x3, y3)
 
     def double(self):
         if (self.y % self.curve.p == 0):
             return ECPointInf(self.curve)
 
-        m = ((3 * self.x**2 + self.curve.a) * mod_inverse(2 * self.y, self.curve.p)) % self.curve.p
-        x3 = (m**2 - 2 * self.x) % self.curve.p
-        y3 = (m * (self.x - x3) - self.y) % self.curve.p
-        return ECPoint(self.curve, x3, y3)
+        field = self.curve.field
+        p = field.modulus
+        m = ((3 * self.x * self.x + self.curve.a) * field.inv(2 * self.y)) % p
+        x3 = (m * m - 2 * self.x) % p
+        y3 = (m * (self.x - x3) - self.y) % p
+        return ECPoint._unchecked(self.curve, x3, y3)
 
     def __radd__(self, other):
         return self + other
@@ -39,26 +67,99 @@ class ECPoint:
     def __mul__(self, scalar):
         if scalar == 0:
             return ECPointInf(self.curve)
-        result = ECPointInf(self.curve)
-        current = self
-        while scalar > 0:
-            if scalar % 2 == 1:
-                result = result + current
-            current = current.double()
-            if isinstance(current, ECPointInf):
-                break
-            scalar = scalar // 2
-        return result
+        # Оконный NAF в якобиевых координатах: если к точке прикреплена таблица
+        # (см. precompute), она используется повторно, иначе строится временная
+        # таблица с шириной окна, подобранной по длине скаляра.
+        if self._wnaf_table is not None:
+            w, multiples, negatives = self._wnaf_table
+        else:
+            w = wnaf_width(abs(scalar).bit_length())
+            multiples = odd_multiples(self, w)
+            negatives = [point_neg(Q) for Q in multiples]
+        result = wnaf_multiply(abs(scalar), w, multiples, negatives)
+        return result if scalar > 0 else point_neg(result)
+
+    def precompute(self, w=WNAF_WIDTH):
+        """
+        Строит и прикрепляет к точке таблицу нечётных кратных P, 3P, ..., (2^(w-1) - 1)P
+        (и противоположных им точек), чтобы повторные умножения k * P её не пересчитывали.
+        Возвращает саму точку.
+        """
+        multiples = odd_multiples(self, w)
+        self._wnaf_table = (w, multiples, [point_neg(Q) for Q in multiples])
+        return self
 
     def __rmul__(self, scalar):
         return self.__mul__(scalar)
 
+    def __eq__(self, other):
+        if not isinstance(other, ECPoint):
+            return NotImplemented if not isinstance(other, ECPointInf) else False
+        return self.x == other.x and self.y == other.y and self.curve == other.curve
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
     def __repr__(self):
         return f"({self.x}, {self.y})"
 
+    def to_bytes(self, compressed=False):
+        """
+        Кодирование точки по SEC1: 0x04 || X || Y без сжатия либо 0x02 / 0x03 || X
+        со сжатием (префикс задаёт чётность Y). Координаты - big-endian
+        фиксированной длины coordinate_size(curve).
+        """
+        size = coordinate_size(self.curve)
+        if compressed:
+            return bytes([2 + (self.y & 1)]) + self.x.to_bytes(size, 'big')
+        return b'\x04' + self.x.to_bytes(size, 'big') + self.y.to_bytes(size, 'big')
+
+    @staticmethod
+    def from_bytes(curve, data):
+        return point_from_bytes(curve, data)
+
     def __neg__(self):
         return point_neg(self)
 
+def coordinate_size(curve):
+    """
+    Число байтов, занимаемых одной координатой по модулю p.
+    """
+    return (curve.p.bit_length() + 7) // 8
+
+
+def point_from_bytes(curve, data):
+    """
+    Декодирует точку из SEC1: b'\\x00' - бесконечно удалённая точка, 0x04 || X || Y -
+    точка без сжатия (проверяется принадлежность кривой), 0x02 / 0x03 || X - сжатая
+    точка, ордината которой восстанавливается извлечением корня в поле кривой.
+    При некорректном кодировании возбуждается ValueError.
+    """
+    data = bytes(data)
+    size = coordinate_size(curve)
+    if data == b'\x00':
+        return ECPointInf(curve)
+    if len(data) == 1 + 2 * size and data[0] == 4:
+        x = int.from_bytes(data[1:1 + size], 'big')
+        y = int.from_bytes(data[1 + size:], 'big')
+        if x >= curve.p or y >= curve.p:
+            raise ValueError("Координата точки не меньше p.")
+        return ECPoint(curve, x, y)
+    if len(data) == 1 + size and data[0] in (2, 3):
+        x = int.from_bytes(data[1:], 'big')
+        if x >= curve.p:
+            raise ValueError("Координата точки не меньше p.")
+        y = curve.field.sqrt(x * x * x + curve.a * x + curve.b)
+        if y is None:
+            raise ValueError("Точка не принадлежит кривой.")
+        if y & 1 != data[0] & 1:
+            y = (curve.p - y) % curve.p
+            if y & 1 != data[0] & 1:
+                raise ValueError("Некорректный признак чётности ординаты.")
+        return ECPoint._unchecked(curve, x, y)
+    raise ValueError("Некорректное кодирование точки.")
+
+
 def point_neg(P):
     """
     Возвращает отрицание точки P.
@@ -66,34 +167,226 @@ def point_neg(P):
     """
     if isinstance(P, ECPointInf):
         return P
-    return ECPoint(P.curve, P.x, (-P.y) % P.curve.p)
+    return ECPoint._unchecked(P.curve, P.x, (-P.y) % P.curve.p)
+
+
+def wnaf(k, w):
+    """
+    Разложение неотрицательного k в оконную несмежную форму ширины w (wNAF).
+    Возвращает список цифр от младшей к старшей; ненулевые цифры нечётны,
+    по модулю меньше 2^(w-1), и между любыми двумя ненулевыми цифрами
+    стоит не менее w - 1 нулей.
+    """
+    digits = []
+    while k > 0:
+        if k & 1:
+            d = k & ((1 << w) - 1)
+            if d >= 1 << (w - 1):
+                d -= 1 << w
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+
+def wnaf_width(bits):
+    """
+    Подбирает ширину окна wNAF для скаляра заданной длины, минимизируя
+    оценку числа сложений: 2^(w-2) на таблицу и bits / (w + 1) на сам проход.
+    """
+    return min(range(2, 9), key=lambda w: (1 << (w - 2)) + bits / (w + 1))
+
+
+def odd_multiples(P, w):
+    """
+    Возвращает аффинные точки P, 3P, 5P, ..., (2^(w-1) - 1)P.
+    Кратные считаются в якобиевых координатах и нормализуются одним пакетным обращением.
+    """
+    J = ECPointJacobian.from_affine(P)
+    twoJ = J.double()
+    multiples = [J]
+    for _ in range((1 << (w - 2)) - 1):
+        multiples.append(multiples[-1] + twoJ)
+    return batch_to_affine(multiples)
+
+
+def wnaf_multiply(k, w, multiples, negatives):
+    """
+    Вычисляет k * P по таблице нечётных кратных P (multiples) и противоположных
+    им точек (negatives), построенных для ширины окна w.
+    """
+    curve = multiples[0].curve
+    result = ECPointJacobian.infinity(curve)
+    for d in reversed(wnaf(k, w)):
+        result = result.double()
+        if d > 0:
+            result = result.add_affine(multiples[d >> 1])
+        elif d < 0:
+            result = result.add_affine(negatives[-d >> 1])
+    return jacobian_to_affine(result)
+
 
+def double_and_add(P, k):
+    """
+    Скалярное умножение k * P двоичным методом «удвоение-сложение»
+    в якобиевых координатах, без таблиц. Сохранено как эталон для сравнения с wNAF.
+    """
+    result = ECPointJacobian.infinity(P.curve)
+    for bit in bin(k)[2:]:
+        result = result.double()
+        if bit == '1':
+            result = result.add_affine(P)
+    return jacobian_to_affine(result)
 
-def mod_inverse(a, p):
-    a %= p
-    g, x, y = extended_gcd(a, p)
-    if g != 1:
-        raise ValueError("Обратный элемент не существует.")
-    return x % p
 
-def extended_gcd(a, b):
+def jacobian_to_affine(J):
     """
-    Вычисляет расширенный алгоритм Евклида для нахождения наибольшего общего делителя
-    двух чисел a и b, а также коэффициентов x и y, таких что a * x + b * y = gcd(a, b).
+    Переводит точку из якобиевых координат (X : Y : Z) в аффинные (X / Z², Y / Z³).
+    Требует одного обращения в поле.
+    """
+    if J.is_infinity():
+        return ECPointInf(J.curve)
+    field = J.curve.field
+    p = field.modulus
+    z_inv = field.inv(J.Z)
+    z_inv2 = (z_inv * z_inv) % p
+    return ECPoint._unchecked(J.curve, J.X * z_inv2 % p, J.Y * z_inv2 * z_inv % p)
+
+
+def batch_to_affine(Js):
+    """
+    Переводит список точек из якобиевых координат в аффинные
+    с одним пакетным обращением на весь список.
+    """
+    finite = [J for J in Js if not J.is_infinity()]
+    if not finite:
+        return [ECPointInf(J.curve) for J in Js]
+    field = finite[0].curve.field
+    p = field.modulus
+    inverses = iter(batch_inverse([J.Z for J in finite], field.p))
+    points = []
+    for J in Js:
+        if J.is_infinity():
+            points.append(ECPointInf(J.curve))
+            continue
+        z_inv = next(inverses)
+        z_inv2 = (z_inv * z_inv) % p
+        points.append(ECPoint._unchecked(J.curve, J.X * z_inv2 % p, J.Y * z_inv2 * z_inv % p))
+    return points
+
+
+def batch_inverse(values, p):
+    """
+    Обращает сразу несколько элементов поля по модулю p приёмом Монтгомери:
+    n обращений заменяются одним обращением и 3(n - 1) умножениями.
 
     Аргументы:
-    a -- Первое целое число
-    b -- Второе целое число
+    values -- Список обращаемых элементов
+    p -- Модуль
 
     Возвращает:
-    Кортеж (g, x, y), где:
-    g -- Наибольший общий делитель a и b,
-    x -- Коэффициент для a в линейном представлении НОД,
-    y -- Коэффициент для b в линейном представлении НОД.
+    Список обратных элементов в том же порядке.
+    Если хотя бы один элемент необратим, возбуждается ValueError.
+    """
+    prefix = []
+    acc = 1
+    for value in values:
+        value %= p
+        if value == 0:
+            raise ValueError("Обратный элемент не существует.")
+        prefix.append(acc)
+        acc = (acc * value) % p
+    inv = mod_inverse(acc, p)
+    inverses = [0] * len(prefix)
+    for i in range(len(prefix) - 1, -1, -1):
+        inverses[i] = (inv * prefix[i]) % p
+        inv = (inv * values[i]) % p
+    return inverses
+
+
+def add_coordinates(curve, left, right):
+    """
+    Попарно складывает точки кривой curve, заданные парами аффинных координат
+    (x, y); None обозначает бесконечно удалённую точку. Совпадающие слагаемые
+    удваиваются. Знаменатели наклонов всех сумм обращаются одним вызовом
+    batch_inverse. Общая основа batch_add, batch_double и операций PointBatch.
     """
-    if a == 0:
-        return (b, 0, 1)
-    else:
-        g, y, x = extended_gcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+    p = curve.field.modulus
+    results = [None] * len(left)
+    pending = []  # (индекс, x1, y1, x2, числитель, знаменатель)
+    for i, (P, Q) in enumerate(zip(left, right)):
+        if P is None:
+            results[i] = Q
+        elif Q is None:
+            results[i] = P
+        elif P[0] == Q[0]:
+            if (P[1] + Q[1]) % curve.p:
+                pending.append((i, P[0], P[1], P[0], 3 * P[0] * P[0] + curve.a, 2 * P[1]))
+        else:
+            pending.append((i, P[0], P[1], Q[0], Q[1] - P[1], Q[0] - P[0]))
+    if pending:
+        inverses = batch_inverse([entry[5] for entry in pending], curve.p)
+        for (i, x1, y1, x2, numerator, _), inv in zip(pending, inverses):
+            m = numerator * inv % p
+            x3 = (m * m - x1 - x2) % p
+            results[i] = (x3, (m * (x1 - x3) - y1) % p)
+    return results
 
+
+def _coordinates(Ps):
+    return [None if isinstance(P, ECPointInf) else (P.x, P.y) for P in Ps]
+
+
+def _points(curve, coordinates):
+    return [ECPointInf(curve) if xy is None else ECPoint._unchecked(curve, *xy)
+            for xy in coordinates]
+
+
+def batch_add(Ps, Qs):
+    """
+    Попарно складывает точки двух списков: возвращает [Ps[i] + Qs[i]].
+    Все точки должны лежать на одной кривой. Знаменатели наклонов всех сумм
+    обращаются одним вызовом batch_inverse.
+    """
+    if len(Ps) != len(Qs):
+        raise ValueError("Списки точек должны иметь одинаковую длину.")
+    if not Ps:
+        return []
+    curve = Ps[0].curve
+    return _points(curve, add_coordinates(curve, _coordinates(Ps), _coordinates(Qs)))
+
+
+def batch_double(Ps):
+    """
+    Удваивает каждую точку списка: возвращает [2 * P for P in Ps]
+    с одним обращением в поле на весь список.
+    """
+    if not Ps:
+        return []
+    curve = Ps[0].curve
+    coordinates = _coordinates(Ps)
+    return _points(curve, add_coordinates(curve, coordinates, coordinates))
+
+
+def point_progression(start, step, count, lanes=64):
+    """
+    Лениво перечисляет точки start + j * step для j от 0 до count - 1.
+
+    Последовательность делится на lanes независимых дорожек, которые
+    продвигаются на lanes * step одним вызовом batch_add, поэтому на
+    каждые lanes точек приходится одно обращение в поле вместо lanes.
+    """
+    lanes = max(1, min(lanes, math.isqrt(count) + 1))
+    block = [start]
+    for _ in range(lanes - 1):
+        block.append(block[-1] + step)
+    lane_step = lanes * step
+    produced = 0
+    while produced < count:
+        for point in block[:count - produced]:
+            yield point
+        produced += len(block)
+        if produced < count:
+            block = batch_add(block, [lane_step] * lanes)
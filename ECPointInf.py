@@ -1,7 +1,24 @@
 class ECPointInf:
-    """Класс для бесконечно удаленной точки"""
-    def __init__(self, curve):
-        self.curve = curve
+    """
+    Класс для бесконечно удаленной точки.
+    Для каждой кривой существует единственный экземпляр: ECPointInf(curve)
+    возвращает один и тот же объект, поэтому результаты арифметики не создают новых точек.
+    """
+    __slots__ = ('curve',)
+
+    def __new__(cls, curve):
+        point = getattr(curve, '_infinity', None)
+        if point is None:
+            point = super().__new__(cls)
+            point.curve = curve
+            try:
+                curve._infinity = point
+            except AttributeError:
+                pass
+        return point
+
+    def __getnewargs__(self):
+        return (self.curve,)
 
     def __add__(self, other):
         return other
@@ -10,14 +27,25 @@ class ECPointInf:
         return other
 
     def __mul__(self, other):
-        return ECPointInf(self.curve)
+        return self
 
     def __rmul__(self, other):
         return self * other
 
+    def __neg__(self):
+        return self
+
     def __eq__(self, other):
         return isinstance(other, ECPointInf)
 
+    def __hash__(self):
+        return hash(None)
+
     def __repr__(self):
         return "inf"
-    
\ No newline at end of file
+
+    def to_bytes(self, compressed=False):
+        """
+        Кодирование бесконечно удалённой точки по SEC1 - один нулевой байт.
+        """
+        return b'\x00'
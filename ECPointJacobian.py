@@ -0,0 +1,114 @@
+from ECPointInf import ECPointInf
+
+
+class ECPointJacobian:
+    """
+    Точка эллиптической кривой в якобиевых координатах (X : Y : Z),
+    соответствующая аффинной точке (X / Z², Y / Z³).
+    Бесконечно удалённая точка задаётся значением Z = 0.
+    Формулы приводят по curve.field.modulus, т. е. стратегией приведения поля кривой.
+
+    Сложение и удвоение в этом представлении не требуют обращения элементов поля,
+    поэтому класс используется как внутреннее представление при скалярном умножении,
+    а переход к аффинным координатам выполняется один раз в конце вычислений.
+    """
+    def __init__(self, curve, X, Y, Z):
+        self.curve = curve
+        self.X = X
+        self.Y = Y
+        self.Z = Z
+
+    @staticmethod
+    def infinity(curve):
+        return ECPointJacobian(curve, 1, 1, 0)
+
+    @staticmethod
+    def from_affine(P):
+        """
+        Переводит аффинную точку (ECPoint или ECPointInf) в якобиевы координаты.
+        """
+        if isinstance(P, ECPointInf):
+            return ECPointJacobian.infinity(P.curve)
+        return ECPointJacobian(P.curve, P.x, P.y, 1)
+
+    def is_infinity(self):
+        return self.Z % self.curve.p == 0
+
+    def double(self):
+        p = self.curve.field.modulus
+        if self.is_infinity() or self.Y % p == 0:
+            return ECPointJacobian.infinity(self.curve)
+        X1, Y1, Z1 = self.X, self.Y, self.Z
+        YY = (Y1 * Y1) % p
+        ZZ = (Z1 * Z1) % p
+        S = (4 * X1 * YY) % p
+        M = (3 * X1 * X1 + self.curve.a * ZZ * ZZ) % p
+        X3 = (M * M - 2 * S) % p
+        Y3 = (M * (S - X3) - 8 * YY * YY) % p
+        Z3 = (2 * Y1 * Z1) % p
+        return ECPointJacobian(self.curve, X3, Y3, Z3)
+
+    def add_affine(self, P):
+        """
+        Смешанное сложение: self в якобиевых координатах, P - аффинная точка
+        (ECPoint или ECPointInf). Результат в якобиевых координатах.
+        """
+        if isinstance(P, ECPointInf):
+            return self
+        if self.is_infinity():
+            return ECPointJacobian.from_affine(P)
+        p = self.curve.field.modulus
+        X1, Y1, Z1 = self.X, self.Y, self.Z
+        Z1Z1 = (Z1 * Z1) % p
+        U2 = (P.x * Z1Z1) % p
+        S2 = (P.y * Z1 * Z1Z1) % p
+        H = (U2 - X1) % p
+        r = (S2 - Y1) % p
+        if H == 0:
+            # Точки имеют одинаковую абсциссу: либо P == self, либо P == -self
+            if r == 0:
+                return self.double()
+            return ECPointJacobian.infinity(self.curve)
+        HH = (H * H) % p
+        HHH = (H * HH) % p
+        V = (X1 * HH) % p
+        X3 = (r * r - HHH - 2 * V) % p
+        Y3 = (r * (V - X3) - Y1 * HHH) % p
+        Z3 = (Z1 * H) % p
+        return ECPointJacobian(self.curve, X3, Y3, Z3)
+
+    def __add__(self, other):
+        if not isinstance(other, ECPointJacobian):
+            return self.add_affine(other)
+        if self.is_infinity():
+            return other
+        if other.is_infinity():
+            return self
+        p = self.curve.field.modulus
+        X1, Y1, Z1 = self.X, self.Y, self.Z
+        X2, Y2, Z2 = other.X, other.Y, other.Z
+        Z1Z1 = (Z1 * Z1) % p
+        Z2Z2 = (Z2 * Z2) % p
+        U1 = (X1 * Z2Z2) % p
+        U2 = (X2 * Z1Z1) % p
+        S1 = (Y1 * Z2 * Z2Z2) % p
+        S2 = (Y2 * Z1 * Z1Z1) % p
+        H = (U2 - U1) % p
+        r = (S2 - S1) % p
+        if H == 0:
+            if r == 0:
+                return self.double()
+            return ECPointJacobian.infinity(self.curve)
+        HH = (H * H) % p
+        HHH = (H * HH) % p
+        V = (U1 * HH) % p
+        X3 = (r * r - HHH - 2 * V) % p
+        Y3 = (r * (V - X3) - S1 * HHH) % p
+        Z3 = (Z1 * Z2 * H) % p
+        return ECPointJacobian(self.curve, X3, Y3, Z3)
+
+    def __neg__(self):
+        return ECPointJacobian(self.curve, self.X, (-self.Y) % self.curve.p, self.Z)
+
+    def __repr__(self):
+        return f"({self.X} : {self.Y} : {self.Z})"
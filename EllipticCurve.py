@@ -1,17 +1,30 @@
 from ECPointInf import ECPointInf
+from PrimeField import prime_field
 
 
 class EllipticCurve:
-    def __init__(self, p, a, b):
+    def __init__(self, p, a, b, reduction='generic'):
         self.p = p
+        self.field = prime_field(p, reduction)  # общий для всех кривых над p, см. PrimeField
         self.a = a % p
         self.b = b % p
         # Проверка условия 4a³ + 27b² ≠ 0 mod p
         if (4 * pow(self.a, 3, p) + 27 * pow(self.b, 2, p)) % p == 0:
             raise ValueError("Кривая не удовлетворяет условию 4a³ + 27b² ≠ 0 mod p.")
+        self._infinity = None  # единственная бесконечно удалённая точка кривой, см. ECPointInf
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, EllipticCurve):
+            return NotImplemented
+        return (self.p, self.a, self.b) == (other.p, other.a, other.b)
+
+    def __hash__(self):
+        return hash((self.p, self.a, self.b))
 
     def is_on_curve(self, point):
         if isinstance(point, ECPointInf):
             return True
         x, y = point
-        return (pow(y, 2, self.p) - (pow(x, 3, self.p) + self.a * x + self.b) % self.p) % self.p == 0
+        return self.field.reduce(y * y - (x * x + self.a) * x - self.b) == 0
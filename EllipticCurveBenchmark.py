@@ -0,0 +1,189 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from CurveCache import get_cache
+from EllipticCurve import EllipticCurve
+from PointCounting import random_point
+from Primality import is_prime
+from Tools import bsgs, curve_order, find_points, point_order
+
+# Размеры поля (в битах), перебираемые по умолчанию.
+DEFAULT_BITS = (8, 12, 16, 24, 32, 48, 64, 128, 256)
+# Наибольший размер поля для каждой операции: дальше операция становится непосильной.
+MAX_BITS = {
+    'find_points': 16,
+    'curve_order': 64,
+    'point_order': 64,
+    'bsgs': 32,
+    'scalar_mul': 521,
+}
+# Порог регрессии по умолчанию: медиана задержки выросла более чем на 25 %.
+REGRESSION_THRESHOLD = 0.25
+# Медианы короче этого времени (в секундах) не сравниваются: их разброс сравним с ними самими.
+REGRESSION_MIN_LATENCY = 1e-4
+
+
+def benchmark_curve(bits):
+    """
+    Кривая y² = x³ + 2x + 3 над наибольшим простым полем меньше 2^bits
+    (при вырожденной кривой свободный член увеличивается).
+    """
+    p = (1 << bits) - 1
+    while not is_prime(p):
+        p -= 1
+    b = 3
+    while True:
+        try:
+            return EllipticCurve(p, 2, b)
+        except ValueError:
+            b += 1
+
+
+def _cases(operation, curve, rng):
+    """
+    Возвращает функцию без аргументов, выполняющую одну операцию на кривой
+    со свежими случайными данными.
+    """
+    if operation == 'find_points':
+        return lambda: find_points(curve)
+    if operation == 'curve_order':
+        def run():
+            get_cache().invalidate(curve)  # иначе замерялось бы обращение к кэшу
+            return curve_order(curve)
+        return run
+    if operation == 'point_order':
+        curve_order(curve)  # порядок кривой считается один раз, как при обычной работе
+        return lambda: point_order(random_point(curve))
+    if operation == 'bsgs':
+        P = random_point(curve)
+        n = point_order(P)
+        return lambda: bsgs(curve, P, rng.randrange(n) * P, n)
+    if operation == 'scalar_mul':
+        P = random_point(curve)
+        return lambda: rng.getrandbits(curve.p.bit_length()) * P
+    raise ValueError(f"Неизвестная операция: {operation}.")
+
+
+def percentile(values, q):
+    """
+    Процентиль q (0..100) отсортированного списка с линейной интерполяцией.
+    """
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def measure(operation, bits, samples, seed=1):
+    """
+    Замеряет операцию на кривой размера bits: samples повторов для задержек
+    и ещё один под tracemalloc для пиковой памяти.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    curve = benchmark_curve(bits)
+    case = _cases(operation, curve, rng)
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        case()
+        latencies.append(time.perf_counter() - start)
+    tracemalloc.start()
+    case()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'samples': samples,
+        'ops_per_second': samples / total if total else float('inf'),
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p99': percentile(latencies, 99),
+        'peak_memory': peak,
+    }
+
+
+def run_suite(operations, bits_list, samples, progress=None):
+    """
+    Перебирает операции и размеры поля. Возвращает словарь
+    {операция: {бит: результат measure}} вместе с описанием окружения.
+    """
+    results = {}
+    for operation in operations:
+        results[operation] = {}
+        for bits in bits_list:
+            if bits > MAX_BITS[operation]:
+                continue
+            result = measure(operation, bits, samples)
+            results[operation][str(bits)] = result
+            if progress is not None:
+                progress(operation, bits, result)
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD, min_latency=REGRESSION_MIN_LATENCY):
+    """
+    Сравнивает медианы задержек с базовыми. Возвращает список регрессий
+    (операция, бит, базовая медиана, текущая медиана) с ростом больше threshold;
+    замеры, у которых обе медианы короче min_latency, пропускаются.
+    """
+    regressions = []
+    for operation, by_bits in current['results'].items():
+        for bits, result in by_bits.items():
+            old = baseline['results'].get(operation, {}).get(bits)
+            if old is None or max(old['p50'], result['p50']) < min_latency:
+                continue
+            if result['p50'] > old['p50'] * (1 + threshold):
+                regressions.append((operation, bits, old['p50'], result['p50']))
+    return regressions
+
+
+def print_result(operation, bits, result):
+    print(f"{operation:<12} {bits:>4} бит  {result['ops_per_second']:12.1f} оп./с  "
+          f"p50 {1000 * result['p50']:10.3f} мс  p90 {1000 * result['p90']:10.3f} мс  "
+          f"p99 {1000 * result['p99']:10.3f} мс  память {result['peak_memory'] / 1024:9.1f} КиБ")
+
+
+def main(argv=None):
+    """
+    Запуск: python EllipticCurveBenchmark.py [--bits 8 16 ...] [--ops ...] [--samples N]
+    [--save baseline.json] [--compare baseline.json [--threshold 0.25]].
+    При сравнении код возврата 1 означает, что найдены регрессии.
+    """
+    parser = argparse.ArgumentParser(description="Замеры масштабирования операций над кривыми.")
+    parser.add_argument('--bits', type=int, nargs='+', default=list(DEFAULT_BITS))
+    parser.add_argument('--ops', nargs='+', default=list(MAX_BITS), choices=list(MAX_BITS))
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--save', metavar='FILE', help="сохранить результаты как базовые")
+    parser.add_argument('--compare', metavar='FILE', help="сравнить с базовыми результатами")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.ops, args.bits, args.samples, print_result)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, report, args.threshold)
+        for operation, bits, old, new in regressions:
+            print(f"РЕГРЕССИЯ {operation} {bits} бит: {1000 * old:.3f} мс -> {1000 * new:.3f} мс")
+        if regressions:
+            return 1
+        print("Регрессий нет.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+from EllipticCurveBenchmark import compare, percentile
+import pytest
+
+
+def report(results):
+    return {'python': '3', 'machine': 'x86_64',
+            'results': {operation: {bits: {'p50': p50} for bits, p50 in by_bits.items()}
+                        for operation, by_bits in results.items()}}
+
+
+def test_percentile():
+    assert percentile([5.0], 50) == 5.0
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 100) == 4.0
+    assert percentile(values, 50) == pytest.approx(2.5)
+    assert percentile(values, 90) == pytest.approx(3.7)
+    assert percentile([10.0, 20.0, 30.0], 25) == pytest.approx(15.0)
+
+
+def test_compare_flags_regression():
+    baseline = report({'bsgs': {'16': 0.010, '24': 0.020}})
+    current = report({'bsgs': {'16': 0.0130, '24': 0.0240}})
+    # Рост на 30 % выше порога 25 %, рост на 20 % - нет.
+    assert compare(baseline, current) == [('bsgs', '16', 0.010, 0.0130)]
+    assert compare(baseline, current, threshold=0.5) == []
+
+
+def test_compare_unchanged_and_faster():
+    baseline = report({'scalar_mul': {'256': 0.005}})
+    assert compare(baseline, baseline) == []
+    assert compare(baseline, report({'scalar_mul': {'256': 0.001}})) == []
+
+
+def test_compare_missing_keys():
+    baseline = report({'bsgs': {'16': 0.010}})
+    current = report({'bsgs': {'16': 0.010, '32': 1.0}, 'curve_order': {'64': 1.0}})
+    # Замеры, которых нет в базовых результатах, не сравниваются.
+    assert compare(baseline, current) == []
+    # Замеры из базовых результатов, отсутствующие сейчас, тоже пропускаются.
+    assert compare(current, baseline) == []
+
+
+def test_compare_skips_noise_below_min_latency():
+    baseline = report({'scalar_mul': {'8': 1e-5}})
+    current = report({'scalar_mul': {'8': 5e-5}})
+    assert compare(baseline, current) == []
+    assert compare(baseline, current, min_latency=1e-6) == [('scalar_mul', '8', 1e-5, 5e-5)]
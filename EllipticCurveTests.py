@@ -1,7 +1,11 @@
 from EllipticCurve import EllipticCurve
 from ECPoint import *
+from ECPointJacobian import ECPointJacobian
 from ECPointInf import ECPointInf
 from Tools import *
+from CurveCache import CurveCache, CACHE_VERSION, get_cache
+from PrimeField import extended_gcd
+import os
 import pytest
 
 
@@ -185,3 +189,251 @@ def test_analysis(p, a, b):
     p1_order = point_order(points[0])
     p2_order = point_order(points[1])
     assert len(points) == 12
+
+
+def reference_multiple(P, k):
+    # Эталонное скалярное умножение повторным аффинным сложением.
+    result = ECPointInf(P.curve)
+    for _ in range(k):
+        result = result + P
+    return result
+
+
+def test_jacobian_scalar_multiplication_matches_affine():
+    # Умножение через якобиевы координаты совпадает с повторным сложением для всех точек.
+    curve = EllipticCurve(97, 2, 3)
+    for P in find_points(curve)[1:]:
+        for k in range(1, 25):
+            assert k * P == reference_multiple(P, k)
+
+
+def test_jacobian_mixed_addition():
+    curve = EllipticCurve(17, 2, 2)
+    P = ECPoint(curve, 5, 1)
+    J = ECPointJacobian.from_affine(P).double()
+    # Смешанное сложение, сложение якобиевых точек и сложение с противоположной точкой.
+    assert jacobian_to_affine(J.add_affine(P)) == P + P + P
+    assert jacobian_to_affine(J + J) == 4 * P
+    assert jacobian_to_affine(J.add_affine(-(2 * P))) == ECPointInf(curve)
+
+
+def test_negative_scalar_multiplication():
+    curve = EllipticCurve(17, 2, 2)
+    P = ECPoint(curve, 5, 1)
+    assert -3 * P == -(3 * P)
+
+
+def test_batch_inverse():
+    values = [3, 5, 7, 10, 96]
+    inverses = batch_inverse(values, 97)
+    assert all((v * inv) % 97 == 1 for v, inv in zip(values, inverses))
+    assert batch_inverse([], 97) == []
+    # Необратимый элемент в пакете.
+    with pytest.raises(ValueError):
+        batch_inverse([3, 0, 5], 97)
+
+
+def test_batch_add_and_double():
+    curve = EllipticCurve(97, 2, 3)
+    points = find_points(curve)
+    Ps = points
+    Qs = points[1:] + points[:1]
+    # Пакет содержит обычные суммы, бесконечность и пары P, -P.
+    Ps = Ps + [points[1], points[1]]
+    Qs = Qs + [-points[1], points[1]]
+    for R, P, Q in zip(batch_add(Ps, Qs), Ps, Qs):
+        assert R == P + Q
+    for R, P in zip(batch_double(points), points):
+        assert R == 2 * P
+    with pytest.raises(ValueError):
+        batch_add(points, points[1:])
+
+
+def test_point_progression():
+    curve = EllipticCurve(97, 2, 3)
+    P = find_points(curve)[3]
+    Q = find_points(curve)[7]
+    expected = [Q + j * P for j in range(50)]
+    assert all(R == S for R, S in zip(point_progression(Q, P, 50), expected))
+    assert len(list(point_progression(Q, P, 50, lanes=8))) == 50
+
+
+def test_bsgs_larger_subgroup():
+    curve = EllipticCurve(97, 2, 3)
+    P = find_points(curve)[3]
+    n = point_order(P)
+    for d in (0, 1, n // 2, n - 1):
+        assert bsgs(curve, P, d * P, n) == d
+
+
+@pytest.mark.parametrize('w', [2, 3, 4, 5])
+def test_wnaf_digits(w):
+    for k in list(range(200)) + [2**64 + 12345, 3**50]:
+        digits = wnaf(k, w)
+        assert sum(d << i for i, d in enumerate(digits)) == k
+        nonzero = [i for i, d in enumerate(digits) if d != 0]
+        assert all(d % 2 == 1 and abs(d) < 2 ** (w - 1) for d in digits if d != 0)
+        # Между ненулевыми цифрами не меньше w - 1 нулей.
+        assert all(j - i >= w for i, j in zip(nonzero, nonzero[1:]))
+
+
+def test_wnaf_multiplication_with_precomputed_table():
+    curve = EllipticCurve(97, 2, 3)
+    for P in find_points(curve)[1:]:
+        P.precompute(4)
+        table = P._wnaf_table
+        for k in range(-30, 120):
+            expected = double_and_add(P, abs(k))
+            assert k * P == (expected if k >= 0 else point_neg(expected))
+        # Таблица не перестраивается между умножениями.
+        assert P._wnaf_table is table
+
+
+def test_iter_points_sharding():
+    curve = EllipticCurve(97, 2, 3)
+    points = find_points(curve)
+    # Объединение частей по диапазонам абсцисс совпадает с полным перебором.
+    shards = list(iter_points(curve, 0, 30)) + list(iter_points(curve, 30, 60)) + list(iter_points(curve, 60))
+    assert [repr(P) for P in shards] == [repr(P) for P in points]
+    assert isinstance(next(iter_points(curve)), ECPointInf)
+    assert not any(isinstance(P, ECPointInf) for P in iter_points(curve, 1))
+    for P in shards[1:]:
+        assert curve.is_on_curve((P.x, P.y))
+
+
+def test_fast_point_order_matches_naive():
+    curve = EllipticCurve(97, 2, 3)
+    order = curve_order(curve)
+    for P in find_points(curve):
+        assert point_order(P) == naive_point_order(P)
+        assert point_order(P, order) == naive_point_order(P)
+        assert order % point_order(P) == 0
+
+
+def test_curve_order_factorization_cached():
+    curve = EllipticCurve(1009, 2, 3)
+    order, factors = curve_order_factorization(curve)
+    assert order == curve_order(curve)
+    product = 1
+    for q, e in factors.items():
+        product *= q ** e
+    assert product == order
+    # Повторный запрос для кривой с теми же параметрами берётся из кэша.
+    misses = get_cache().misses
+    assert curve_order_factorization(EllipticCurve(1009, 2, 3)) == (order, factors)
+    assert get_cache().misses == misses
+
+
+@pytest.mark.parametrize('max_table_size, compact', [(None, False), (None, True), (3, False), (1, True)])
+def test_bsgs_table_options(max_table_size, compact):
+    curve = EllipticCurve(1009, 2, 3)
+    P = find_points(curve)[5]
+    n = point_order(P)
+    for d in list(range(0, n, 37)) + [n - 1]:
+        assert bsgs(curve, P, d * P, n, max_table_size=max_table_size, compact=compact) == d
+    # Точка вне подгруппы, порождённой P.
+    Q = next(Q for Q in find_points(curve)[1:] if n % point_order(Q) != 0)
+    assert bsgs(curve, P, Q, n, max_table_size=max_table_size, compact=compact) is None
+
+
+def test_compact_baby_step_table():
+    table = CompactBabyStepTable(4)
+    table.add(10, 1)
+    table.add(10 + 0xFFFFFFFFFFFFFFFF, 2)  # тот же отпечаток
+    table.add(11, 3)
+    assert sorted(table.get(10)) == [1, 2]
+    assert table.get(11) == [3]
+    assert table.get(12) == []
+
+
+def test_prime_subgroup_generator():
+    curve = EllipticCurve(101, 1, 1)  # порядок 105 = 3 * 5 * 7
+    order, factors = curve_order_factorization(curve)
+    for q in factors:
+        subgroup = prime_subgroup(curve, q)
+        assert len(subgroup) == q
+        elements = list(subgroup)
+        assert isinstance(elements[0], ECPointInf)
+        assert all(isinstance(q * P, ECPointInf) for P in elements)
+        assert len({(P.x, P.y) for P in elements[1:]}) == q - 1
+        assert subgroup[-1] == elements[-1]
+        assert subgroup[3 % q] == elements[3 % q]
+        for P in elements:
+            assert P in subgroup
+    lazy = find_prime_subgroups(curve, lazy=True)
+    assert [len(g) for g in lazy] == [len(g) for g in find_prime_subgroups(curve)]
+
+
+def test_prime_subgroup_membership():
+    # Порядок кривой 18 = 2 * 3^2, и 3 | p - 1; 3-часть группы здесь - Z/3 x Z/3.
+    curve = EllipticCurve(13, 7, 0)
+    order, factors = curve_order_factorization(curve)
+    assert prime_subgroup(curve, 3) is None
+    for q in factors:
+        subgroup = prime_subgroup(curve, q)
+        if subgroup is None:
+            # Все точки q-кручения рациональны: их q² - 1, и подгруппа порядка q не единственна.
+            torsion = [P for P in iter_points(curve) if isinstance(q * P, ECPointInf)]
+            assert len(torsion) == q * q
+            continue
+        for P in iter_points(curve):
+            assert (P in subgroup) == isinstance(q * P, ECPointInf)
+        with pytest.raises(IndexError):
+            subgroup[q]
+
+
+def test_curve_cache_file_tier(tmp_path):
+    path = str(tmp_path / "curves.sqlite")
+    curve = EllipticCurve(2**61 - 1, 2, 3)
+    cache = CurveCache(path=path)
+    cache.put(curve, 'order', 2**61 + 5)
+    cache.put(curve, 'factors', [[2, 1], [2**60 + 3, 1]])
+    cache.close()
+
+    reopened = CurveCache(path=path)
+    assert reopened.get(curve, 'order') == 2**61 + 5
+    assert reopened.get(curve, 'factors') == [[2, 1], [2**60 + 3, 1]]
+    reopened.invalidate(curve, 'order')
+    assert reopened.get(curve, 'order') is None
+    # Записи другой версии формата не используются.
+    reopened._db.execute("UPDATE invariants SET version = ?", (CACHE_VERSION + 1,))
+    reopened._memory.clear()
+    assert reopened.get(curve, 'factors') is None
+    reopened.invalidate()
+    assert len(reopened) == 0
+    reopened.close()
+
+
+def test_curve_cache_lazy_connection(tmp_path):
+    path = tmp_path / "curves.sqlite"
+    curve = EllipticCurve(101, 1, 1)
+    cache = CurveCache(path=str(path))
+    assert not path.exists()  # создание кэша не обращается к файлу
+    cache.put(curve, 'order', 105)
+    assert path.exists()
+    inherited = cache._db
+    cache._pid = -1  # как в процессе, порождённом fork
+    cache._memory.clear()
+    assert cache.get(curve, 'order') == 105
+    assert cache._db is not inherited and cache._pid == os.getpid()
+    inherited.close()
+    cache.close()
+
+
+def test_curve_cache_lru():
+    cache = CurveCache(memory_size=2)
+    curves = [EllipticCurve(101, a, 1) for a in range(1, 4)]
+    for i, curve in enumerate(curves):
+        cache.put(curve, 'order', i)
+    assert len(cache) == 2
+    assert cache.get(curves[0], 'order') is None
+    assert cache.get(curves[2], 'order') == 2
+
+
+def test_group_generator():
+    curve = EllipticCurve(101, 1, 1)  # циклическая группа порядка 105
+    G = group_generator(curve)
+    assert point_order(G) == 105
+    assert group_generator(curve) == G
+    # Группа Z/3 x Z/6 порядка 18 не циклическая.
+    assert group_generator(EllipticCurve(13, 7, 0)) is None
@@ -0,0 +1,182 @@
+import functools
+import math
+import random
+
+from ECPointJacobian import ECPointJacobian
+from EllipticCurve import EllipticCurve
+from Primality import is_prime, primes_up_to
+
+# Граница таблицы малых простых для пробного деления.
+TRIAL_DIVISION_BOUND = 1000
+# Число итераций ро-метода Брента до перехода к методам p - 1 и ECM.
+RHO_MAX_ITERATIONS = 1 << 16
+# Граница гладкости метода p - 1.
+PM1_BOUND = 10**5
+# Начальная граница первой стадии ECM и число кривых на каждую границу.
+ECM_BOUND = 2000
+ECM_CURVES = 25
+
+
+SMALL_PRIMES = primes_up_to(TRIAL_DIVISION_BOUND)
+
+
+def trial_division(n, primes=SMALL_PRIMES):
+    """
+    Делит n на простые из таблицы primes.
+    Возвращает пару (словарь {простой делитель: кратность}, неразложенный остаток).
+    """
+    factors = {}
+    for q in primes:
+        if q * q > n:
+            break
+        while n % q == 0:
+            factors[q] = factors.get(q, 0) + 1
+            n //= q
+    if 1 < n <= primes[-1] ** 2:
+        # Остаток без делителей из таблицы, не превосходящий квадрата её границы, прост.
+        factors[n] = factors.get(n, 0) + 1
+        n = 1
+    return factors, n
+
+
+def pollard_rho_brent(n, max_iterations=None):
+    """
+    Ро-метод Полларда в варианте Брента: блуждание x -> x² + c mod n с поиском цикла
+    удвоением длины и накоплением произведения разностей, чтобы вычислять один
+    НОД на m шагов. Возвращает нетривиальный делитель n либо None, если за
+    max_iterations шагов делитель не найден.
+    """
+    if n % 2 == 0:
+        return 2
+    m = 128
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        y, c = random.randrange(1, n), random.randrange(1, n)
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            iterations += r
+            r *= 2
+            if max_iterations is not None and iterations >= max_iterations and g == 1:
+                return None
+        if g == n:
+            # Произведение обнулилось: повторяем последний отрезок по одному шагу.
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    return None
+
+
+def pollard_pm1(n, bound=PM1_BOUND):
+    """
+    Метод p - 1 Полларда: находит простой делитель q числа n, если q - 1
+    раскладывается на простые степени, не превосходящие bound.
+    Возвращает нетривиальный делитель n либо None.
+    """
+    a = random.randrange(2, n - 1)
+    for q in primes_up_to(bound):
+        qk = q
+        while qk * q <= bound:
+            qk *= q
+        a = pow(a, qk, n)
+    g = math.gcd(a - 1, n)
+    return g if 1 < g < n else None
+
+
+def _jacobian_multiply(J, k):
+    result = ECPointJacobian.infinity(J.curve)
+    for bit in bin(k)[2:]:
+        result = result.double()
+        if bit == '1':
+            result = result + J
+    return result
+
+
+def ecm(n, bound=ECM_BOUND, curves=ECM_CURVES):
+    """
+    Первая стадия метода эллиптических кривых Ленстры.
+
+    Над кольцом Z/nZ выбирается случайная кривая EllipticCurve(n, a, b) с точкой
+    (x, y) на ней, и точка умножается в якобиевых координатах на все простые степени
+    до bound. Если порядок кривой по модулю простого делителя q числа n гладок,
+    координата Z обращается в ноль по модулю q, и gcd(Z, n) даёт делитель.
+    Возвращает нетривиальный делитель n либо None после curves неудачных кривых.
+    """
+    prime_powers = []
+    for q in primes_up_to(bound):
+        qk = q
+        while qk * q <= bound:
+            qk *= q
+        prime_powers.append(qk)
+    for _ in range(curves):
+        x, y, a = random.randrange(n), random.randrange(n), random.randrange(n)
+        b = (y * y - x * x * x - a * x) % n
+        g = math.gcd(4 * a ** 3 + 27 * b ** 2, n)
+        if 1 < g < n:
+            return g
+        if g == n:
+            continue
+        J = ECPointJacobian(EllipticCurve(n, a, b), x, y, 1)
+        for qk in prime_powers:
+            J = _jacobian_multiply(J, qk)
+            g = math.gcd(J.Z, n)
+            if g != 1:
+                break
+        if 1 < g < n:
+            return g
+    return None
+
+
+def find_factor(n):
+    """
+    Находит нетривиальный делитель составного числа n: сначала ро-методом Брента
+    с ограниченным числом шагов, затем методом p - 1 и методом ECM с растущей
+    границей гладкости.
+    """
+    d = math.isqrt(n)
+    if d * d == n:
+        return d
+    d = pollard_rho_brent(n, RHO_MAX_ITERATIONS) or pollard_pm1(n)
+    bound = ECM_BOUND
+    while d is None:
+        d = ecm(n, bound)
+        bound *= 4
+    return d
+
+
+@functools.lru_cache(maxsize=1024)
+def _factorize(n):
+    factors, n = trial_division(n)
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = find_factor(m)
+        pending.extend((d, m // d))
+    return tuple(sorted(factors.items()))
+
+
+def factorize(n):
+    """
+    Разложение n на простые множители: пробное деление на малые простые,
+    затем ро-метод Брента, метод p - 1 и ECM для оставшейся составной части.
+    Разложения кэшируются. Возвращает словарь {простой делитель: кратность}.
+    """
+    if n <= 1:
+        return {}
+    return dict(_factorize(n))
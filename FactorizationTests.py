@@ -0,0 +1,30 @@
+from Factorization import factorize, trial_division, pollard_rho_brent, pollard_pm1, ecm, find_factor
+import math
+import random
+
+
+def test_factorize_products():
+    random.seed(1)
+    for n in (2, 97, 2**4 * 3 * 101**2, 1000003 * 1000033, 2**64 + 1,
+              (2**61 - 1) * (2**31 - 1) * 1000003**2, 1099511827580):
+        factors = factorize(n)
+        assert math.prod(q ** e for q, e in factors.items()) == n
+        assert all(factorize(q) == {q: 1} for q in factors)
+    assert factorize(2**64 + 1) == {274177: 1, 67280421310721: 1}
+    assert factorize(1) == {}
+
+
+def test_trial_division():
+    assert trial_division(2**10 * 7 * 997) == ({2: 10, 7: 1, 997: 1}, 1)
+    assert trial_division(3 * 1000003 * 1000033) == ({3: 1}, 1000003 * 1000033)
+
+
+def test_factor_finders():
+    random.seed(2)
+    n = 1000003 * 1000033
+    assert pollard_rho_brent(n) in (1000003, 1000033)
+    # 2^31 - 2 = 2 * 3^2 * 7 * 11 * 31 * 151 * 331 гладко, а 1000003 - 1 = 2 * 3 * 166667.
+    assert pollard_pm1((2**31 - 1) * 1000003, bound=1000) == 2**31 - 1
+    d = ecm(n, bound=500, curves=200)
+    assert d in (1000003, 1000033)
+    assert n % find_factor(n) == 0
@@ -0,0 +1,163 @@
+import sys
+from collections import OrderedDict
+
+from ECPoint import ECPoint, batch_to_affine, jacobian_to_affine, point_neg
+from ECPointInf import ECPointInf
+from ECPointJacobian import ECPointJacobian
+
+# Ширина окна таблиц фиксированной точки по умолчанию (в битах).
+FIXED_BASE_WIDTH = 4
+# Бюджет памяти кэша таблиц по умолчанию, в байтах.
+FIXED_BASE_MEMORY_BUDGET = 64 * 2**20
+
+
+class FixedBaseTable:
+    """
+    Таблица для умножения фиксированной точки P на произвольные скаляры.
+
+    Скаляр записывается в системе счисления с основанием 2^w, и для каждого разряда i
+    хранятся точки d * 2^(w*i) * P при d = 1 .. 2^w - 1. Тогда k * P равно сумме
+    строк таблицы по цифрам k: на каждый разряд приходится не более одного смешанного
+    сложения и ни одного удвоения.
+    """
+    def __init__(self, P, w=FIXED_BASE_WIDTH, bits=None):
+        self.curve = P.curve
+        self.w = w
+        # По теореме Хассе порядок точки не превосходит p + 1 + 2√p < 2^(bits(p) + 1).
+        self.bits = bits if bits is not None else P.curve.p.bit_length() + 1
+        self.windows = -(-self.bits // w)
+
+        jacobian = []
+        base = ECPointJacobian.from_affine(P)
+        for _ in range(self.windows):
+            row = [base]
+            for _ in range((1 << w) - 2):
+                row.append(row[-1] + base)
+            jacobian.extend(row)
+            base = row[-1] + base  # 2^w * base
+        # Точка 2^(w * windows) * P для старших разрядов скаляров длиннее таблицы.
+        jacobian.append(base)
+        affine = batch_to_affine(jacobian)
+        self.top = affine.pop()
+        size = (1 << w) - 1
+        self.rows = [affine[i * size:(i + 1) * size] for i in range(self.windows)]
+        self.memory = self._estimate_memory(affine)
+
+    @staticmethod
+    def _estimate_memory(points):
+        sample = next((Q for Q in points if isinstance(Q, ECPoint)), None)
+        if sample is None:
+            return sys.getsizeof(points)
+        per_point = sys.getsizeof(sample) + sys.getsizeof(sample.x) + sys.getsizeof(sample.y)
+        return sys.getsizeof(points) + per_point * len(points)
+
+    def multiply(self, k):
+        """
+        Вычисляет k * P по таблице.
+        """
+        if k < 0:
+            return point_neg(self.multiply(-k))
+        mask = (1 << self.w) - 1
+        result = ECPointJacobian.infinity(self.curve)
+        for row in self.rows:
+            digit = k & mask
+            if digit:
+                result = result.add_affine(row[digit - 1])
+            k >>= self.w
+        if k:
+            result = result.add_affine(k * self.top)
+        return jacobian_to_affine(result)
+
+
+class FixedBaseCache:
+    """
+    LRU-кэш таблиц фиксированных точек, ключом которого служат параметры кривой,
+    координаты точки и ширина окна таблицы (таблицы одной точки разной ширины
+    хранятся раздельно). Суммарная оценка занимаемой таблицами памяти не превышает
+    memory_budget байт: при переполнении вытесняются давно не использованные таблицы.
+    """
+    def __init__(self, memory_budget=FIXED_BASE_MEMORY_BUDGET, w=FIXED_BASE_WIDTH):
+        self.memory_budget = memory_budget
+        self.w = w
+        self.memory = 0
+        self._tables = OrderedDict()
+
+    def key(self, P, w=None):
+        return (P.curve.p, P.curve.a, P.curve.b, P.x, P.y, self.w if w is None else w)
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __contains__(self, P):
+        return self.key(P) in self._tables
+
+    def get(self, P, w=None):
+        """
+        Возвращает таблицу точки P с шириной окна w (по умолчанию - ширина кэша),
+        если она есть в кэше, иначе None.
+        """
+        key = self.key(P, w)
+        table = self._tables.get(key)
+        if table is not None:
+            self._tables.move_to_end(key)
+        return table
+
+    def warm_up(self, P, w=None):
+        """
+        Строит (если ещё не построена) и помещает в кэш таблицу точки P.
+        Таблица, которая сама по себе больше бюджета памяти, возвращается, но не кэшируется.
+        """
+        table = self.get(P, w)
+        if table is not None:
+            return table
+        table = FixedBaseTable(P, w if w is not None else self.w)
+        if table.memory > self.memory_budget:
+            return table
+        self._tables[self.key(P, w)] = table
+        self.memory += table.memory
+        while self.memory > self.memory_budget:
+            _, evicted = self._tables.popitem(last=False)
+            self.memory -= evicted.memory
+        return table
+
+    def evict(self, P=None):
+        """
+        Удаляет из кэша таблицы точки P (всех ширин окна), а при P=None - все таблицы.
+        """
+        if P is None:
+            self._tables.clear()
+            self.memory = 0
+            return
+        point = self.key(P)[:-1]
+        for key in [key for key in self._tables if key[:-1] == point]:
+            self.memory -= self._tables.pop(key).memory
+
+    def multiply(self, P, k):
+        if isinstance(P, ECPointInf):
+            return P
+        return self.warm_up(P).multiply(k)
+
+
+default_cache = FixedBaseCache()
+
+
+def fixed_base_mul(P, k):
+    """
+    Вычисляет k * P через таблицу фиксированной точки из общего кэша,
+    при первом обращении к точке строя её таблицу.
+    """
+    return default_cache.multiply(P, k)
+
+
+def warm_up_fixed_base(P, w=None):
+    """
+    Заранее строит таблицу точки P в общем кэше.
+    """
+    return default_cache.warm_up(P, w)
+
+
+def evict_fixed_base(P=None):
+    """
+    Удаляет таблицу точки P (или все таблицы при P=None) из общего кэша.
+    """
+    default_cache.evict(P)
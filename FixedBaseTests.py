@@ -0,0 +1,59 @@
+from EllipticCurve import EllipticCurve
+from ECPoint import ECPoint, point_neg
+from ECPointInf import ECPointInf
+from FixedBase import FixedBaseTable, FixedBaseCache, fixed_base_mul, warm_up_fixed_base, evict_fixed_base
+from Tools import find_points
+import pytest
+
+
+@pytest.mark.parametrize('w', [1, 3, 4])
+def test_fixed_base_table(w):
+    curve = EllipticCurve(97, 2, 3)
+    for P in find_points(curve)[1:]:
+        table = FixedBaseTable(P, w)
+        # Скаляры длиннее таблицы и отрицательные скаляры тоже поддерживаются.
+        for k in list(range(-20, 260)) + [2**40 + 7]:
+            assert table.multiply(k) == k * P
+
+
+def test_fixed_base_cache_lru_and_budget():
+    curve = EllipticCurve(97, 2, 3)
+    P, Q, R = find_points(curve)[1:4]
+    size = FixedBaseTable(P).memory
+    cache = FixedBaseCache(memory_budget=2 * size + size // 2)
+    cache.warm_up(P)
+    cache.warm_up(Q)
+    assert cache.get(P) is not None  # P становится последним использованным
+    cache.warm_up(R)
+    # Бюджет вмещает две таблицы: вытеснена давно не использованная таблица Q.
+    assert P in cache and R in cache and Q not in cache
+    assert cache.memory <= cache.memory_budget
+    cache.evict(P)
+    assert P not in cache and len(cache) == 1
+    cache.evict()
+    assert len(cache) == 0 and cache.memory == 0
+
+
+def test_fixed_base_cache_keeps_widths_apart():
+    curve = EllipticCurve(97, 2, 3)
+    P = find_points(curve)[1]
+    cache = FixedBaseCache(w=4)
+    assert cache.warm_up(P).w == 4
+    # Таблица другой ширины окна строится заново, а не берётся из кэша.
+    wide = cache.warm_up(P, w=6)
+    assert wide.w == 6 and cache.get(P, 6) is wide and cache.get(P).w == 4
+    assert len(cache) == 2
+    cache.evict(P)
+    assert len(cache) == 0 and cache.memory == 0
+
+
+def test_fixed_base_default_cache():
+    curve = EllipticCurve(17, 2, 2)
+    P = ECPoint(curve, 5, 1)
+    table = warm_up_fixed_base(P)
+    # Таблица находится по координатам, а не по объекту точки.
+    assert warm_up_fixed_base(ECPoint(curve, 5, 1)) is table
+    assert fixed_base_mul(P, 7) == 7 * P
+    assert fixed_base_mul(P, -7) == point_neg(7 * P)
+    assert isinstance(fixed_base_mul(ECPointInf(curve), 5), ECPointInf)
+    evict_fixed_base(P)
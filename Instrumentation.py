@@ -0,0 +1,145 @@
+import functools
+import json
+import os
+import sys
+import time
+
+import ECPoint as ECPointModule
+from ECPoint import ECPoint
+from ECPointJacobian import ECPointJacobian
+
+# Инструментируемые методы: (класс, имя атрибута).
+INSTRUMENTED_METHODS = (
+    (ECPoint, '__add__'),
+    (ECPoint, 'double'),
+    (ECPoint, '__mul__'),
+    (ECPointJacobian, '__add__'),
+    (ECPointJacobian, 'add_affine'),
+    (ECPointJacobian, 'double'),
+)
+
+# Модули-посредники: их кадры пропускаются при поиске места вызова, чтобы, например,
+# обращение через PrimeField.inv приписывалось коду, вызвавшему inv.
+TRANSPARENT_MODULES = ('PrimeField.py',)
+
+# Активные счётчики; пока список пуст, обёртки не установлены и накладных расходов нет.
+_active = []
+# Исходные функции, подменённые на время счёта: (объект, имя атрибута, исходное значение).
+_patched = []
+
+
+class OperationCounts:
+    """
+    Счётчики операций: число вызовов и суммарное время каждой операции,
+    в целом и по местам вызова (файл:строка (функция) вызывающего кода).
+    Время включает вложенные операции: например, время ECPoint.__mul__
+    содержит время сложений и удвоений в якобиевых координатах.
+    """
+    def __init__(self):
+        self.operations = {}
+        self.call_sites = {}
+
+    def record(self, operation, site, elapsed):
+        total = self.operations.setdefault(operation, [0, 0.0])
+        total[0] += 1
+        total[1] += elapsed
+        local = self.call_sites.setdefault((operation, site), [0, 0.0])
+        local[0] += 1
+        local[1] += elapsed
+
+    def __getitem__(self, operation):
+        return self.operations.get(operation, (0, 0.0))[0]
+
+    def time(self, operation):
+        return self.operations.get(operation, (0, 0.0))[1]
+
+    def as_dict(self):
+        return {
+            'operations': {operation: {'count': count, 'time': elapsed}
+                           for operation, (count, elapsed) in sorted(self.operations.items())},
+            'call_sites': [{'operation': operation, 'site': site, 'count': count, 'time': elapsed}
+                           for (operation, site), (count, elapsed) in sorted(
+                               self.call_sites.items(), key=lambda item: -item[1][0])],
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+def _call_site(frame):
+    while frame.f_back is not None and os.path.basename(frame.f_code.co_filename) in TRANSPARENT_MODULES:
+        frame = frame.f_back
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{frame.f_lineno} ({code.co_name})"
+
+
+def _wrap(operation, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            site = _call_site(sys._getframe(1))
+            for counts in _active:
+                counts.record(operation, site, elapsed)
+    return wrapper
+
+
+def _install():
+    original = ECPointModule.mod_inverse
+    wrapped = _wrap('mod_inverse', original)
+    # mod_inverse подменяется во всех модулях, импортировавших его по имени.
+    for module in list(sys.modules.values()):
+        if getattr(module, 'mod_inverse', None) is original:
+            _patched.append((module, 'mod_inverse', original))
+            setattr(module, 'mod_inverse', wrapped)
+    for cls, name in INSTRUMENTED_METHODS:
+        method = cls.__dict__[name]
+        _patched.append((cls, name, method))
+        setattr(cls, name, _wrap(f"{cls.__name__}.{name}", method))
+
+
+def _uninstall():
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+
+
+class instrument:
+    """
+    Контекстный менеджер, считающий операции внутри блока with:
+
+        with instrument() as counts:
+            find_prime_subgroups(curve)
+        counts['mod_inverse'], counts.as_dict()
+
+    Обёртки над mod_inverse и методами точек устанавливаются при входе в первый
+    из вложенных блоков и снимаются при выходе из последнего, поэтому вне блоков
+    арифметика работает без каких-либо накладных расходов.
+    """
+    def __init__(self):
+        self.counts = OperationCounts()
+
+    def __enter__(self):
+        if not _active:
+            _install()
+        _active.append(self.counts)
+        return self.counts
+
+    def __exit__(self, *exc_info):
+        _active.remove(self.counts)
+        if not _active:
+            _uninstall()
+        return False
+
+
+def count_operations(function, *args, **kwargs):
+    """
+    Вызывает function(*args, **kwargs) под instrument().
+    Возвращает пару (результат, OperationCounts).
+    """
+    with instrument() as counts:
+        result = function(*args, **kwargs)
+    return result, counts
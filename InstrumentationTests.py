@@ -0,0 +1,60 @@
+from EllipticCurve import EllipticCurve
+from ECPoint import ECPoint
+from ECPointJacobian import ECPointJacobian
+from Instrumentation import instrument, count_operations
+from Tools import bsgs, find_points, find_prime_subgroups
+import ECPoint as ECPointModule
+import PointCounting
+import json
+
+
+def test_counts_point_operations():
+    curve = EllipticCurve(97, 2, 3)
+    points = find_points(curve)
+    P = points[1]
+    Q = next(R for R in points[2:] if R.x != P.x)
+    original_add = ECPoint.__add__
+    with instrument() as counts:
+        P + Q
+        P.double()
+    assert counts['ECPoint.__add__'] == 1
+    assert counts['ECPoint.double'] == 1
+    assert counts['mod_inverse'] == 2
+    sites = counts.as_dict()['call_sites']
+    assert any(site['site'].startswith('InstrumentationTests.py') for site in sites)
+    # После выхода из блока обёртки сняты.
+    assert ECPoint.__add__ is original_add
+    assert PointCounting.mod_inverse is ECPointModule.mod_inverse
+    assert json.loads(counts.to_json())['operations']['ECPoint.__add__']['count'] == 1
+
+
+def test_call_site_skips_field_layer():
+    curve = EllipticCurve(97, 2, 3)
+    points = find_points(curve)
+    P = points[1]
+    Q = next(R for R in points[2:] if R.x != P.x)
+    with instrument() as counts:
+        P + Q
+    sites = [site['site'] for site in counts.as_dict()['call_sites'] if site['operation'] == 'mod_inverse']
+    # Обращение выполняется через PrimeField.inv, но место вызова - формула сложения в ECPoint.
+    assert len(sites) == 1 and sites[0].startswith('ECPoint.py:')
+    assert '(__add__)' in sites[0]
+
+
+def test_nested_scopes_and_scalar_multiplication():
+    curve = EllipticCurve(1009, 2, 3)
+    P = find_points(curve)[5]
+    with instrument() as outer:
+        n, inner = count_operations(lambda: (1000 * P, bsgs(curve, P, 17 * P)))
+    assert inner['ECPoint.__mul__'] >= 2
+    assert inner['ECPointJacobian.double'] > 0
+    assert outer['ECPoint.__mul__'] == inner['ECPoint.__mul__']
+    assert ECPointJacobian.double.__name__ == 'double' and not hasattr(ECPointJacobian.double, '__wrapped__')
+
+
+def test_subgroup_inversions():
+    curve = EllipticCurve(101, 1, 1)
+    groups, counts = count_operations(find_prime_subgroups, curve)
+    assert [len(g) for g in groups] == [3, 5, 7]
+    assert counts['mod_inverse'] > 0
+    assert counts.time('mod_inverse') >= 0
@@ -0,0 +1,66 @@
+def legendre_symbol(a, p):
+    """
+       Вычисляет символ Лежандра (a / p), который равен:
+       -1, если a является квадратичным вычетом по модулю p,
+       1, если a не является квадратичным вычетом по модулю p,
+       и 0, если a делится на p.
+
+       Аргументы:
+       a -- Целое число, для которого вычисляется символ Лежандра
+       p -- Простое число, модуль
+
+       Возвращает:
+       1, -1 или 0 в зависимости от значения символа Лежандра.
+       """
+    ls = pow(a, (p - 1) // 2, p)
+    if ls == p - 1:
+        return -1
+    return ls
+
+
+def tonelli_shanks(n, p):
+    """
+      Алгоритм Тонелли-Шэнкса для нахождения квадратичного корня по модулю простого числа p
+      при условии, что корень существует (символ Лежандра равен 1).
+
+      Аргументы:
+      n -- Число, для которого нужно найти квадратичный корень
+      p -- Простое число, модуль
+
+      Возвращает:
+      Квадратичный корень n по модулю p, если он существует, иначе None.
+      """
+    if legendre_symbol(n, p) != 1:
+        return None
+    if n == 0:
+        return 0
+    if p == 2:
+        return p
+    if p % 4 == 3:
+        x = pow(n, (p + 1) // 4, p)
+        return x
+    Q = p - 1
+    S = 0
+    while Q % 2 == 0:
+        Q //= 2
+        S += 1
+    z = 2
+    while legendre_symbol(z, p) != -1:
+        z += 1
+    c = pow(z, Q, p)
+    x = pow(n, (Q + 1) // 2, p)
+    t = pow(n, Q, p)
+    m = S
+    while t != 1:
+        i, temp = 0, t
+        while temp != 1 and i < m:
+            temp = pow(temp, 2, p)
+            i += 1
+        if i == m:
+            return None
+        b = pow(c, 1 << (m - i - 1), p)
+        x = (x * b) % p
+        t = (t * b * b) % p
+        c = (b * b) % p
+        m = i
+    return x
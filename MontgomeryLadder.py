@@ -0,0 +1,112 @@
+from ECPoint import ECPoint, batch_inverse, mod_inverse, point_neg
+from ECPointInf import ECPointInf
+from ModularArithmetic import legendre_symbol
+
+
+def _x_double(X, Z, a, b, p):
+    """
+    Удвоение в координатах (X : Z), x = X / Z:
+        X2 = (X² - aZ²)² - 8bXZ³,  Z2 = 4Z(X³ + aXZ² + bZ³).
+    """
+    XX = X * X % p
+    ZZ = Z * Z % p
+    t = (XX - a * ZZ) % p
+    X2 = (t * t - 8 * b * X * ZZ * Z) % p
+    Z2 = 4 * Z * (X * XX + a * X * ZZ + b * ZZ * Z) % p
+    return X2, Z2
+
+
+def _x_add(X1, Z1, X2, Z2, x0, a, b, p):
+    """
+    Дифференциальное сложение: по (X1 : Z1), (X2 : Z2) и абсциссе x0 их разности
+    вычисляет сумму (аддитивная формула, верна и при x0 = 0):
+        X3 = 2(X1Z2 + X2Z1)(X1X2 + aZ1Z2) + 4b(Z1Z2)² - x0(X1Z2 - X2Z1)²,
+        Z3 = (X1Z2 - X2Z1)².
+    """
+    u = X1 * Z2 % p
+    v = X2 * Z1 % p
+    ZZ = Z1 * Z2 % p
+    d = (u - v) * (u - v) % p
+    X3 = (2 * (u + v) * (X1 * X2 + a * ZZ) + 4 * b * ZZ * ZZ - x0 * d) % p
+    return X3, d
+
+
+def _ladder(curve, x, k, bits):
+    """
+    Лестница Монтгомери: возвращает (X0 : Z0) = k * P и (X1 : Z1) = (k + 1) * P,
+    где x - абсцисса P. На каждом из bits разрядов выполняется ровно одно
+    дифференциальное сложение и одно удвоение; разряд лишь переставляет регистры.
+    """
+    p, a, b = curve.p, curve.a, curve.b
+    R0 = (1, 0)  # бесконечно удалённая точка
+    R1 = (x, 1)
+    for i in range(bits - 1, -1, -1):
+        bit = (k >> i) & 1
+        if bit:
+            R0, R1 = R1, R0
+        R1 = _x_add(*R0, *R1, x, a, b, p)
+        R0 = _x_double(*R0, a, b, p)
+        if bit:
+            R0, R1 = R1, R0
+    return R0, R1
+
+
+def _ladder_bits(curve, k, bits):
+    # Длина лестницы не зависит от k: по теореме Хассе порядок точки меньше 2^(bits(p) + 1).
+    if bits is None:
+        bits = curve.p.bit_length() + 1
+    return max(bits, k.bit_length())
+
+
+def montgomery_ladder_x(curve, x, k, bits=None, check=True):
+    """
+    Вычисляет абсциссу k * P по одной абсциссе x точки P, не вычисляя ординат.
+
+    Используется x-only лестница Монтгомери в координатах (X : Z) для кривых
+    в форме Вейерштрасса с одним обращением в конце. Число шагов равно bits
+    (по умолчанию - длина p плюс один бит), так что последовательность операций
+    не зависит от значения k. Так как x(-Q) = x(Q), знак k не важен.
+
+    При check=True проверяется, что x - абсцисса точки кривой, а не её
+    квадратичного кручения. Возвращает абсциссу либо None, если k * P = O.
+    """
+    p = curve.p
+    x %= p
+    if check and legendre_symbol((x * x * x + curve.a * x + curve.b) % p, p) == -1:
+        raise ValueError("Абсцисса не соответствует точке кривой.")
+    k = abs(k)
+    (X, Z), _ = _ladder(curve, x, k, _ladder_bits(curve, k, bits))
+    if Z % p == 0:
+        return None
+    return X * mod_inverse(Z, p) % p
+
+
+def montgomery_ladder(P, k, bits=None):
+    """
+    Скалярное умножение k * P лестницей Монтгомери с восстановлением ординаты.
+
+    Лестница даёт абсциссы x0 = x(kP) и x1 = x((k + 1)P); ордината kP
+    восстанавливается по формуле Океи-Сакураи:
+        y0 = (2b + (a + x * x0)(x + x0) - x1 (x - x0)²) / (2y),
+    где (x, y) = P. Все три обращения выполняются одним batch_inverse.
+    """
+    if isinstance(P, ECPointInf):
+        return P
+    if k < 0:
+        return point_neg(montgomery_ladder(P, -k, bits))
+    curve = P.curve
+    p, a, b = curve.p, curve.a, curve.b
+    if P.y == 0:
+        # P второго порядка: ордината не восстанавливается делением на 2y.
+        return P if k % 2 else ECPointInf(curve)
+    (X0, Z0), (X1, Z1) = _ladder(curve, P.x, k, _ladder_bits(curve, k, bits))
+    if Z0 % p == 0:
+        return ECPointInf(curve)
+    if Z1 % p == 0:
+        return point_neg(P)  # (k + 1) * P = O
+    z0_inv, z1_inv, y2_inv = batch_inverse([Z0, Z1, 2 * P.y], p)
+    x0 = X0 * z0_inv % p
+    x1 = X1 * z1_inv % p
+    x = P.x
+    y0 = (2 * b + (a + x * x0) * (x + x0) - x1 * (x - x0) * (x - x0)) * y2_inv % p
+    return ECPoint._unchecked(curve, x0, y0)
@@ -0,0 +1,38 @@
+from EllipticCurve import EllipticCurve
+from ECPointInf import ECPointInf
+from MontgomeryLadder import montgomery_ladder, montgomery_ladder_x
+from PointCounting import random_point
+from Tools import find_points, point_order
+import random
+import pytest
+
+
+def test_ladder_small_curve():
+    for curve in (EllipticCurve(97, 2, 3), EllipticCurve(101, 0, 1), EllipticCurve(101, 1, 0)):
+        for P in find_points(curve)[1:]:
+            n = point_order(P)
+            for k in range(0, 2 * n + 2):
+                expected = k * P
+                x = montgomery_ladder_x(curve, P.x, k)
+                assert x == (None if isinstance(expected, ECPointInf) else expected.x)
+                assert montgomery_ladder(P, k) == expected
+            assert montgomery_ladder(P, -3) == -3 * P
+
+
+def test_ladder_large_curve():
+    random.seed(4)
+    curve = EllipticCurve(2**127 - 1, -3, 7)
+    for _ in range(5):
+        P = random_point(curve)
+        k = random.getrandbits(160)
+        assert montgomery_ladder_x(curve, P.x, k) == (k * P).x
+        assert montgomery_ladder(P, k) == k * P
+
+
+def test_ladder_rejects_twist():
+    curve = EllipticCurve(97, 2, 3)
+    xs = {P.x for P in find_points(curve)[1:]}
+    x = next(x for x in range(97) if x not in xs)
+    with pytest.raises(ValueError):
+        montgomery_ladder_x(curve, x, 5)
+    montgomery_ladder_x(curve, x, 5, check=False)
@@ -0,0 +1,115 @@
+from ECPoint import batch_to_affine, jacobian_to_affine, point_neg, wnaf
+from ECPointInf import ECPointInf
+from ECPointJacobian import ECPointJacobian
+
+# Начиная с этого числа слагаемых вместо метода Штрауса применяется метод Пиппенджера.
+PIPPENGER_THRESHOLD = 32
+# Ширина окна wNAF для метода Штрауса.
+STRAUS_WIDTH = 4
+
+
+def multi_scalar_mul(scalars, points):
+    """
+    Вычисляет сумму k_1 * P_1 + ... + k_n * P_n.
+
+    При небольшом числе слагаемых используется метод Штрауса (Шамира): все скаляры
+    обрабатываются одним проходом с общими удвоениями. При большом числе слагаемых -
+    метод Пиппенджера с корзинами, стоимость которого в пересчёте на одно слагаемое
+    убывает с ростом n.
+
+    Аргументы:
+    scalars -- Список целых коэффициентов k_i
+    points -- Список точек P_i (ECPoint или ECPointInf) одной кривой
+
+    Возвращает:
+    ECPoint или ECPointInf.
+    """
+    if len(scalars) != len(points):
+        raise ValueError("Число скаляров не совпадает с числом точек.")
+    if not points:
+        raise ValueError("Список точек пуст.")
+    curve = points[0].curve
+    terms = []
+    for k, P in zip(scalars, points):
+        if k == 0 or isinstance(P, ECPointInf):
+            continue
+        terms.append((k, P) if k > 0 else (-k, point_neg(P)))
+    if not terms:
+        return ECPointInf(curve)
+    if len(terms) < PIPPENGER_THRESHOLD:
+        return straus(terms, curve)
+    return pippenger(terms, curve)
+
+
+def straus(terms, curve, w=STRAUS_WIDTH):
+    """
+    Метод Штрауса: для каждой точки строится таблица нечётных кратных,
+    а цифры wNAF всех скаляров обрабатываются за один общий проход удвоений.
+    terms -- список пар (k, P) с k > 0.
+    """
+    size = 1 << (w - 2)
+    jacobian = []
+    for _, P in terms:
+        J = ECPointJacobian.from_affine(P)
+        twoJ = J.double()
+        jacobian.append(J)
+        for _ in range(size - 1):
+            jacobian.append(jacobian[-1] + twoJ)
+    # Все таблицы нормализуются одним пакетным обращением.
+    affine = batch_to_affine(jacobian)
+    tables = [affine[i * size:(i + 1) * size] for i in range(len(terms))]
+    negatives = [[point_neg(Q) for Q in table] for table in tables]
+    digits = [wnaf(k, w) for k, _ in terms]
+
+    result = ECPointJacobian.infinity(curve)
+    for i in range(max(len(d) for d in digits) - 1, -1, -1):
+        result = result.double()
+        for j, ds in enumerate(digits):
+            if i >= len(ds):
+                continue
+            d = ds[i]
+            if d > 0:
+                result = result.add_affine(tables[j][d >> 1])
+            elif d < 0:
+                result = result.add_affine(negatives[j][-d >> 1])
+    return jacobian_to_affine(result)
+
+
+def pippenger_window(n):
+    """
+    Ширина окна метода Пиппенджера для n слагаемых: примерно log2(n) - 2 бита.
+    """
+    return max(2, n.bit_length() - 2)
+
+
+def pippenger(terms, curve, c=None):
+    """
+    Метод Пиппенджера: скаляры делятся на окна по c бит; в каждом окне точки
+    раскладываются по корзинам согласно цифре, а сумма (цифра * корзина) получается
+    двумя бегущими суммами без умножений.
+    terms -- список пар (k, P) с k > 0.
+    """
+    if c is None:
+        c = pippenger_window(len(terms))
+    bits = max(k.bit_length() for k, _ in terms)
+    windows = -(-bits // c)
+    mask = (1 << c) - 1
+    result = ECPointJacobian.infinity(curve)
+    for window in range(windows - 1, -1, -1):
+        for _ in range(c):
+            result = result.double()
+        shift = window * c
+        buckets = [None] * (1 << c)
+        for k, P in terms:
+            digit = (k >> shift) & mask
+            if digit:
+                bucket = buckets[digit]
+                buckets[digit] = ECPointJacobian.from_affine(P) if bucket is None else bucket.add_affine(P)
+        running = ECPointJacobian.infinity(curve)
+        total = ECPointJacobian.infinity(curve)
+        for digit in range(mask, 0, -1):
+            if buckets[digit] is not None:
+                running = running + buckets[digit]
+            total = total + running
+        result = result + total
+    return jacobian_to_affine(result)
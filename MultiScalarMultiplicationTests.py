@@ -0,0 +1,47 @@
+from EllipticCurve import EllipticCurve
+from ECPoint import ECPoint
+from ECPointInf import ECPointInf
+from MultiScalarMultiplication import multi_scalar_mul, straus, pippenger
+from Tools import find_points
+import random
+import pytest
+
+
+def naive_sum(scalars, points):
+    result = ECPointInf(points[0].curve)
+    for k, P in zip(scalars, points):
+        result = result + k * P
+    return result
+
+
+@pytest.mark.parametrize('n', [1, 2, 5, 31, 32, 100])
+def test_multi_scalar_mul(n):
+    random.seed(n)
+    curve = EllipticCurve(1009, 2, 3)
+    points = find_points(curve)
+    Ps = [random.choice(points) for _ in range(n)]
+    ks = [random.randrange(-3000, 3000) for _ in range(n)]
+    assert multi_scalar_mul(ks, Ps) == naive_sum(ks, Ps)
+
+
+def test_straus_and_pippenger_agree():
+    random.seed(7)
+    curve = EllipticCurve(1009, 2, 3)
+    points = find_points(curve)[1:]
+    terms = [(random.randrange(1, 2**20), random.choice(points)) for _ in range(20)]
+    expected = naive_sum(*zip(*terms))
+    assert straus(terms, curve) == expected
+    for c in (1, 3, 6):
+        assert pippenger(terms, curve, c) == expected
+
+
+def test_multi_scalar_mul_edge_cases():
+    curve = EllipticCurve(17, 2, 2)
+    P = ECPoint(curve, 5, 1)
+    # Взаимно уничтожающиеся слагаемые, нулевые скаляры и бесконечно удалённая точка.
+    assert isinstance(multi_scalar_mul([3, -3], [P, P]), ECPointInf)
+    assert isinstance(multi_scalar_mul([0, 5], [P, ECPointInf(curve)]), ECPointInf)
+    with pytest.raises(ValueError):
+        multi_scalar_mul([1, 2], [P])
+    with pytest.raises(ValueError):
+        multi_scalar_mul([], [])
@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+
+from DiscreteLog import parallel_pollard_rho
+from EllipticCurve import EllipticCurve
+from PointCounting import random_point
+from Tools import curve_order_factorization
+
+# Кривая над 40-битным полем порядка 2^2 * 5 * 4289 * 12817811.
+CURVE = EllipticCurve(1099511627791, 3, 7)
+SUBGROUP_ORDER = 12817811
+
+
+def measure(G, workers, duration):
+    """
+    Решает случайные задачи в подгруппе, пока суммарное время не превысит duration секунд.
+    Возвращает (число задач, шагов, отличительных точек, время).
+    """
+    solved = steps = distinguished = 0
+    elapsed = 0.0
+    while elapsed < duration:
+        results = []
+        d = random.randrange(SUBGROUP_ORDER)
+        assert parallel_pollard_rho(CURVE, G, d * G, SUBGROUP_ORDER, workers=workers,
+                                    progress=results.append) == d
+        stats = results[-1]
+        solved += 1
+        steps += stats.steps
+        distinguished += stats.distinguished
+        elapsed += stats.elapsed
+    return solved, steps, distinguished, elapsed
+
+
+def main():
+    """
+    Сравнивает производительность параллельного ро-метода при разном числе процессов.
+    Аргументы командной строки: наибольшее число процессов (по умолчанию число ядер)
+    и длительность замера для каждого числа процессов в секундах (по умолчанию 5).
+    """
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    random.seed(1)
+    order, _ = curve_order_factorization(CURVE)
+    G = (order // SUBGROUP_ORDER) * random_point(CURVE)
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        solved, steps, distinguished, elapsed = measure(G, workers, duration)
+        throughput = steps / elapsed
+        baseline = baseline or throughput
+        print(f"процессов: {workers:<3} задач: {solved:<4} шагов: {steps:<9} отличительных точек: {distinguished:<7} "
+              f"{throughput:10.0f} шагов/с  ускорение: {throughput / baseline:5.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import sys
+import time
+import tracemalloc
+
+from ECPoint import ECPoint, mod_inverse
+from ECPointInf import ECPointInf
+from ScalarMultiplicationBenchmark import SECP256K1, SECP256K1_G
+
+
+class LegacyECPoint:
+    """
+    Прежнее представление точки: атрибуты в __dict__, а каждый результат сложения
+    и удвоения заново приводится по модулю p и проверяется is_on_curve.
+    """
+    def __init__(self, curve, x, y):
+        self.curve = curve
+        self.x = x % curve.p
+        self.y = y % curve.p
+        if not curve.is_on_curve((self.x, self.y)):
+            raise ValueError("Точка не принадлежит кривой.")
+        self._wnaf_table = None
+
+    def __add__(self, other):
+        if self.x == other.x:
+            if (self.y + other.y) % self.curve.p == 0:
+                return ECPointInf(self.curve)
+            return self.double()
+        m = ((other.y - self.y) * mod_inverse(other.x - self.x, self.curve.p)) % self.curve.p
+        x3 = (m**2 - self.x - other.x) % self.curve.p
+        y3 = (m * (self.x - x3) - self.y) % self.curve.p
+        return LegacyECPoint(self.curve, x3, y3)
+
+    def double(self):
+        if self.y % self.curve.p == 0:
+            return ECPointInf(self.curve)
+        m = ((3 * self.x**2 + self.curve.a) * mod_inverse(2 * self.y, self.curve.p)) % self.curve.p
+        x3 = (m**2 - 2 * self.x) % self.curve.p
+        y3 = (m * (self.x - x3) - self.y) % self.curve.p
+        return LegacyECPoint(self.curve, x3, y3)
+
+
+def chain(operation, start, step, count):
+    """
+    Выполняет count операций, храня все результаты, чтобы tracemalloc учёл их память.
+    """
+    results = []
+    point = start
+    for _ in range(count):
+        point = operation(point, step)
+        results.append(point)
+    return results
+
+
+def measure(label, cls, operation, count):
+    G = cls(SECP256K1, *SECP256K1_G)
+    H = G.double()
+    start = time.perf_counter()
+    chain(operation, H, G, count)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    results = chain(operation, H, G, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_point = sys.getsizeof(results[0]) + (sys.getsizeof(results[0].__dict__)
+                                             if hasattr(results[0], '__dict__') else 0)
+    print(f"  {label:<28} {1e6 * elapsed / count:8.2f} мкс/оп.  {size / count:8.1f} байт/оп."
+          f"  объект точки {per_point} байт")
+
+
+def main(count=2000):
+    print(f"secp256k1, {count} операций:")
+    for name, cls in (("прежняя точка", LegacyECPoint), ("ECPoint", ECPoint)):
+        measure(f"{name}: сложение", cls, lambda P, G: P + G, count)
+        measure(f"{name}: удвоение", cls, lambda P, G: P.double(), count)
+    print(f"  ECPointInf(curve) is ECPointInf(curve): {ECPointInf(SECP256K1) is ECPointInf(SECP256K1)}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,217 @@
+from ECPoint import ECPoint, add_coordinates, coordinate_size, wnaf
+from ECPointInf import ECPointInf
+
+# Байт-признак записи: бесконечно удалённая точка и аффинная точка (как в SEC1 без сжатия).
+TAG_INFINITY = 0x00
+TAG_AFFINE = 0x04
+
+
+class PointBatch:
+    """
+    Набор точек одной кривой в непрерывном буфере записей фиксированной длины.
+
+    Каждая запись занимает 1 + 2 * size байт (size = coordinate_size(curve)):
+    байт-признак (TAG_AFFINE для аффинной точки, TAG_INFINITY для бесконечно
+    удалённой - он же служит маской бесконечности), затем X и Y в big-endian.
+    Буфер - bytearray либо любой объект с протоколом буфера (например, mmap);
+    срезы с шагом 1 разделяют буфер с исходным набором без копирования.
+
+    Операции над набором (сложение, удвоение, умножение на общий скаляр) выполняются
+    над всеми точками сразу с одним пакетным обращением в поле на шаг: записи
+    разбираются в целые одним проходом по буферу, а результат собирается в новый
+    буфер тоже одним проходом (умножение разбирает записи один раз на весь проход
+    по цифрам скаляра). Сравнение со списком ECPoint - в PointBatchBenchmark.
+    """
+    def __init__(self, curve, buffer, start=0, count=None):
+        self.curve = curve
+        self.size = coordinate_size(curve)
+        self.record_size = 1 + 2 * self.size
+        view = memoryview(buffer).cast('B')
+        if count is None:
+            count = (len(view) - start * self.record_size) // self.record_size
+        self._view = view[start * self.record_size:(start + count) * self.record_size]
+
+    @classmethod
+    def empty(cls, curve, count):
+        """
+        Набор из count бесконечно удалённых точек.
+        """
+        return cls(curve, bytearray(count * (1 + 2 * coordinate_size(curve))))
+
+    @classmethod
+    def from_points(cls, curve, points):
+        batch = cls.empty(curve, len(points))
+        for i, P in enumerate(points):
+            batch[i] = P
+        return batch
+
+    @classmethod
+    def _from_coordinates(cls, curve, coordinates):
+        # Записи собираются одним проходом, без проверок индексов _write.
+        size = coordinate_size(curve)
+        empty = bytes(1 + 2 * size)
+        affine = bytes([TAG_AFFINE])
+        records = [empty if xy is None else
+                   affine + xy[0].to_bytes(size, 'big') + xy[1].to_bytes(size, 'big')
+                   for xy in coordinates]
+        return cls(curve, bytearray(b''.join(records)))
+
+    def __len__(self):
+        return len(self._view) // self.record_size
+
+    @property
+    def buffer(self):
+        """
+        memoryview записей набора (без копирования).
+        """
+        return self._view
+
+    def tobytes(self):
+        return self._view.tobytes()
+
+    def _offset(self, i):
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError("Индекс вне набора точек.")
+        return (i % n) * self.record_size
+
+    def _read(self, i):
+        o = self._offset(i)
+        view = self._view
+        if view[o] == TAG_INFINITY:
+            return None
+        size = self.size
+        return (int.from_bytes(view[o + 1:o + 1 + size], 'big'),
+                int.from_bytes(view[o + 1 + size:o + self.record_size], 'big'))
+
+    def _write(self, i, xy):
+        o = self._offset(i)
+        size = self.size
+        if xy is None:
+            self._view[o:o + self.record_size] = bytes(self.record_size)
+        else:
+            self._view[o] = TAG_AFFINE
+            self._view[o + 1:o + 1 + size] = xy[0].to_bytes(size, 'big')
+            self._view[o + 1 + size:o + self.record_size] = xy[1].to_bytes(size, 'big')
+
+    def coordinates(self):
+        """
+        Список пар координат (x, y) точек набора; None - бесконечно удалённая точка.
+        """
+        data = self._view.tobytes()  # разбор bytes быстрее срезов memoryview
+        size, record_size = self.size, self.record_size
+        from_bytes = int.from_bytes
+        return [None if data[o] == TAG_INFINITY else
+                (from_bytes(data[o + 1:o + 1 + size], 'big'),
+                 from_bytes(data[o + 1 + size:o + record_size], 'big'))
+                for o in range(0, len(data), record_size)]
+
+    def infinity_mask(self):
+        """
+        Список признаков: True для бесконечно удалённых точек.
+        """
+        return [tag == TAG_INFINITY for tag in self._view[::self.record_size]]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return PointBatch(self.curve, self._view, start, max(0, stop - start))
+            # Срез с шагом не непрерывен в буфере, поэтому копируется.
+            return PointBatch._from_coordinates(
+                self.curve, [self._read(i) for i in range(start, stop, step)])
+        xy = self._read(index)
+        if xy is None:
+            return ECPointInf(self.curve)
+        return ECPoint._unchecked(self.curve, *xy)
+
+    def __setitem__(self, index, P):
+        if isinstance(P, ECPointInf):
+            self._write(index, None)
+        else:
+            if P.curve != self.curve:
+                raise ValueError("Точка принадлежит другой кривой.")
+            self._write(index, (P.x, P.y))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_points(self):
+        return list(self)
+
+    def is_on_curve(self):
+        """
+        Список признаков принадлежности кривой для каждой записи набора.
+        Запись с байтом-признаком, отличным от TAG_INFINITY и TAG_AFFINE, не проходит проверку.
+        """
+        p, a, b = self.curve.p, self.curve.a, self.curve.b
+        mask = []
+        for tag, xy in zip(self._view[::self.record_size], self.coordinates()):
+            if tag == TAG_INFINITY:
+                mask.append(True)
+            elif tag != TAG_AFFINE:
+                mask.append(False)
+            else:
+                x, y = xy
+                mask.append(x < p and y < p and (y * y - (x * x * x + a * x + b)) % p == 0)
+        return mask
+
+    def all_on_curve(self):
+        return all(self.is_on_curve())
+
+    def negate(self):
+        p = self.curve.p
+        return PointBatch._from_coordinates(
+            self.curve, [None if xy is None else (xy[0], -xy[1] % p) for xy in self.coordinates()])
+
+    def add(self, other):
+        """
+        Попарная сумма точек двух наборов одинаковой длины.
+        """
+        if len(self) != len(other):
+            raise ValueError("Наборы точек должны иметь одинаковую длину.")
+        return PointBatch._from_coordinates(
+            self.curve, add_coordinates(self.curve, self.coordinates(), other.coordinates()))
+
+    def double(self):
+        coordinates = self.coordinates()
+        return PointBatch._from_coordinates(
+            self.curve, add_coordinates(self.curve, coordinates, coordinates))
+
+    def multiply(self, k):
+        """
+        Умножает все точки набора на один и тот же скаляр k.
+
+        Скаляр записывается в несмежной форме (NAF); на каждой цифре все точки
+        удваиваются и при ненулевой цифре складываются с ±P, причём наклоны всех
+        точек набора находятся одним пакетным обращением.
+        """
+        base = self.coordinates()
+        if k < 0:
+            k = -k
+            base = [None if xy is None else (xy[0], -xy[1] % self.curve.p) for xy in base]
+        negated = [None if xy is None else (xy[0], -xy[1] % self.curve.p) for xy in base]
+        acc = [None] * len(base)
+        for digit in reversed(wnaf(k, 2)):
+            acc = add_coordinates(self.curve, acc, acc)
+            if digit == 1:
+                acc = add_coordinates(self.curve, acc, base)
+            elif digit == -1:
+                acc = add_coordinates(self.curve, acc, negated)
+        return PointBatch._from_coordinates(self.curve, acc)
+
+    def __add__(self, other):
+        return self.add(other)
+
+    def __neg__(self):
+        return self.negate()
+
+    def __mul__(self, k):
+        return self.multiply(k)
+
+    def __rmul__(self, k):
+        return self.multiply(k)
+
+    def __repr__(self):
+        return f"PointBatch({len(self)} точек)"
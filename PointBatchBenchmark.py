@@ -0,0 +1,58 @@
+import random
+import sys
+import time
+
+from ECPoint import ECPoint, batch_add, batch_double
+from PointBatch import PointBatch
+from ScalarMultiplicationBenchmark import SECP256K1, SECP256K1_G
+
+
+def best_time(function, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count=2000):
+    """
+    Сравнивает операции над PointBatch со списком ECPoint той же длины: поэлементные
+    операции (одно обращение на точку) и batch_add / batch_double (одно пакетное
+    обращение на список). Время PointBatch включает разбор записей и запись результата.
+    """
+    random.seed(1)
+    G = ECPoint(SECP256K1, *SECP256K1_G)
+    Ps = [random.getrandbits(64) * G for _ in range(count)]
+    Qs = [random.getrandbits(64) * G for _ in range(count)]
+    left = PointBatch.from_points(SECP256K1, Ps)
+    right = PointBatch.from_points(SECP256K1, Qs)
+    k = random.getrandbits(64)
+    small = min(count, 200)
+    cases = (
+        ("сложение", [
+            ("список ECPoint", lambda: [P + Q for P, Q in zip(Ps, Qs)]),
+            ("batch_add", lambda: batch_add(Ps, Qs)),
+            ("PointBatch.add", lambda: left.add(right)),
+        ]),
+        ("удвоение", [
+            ("список ECPoint", lambda: [P.double() for P in Ps]),
+            ("batch_double", lambda: batch_double(Ps)),
+            ("PointBatch.double", lambda: left.double()),
+        ]),
+        (f"умножение {small} точек на 64-битный скаляр", [
+            ("список ECPoint", lambda: [k * P for P in Ps[:small]]),
+            ("PointBatch.multiply", lambda: left[:small].multiply(k)),
+        ]),
+    )
+    print(f"secp256k1, {count} точек:")
+    for title, variants in cases:
+        print(f"  {title}:")
+        for label, function in variants:
+            elapsed = best_time(function)
+            print(f"    {label:<22} {1000 * elapsed:9.2f} мс")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,68 @@
+from EllipticCurve import EllipticCurve
+from ECPointInf import ECPointInf
+from PointBatch import PointBatch, TAG_AFFINE, TAG_INFINITY
+from PointCounting import random_point
+from Tools import find_points
+import random
+import pytest
+
+CURVE = EllipticCurve(97, 2, 3)
+
+
+def test_round_trip_and_layout():
+    points = find_points(CURVE)
+    batch = PointBatch.from_points(CURVE, points)
+    assert len(batch) == len(points)
+    assert batch.record_size == 3
+    assert batch.to_points() == points
+    assert batch.buffer[0] == TAG_INFINITY and batch.buffer[3] == TAG_AFFINE
+    assert batch.infinity_mask() == [isinstance(P, ECPointInf) for P in points]
+    assert batch.all_on_curve()
+
+
+def test_zero_copy_slice():
+    points = find_points(CURVE)
+    batch = PointBatch.from_points(CURVE, points)
+    window = batch[10:20]
+    assert window.to_points() == points[10:20]
+    window[0] = ECPointInf(CURVE)
+    assert isinstance(batch[10], ECPointInf)  # срез разделяет буфер
+    assert batch[::7].to_points() == [batch[i] for i in range(0, len(batch), 7)]
+    with pytest.raises(IndexError):
+        batch[len(batch)]
+
+
+def test_batch_arithmetic():
+    random.seed(5)
+    points = find_points(CURVE)
+    left = [random.choice(points) for _ in range(200)]
+    right = [random.choice(points) for _ in range(200)]
+    right[:len(points)] = [-P for P in points]  # суммы P + (-P)
+    right[-1] = left[-1]  # удвоение внутри сложения
+    A = PointBatch.from_points(CURVE, left)
+    B = PointBatch.from_points(CURVE, right)
+    assert (A + B).to_points() == [P + Q for P, Q in zip(left, right)]
+    assert A.double().to_points() == [P + P for P in left]
+    assert (-A).to_points() == [-P for P in left]
+    for k in (0, 1, 2, 7, 100, -13, 2**20 + 3):
+        assert (k * A).to_points() == [k * P for P in left]
+
+
+def test_on_curve_check():
+    batch = PointBatch.from_points(CURVE, find_points(CURVE)[:5])
+    batch.buffer[4] ^= 1  # портим абсциссу второй записи
+    assert batch.is_on_curve() == [True, False, True, True, True]
+    assert not batch.all_on_curve()
+    # Неизвестный байт-признак: координаты третьей записи верны, но запись не проходит проверку.
+    batch.buffer[2 * batch.record_size] = 0x05
+    batch.buffer[0] = 0x07
+    assert batch.is_on_curve() == [False, False, False, True, True]
+
+
+def test_large_field_records():
+    curve = EllipticCurve(2**127 - 1, 2, 3)
+    P = random_point(curve)
+    points = [k * P for k in range(1, 30)]
+    batch = PointBatch.from_points(curve, points)
+    assert batch.record_size == 33
+    assert (3 * batch).to_points() == [3 * Q for Q in points]
@@ -0,0 +1,404 @@
+import math
+import random
+
+from ECPoint import ECPoint, mod_inverse, point_neg, point_progression
+from ECPointInf import ECPointInf
+from EllipticCurve import EllipticCurve
+from ModularArithmetic import legendre_symbol, tonelli_shanks
+from Primality import is_prime
+
+# Порог числа совпадений при поиске кратных порядка точки в интервале Хассе:
+# точка с большим числом кратных в интервале ничего не сообщает о порядке кривой.
+MESTRE_MAX_CANDIDATES = 16
+
+
+class _Split(Exception):
+    """
+    Возбуждается, когда в кольце F_p[x] / (h) встретился необратимый элемент.
+    Содержит собственный делитель модуля h, по которому вычисления можно продолжить.
+    """
+    def __init__(self, factor):
+        super().__init__(factor)
+        self.factor = factor
+
+
+# Многочлены над F_p хранятся списками коэффициентов от младшего к старшему
+# без старших нулей; нулевой многочлен - пустой список.
+
+def _trim(a):
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+
+def _poly_add(a, b, p):
+    if len(a) < len(b):
+        a, b = b, a
+    return _trim([(c + (b[i] if i < len(b) else 0)) % p for i, c in enumerate(a)])
+
+
+def _poly_sub(a, b, p):
+    n = max(len(a), len(b))
+    return _trim([((a[i] if i < len(a) else 0) - (b[i] if i < len(b) else 0)) % p for i in range(n)])
+
+
+def _poly_scale(a, c, p):
+    return _trim([(c * x) % p for x in a])
+
+
+def _poly_mul(a, b, p):
+    """
+    Умножение многочленов подстановкой Кронекера: коэффициенты упаковываются
+    в одно большое целое, и произведение вычисляется встроенным умножением целых.
+    """
+    if not a or not b:
+        return []
+    width = (2 * p.bit_length() + min(len(a), len(b)).bit_length() + 7) // 8
+    count = len(a) + len(b) - 1
+    pa = int.from_bytes(b''.join(c.to_bytes(width, 'little') for c in a), 'little')
+    pb = pa if a is b else int.from_bytes(b''.join(c.to_bytes(width, 'little') for c in b), 'little')
+    data = (pa * pb).to_bytes(width * count, 'little')
+    return _trim([int.from_bytes(data[i * width:(i + 1) * width], 'little') % p for i in range(count)])
+
+
+def _poly_divmod(a, b, p):
+    """
+    Деление многочленов с остатком столбиком.
+    """
+    a = list(a)
+    db = len(b) - 1
+    if len(a) - 1 < db:
+        return [], a
+    inv = mod_inverse(b[-1], p)
+    q = [0] * (len(a) - db)
+    for i in range(len(a) - 1 - db, -1, -1):
+        c = (a[i + db] * inv) % p
+        q[i] = c
+        if c:
+            for j in range(db + 1):
+                a[i + j] = (a[i + j] - c * b[j]) % p
+    return _trim(q), _trim(a[:db])
+
+
+def _poly_monic(a, p):
+    return _poly_scale(a, mod_inverse(a[-1], p), p)
+
+
+def _poly_gcd(a, b, p):
+    while b:
+        a, b = b, _poly_divmod(a, b, p)[1]
+    return _poly_monic(a, p) if a else a
+
+
+def _series_inverse(f, n, p):
+    """
+    Обращает степенной ряд f по модулю x^n итерациями Ньютона: g <- g * (2 - f * g).
+    """
+    g = [mod_inverse(f[0], p)]
+    precision = 1
+    while precision < n:
+        precision = min(2 * precision, n)
+        e = _poly_mul(f[:precision], g, p)[:precision]
+        e = [(-c) % p for c in e] or [0]
+        e[0] = (e[0] + 2) % p
+        g = _poly_mul(g, _trim(e), p)[:precision]
+    return g
+
+
+class _PolyRing:
+    """
+    Кольцо F_p[x] / (h) для многочлена h (делителя многочлена деления).
+    Приведение по модулю h выполняется методом Барретта через обращённый ряд h.
+    """
+    def __init__(self, h, curve):
+        self.p = p = curve.p
+        self.h = _poly_monic(h, p)
+        self.n = len(self.h) - 1
+        self.a = curve.a
+        self.hinv = _series_inverse(self.h[::-1], max(self.n - 1, 1), p)
+        self.f = self.reduce(_trim([curve.b, curve.a, 0, 1]))
+        self.x = self.reduce([0, 1])
+
+    def reduce(self, a):
+        n, p = self.n, self.p
+        m = len(a) - 1
+        if m < n:
+            return a
+        if m > 2 * n - 2:
+            return _poly_divmod(a, self.h, p)[1]
+        k = m - n + 1
+        q = _poly_mul(a[::-1][:k], self.hinv[:k], p)[:k]
+        q = (q + [0] * (k - len(q)))[::-1]
+        qh = _poly_mul(q, self.h, p)
+        return _trim([(a[i] - (qh[i] if i < len(qh) else 0)) % p for i in range(n)])
+
+    def mul(self, a, b):
+        return self.reduce(_poly_mul(a, b, self.p))
+
+    def pow(self, a, e):
+        result = [1]
+        while e:
+            if e & 1:
+                result = self.mul(result, a)
+            a = self.mul(a, a)
+            e >>= 1
+        return result
+
+    def inverse(self, a):
+        """
+        Обратный элемент по расширенному алгоритму Евклида.
+        Если a и h имеют общий делитель, возбуждает _Split с этим делителем.
+        """
+        p = self.p
+        r0, r1 = self.h, a
+        s0, s1 = [], [1]
+        while r1:
+            q, r = _poly_divmod(r0, r1, p)
+            r0, r1 = r1, r
+            s0, s1 = s1, _poly_sub(s0, _poly_mul(q, s1, p), p)
+        if len(r0) > 1:
+            raise _Split(_poly_monic(r0, p))
+        return self.reduce(_poly_scale(s0, mod_inverse(r0[0], p), p))
+
+    def split_or_none(self, a):
+        """
+        Если a имеет с h общий собственный делитель, возбуждает _Split.
+        """
+        g = _poly_gcd(self.h, a, self.p)
+        if 1 < len(g) <= self.n:
+            raise _Split(g)
+
+    # Точки кривой над кольцом хранятся парами (X, Y), означающими точку (X(x), Y(x) * y),
+    # где y² = f(x); бесконечно удалённая точка - None.
+
+    def double(self, P):
+        if P is None or not P[1]:
+            return None
+        X, Y = P
+        p = self.p
+        numerator = _poly_add(_poly_scale(self.mul(X, X), 3, p), [self.a] if self.a else [], p)
+        mu = self.mul(numerator, self.inverse(self.mul(_poly_scale(Y, 2, p), self.f)))
+        X3 = _poly_sub(self.mul(self.mul(mu, mu), self.f), _poly_scale(X, 2, p), p)
+        Y3 = _poly_sub(self.mul(mu, _poly_sub(X, X3, p)), Y, p)
+        return X3, Y3
+
+    def add(self, P, Q):
+        if P is None:
+            return Q
+        if Q is None:
+            return P
+        (X1, Y1), (X2, Y2) = P, Q
+        p = self.p
+        if X1 == X2:
+            if Y1 == Y2:
+                return self.double(P)
+            if not _poly_add(Y1, Y2, p):
+                return None
+            # Y1 = ±Y2 лишь на части корней h: модуль расщепляется
+            self.split_or_none(_poly_sub(Y1, Y2, p))
+            raise ArithmeticError("Несовместные ординаты точек с равными абсциссами.")
+        mu = self.mul(_poly_sub(Y2, Y1, p), self.inverse(_poly_sub(X2, X1, p)))
+        X3 = _poly_sub(_poly_sub(self.mul(self.mul(mu, mu), self.f), X1, p), X2, p)
+        Y3 = _poly_sub(self.mul(mu, _poly_sub(X1, X3, p)), Y1, p)
+        return X3, Y3
+
+    def neg(self, P):
+        if P is None:
+            return None
+        return P[0], _poly_scale(P[1], -1, self.p)
+
+    def multiply(self, P, k):
+        if k < 0:
+            return self.neg(self.multiply(P, -k))
+        result = None
+        for bit in bin(k)[2:]:
+            result = self.double(result)
+            if bit == '1':
+                result = self.add(result, P)
+        return result
+
+
+def division_polynomials(curve, n):
+    """
+    Возвращает многочлены деления g_0, ..., g_n кривой y² = x³ + ax + b без множителя y:
+    для нечётных k многочлен деления psi_k = g_k, для чётных psi_k = g_k * y.
+    Корни g_l при нечётном l - абсциссы точек порядка l.
+    """
+    p, a, b = curve.p, curve.a, curve.b
+    f = _trim([b, a, 0, 1])
+    f2 = _poly_mul(f, f, p)
+    inv2 = mod_inverse(2, p)
+    g = [[], [1], [2],
+         _trim([(-a * a) % p, (12 * b) % p, (6 * a) % p, 0, 3]),
+         _trim([(4 * (-8 * b * b - a ** 3)) % p, (-16 * a * b) % p, (-20 * a * a) % p, (80 * b) % p,
+                (20 * a) % p, 0, 4])]
+    for k in range(5, n + 1):
+        m = k // 2
+        if k % 2:
+            left = _poly_mul(g[m + 2], _poly_mul(g[m], _poly_mul(g[m], g[m], p), p), p)
+            right = _poly_mul(g[m - 1], _poly_mul(g[m + 1], _poly_mul(g[m + 1], g[m + 1], p), p), p)
+            if m % 2 == 0:
+                left = _poly_mul(f2, left, p)
+            else:
+                right = _poly_mul(f2, right, p)
+            g.append(_poly_sub(left, right, p))
+        else:
+            left = _poly_mul(g[m + 2], _poly_mul(g[m - 1], g[m - 1], p), p)
+            right = _poly_mul(g[m - 2], _poly_mul(g[m + 1], g[m + 1], p), p)
+            g.append(_poly_scale(_poly_mul(g[m], _poly_sub(left, right, p), p), inv2, p))
+    return g[:n + 1]
+
+
+def _trace_mod_2(curve):
+    """
+    След Фробениуса чётен тогда и только тогда, когда на кривой есть точка порядка 2,
+    то есть когда x³ + ax + b имеет корень в F_p: gcd(x^p - x, x³ + ax + b) ≠ 1.
+    """
+    p = curve.p
+    ring = _PolyRing(_trim([curve.b, curve.a, 0, 1]), curve)
+    xp = ring.pow([0, 1], p)
+    return 0 if len(_poly_gcd(ring.h, _poly_sub(xp, [0, 1], p), p)) > 1 else 1
+
+
+def _trace_mod_l(curve, l, h):
+    """
+    Вычисляет след Фробениуса t по модулю нечётного простого l из уравнения
+    pi²(P) - t * pi(P) + p * P = O на точках, абсциссы которых - корни h.
+    При встрече необратимого элемента продолжает по модулю найденного делителя h.
+    """
+    p = curve.p
+    while True:
+        try:
+            ring = _PolyRing(h, curve)
+            X1 = ring.pow(ring.x, p)
+            Y1 = ring.pow(ring.f, (p - 1) // 2)
+            pi1 = (X1, Y1)
+            pi2 = (ring.pow(X1, p), ring.mul(ring.pow(Y1, p), Y1))
+            pbar = p % l
+            if pbar > l // 2:
+                pbar -= l
+            S = ring.add(pi2, ring.multiply((ring.x, [1]), pbar))
+            if S is None:
+                return 0
+            T = pi1
+            for tau in range(1, l // 2 + 1):
+                if T[0] == S[0]:
+                    if T[1] == S[1]:
+                        return tau
+                    if not _poly_add(T[1], S[1], p):
+                        return l - tau
+                    ring.split_or_none(_poly_sub(T[1], S[1], p))
+                T = ring.add(T, pi1)
+            raise ArithmeticError(f"След Фробениуса по модулю {l} не найден.")
+        except _Split as split:
+            g = split.factor
+            cofactor = _poly_divmod(ring.h, g, p)[0]
+            h = g if len(g) <= len(cofactor) else cofactor
+
+
+def _small_primes():
+    n = 3
+    while True:
+        if is_prime(n):
+            yield n
+        n += 2
+
+
+def schoof_order(curve):
+    """
+    Подсчёт числа точек кривой над F_p (p > 3) алгоритмом Шуфа.
+
+    След Фробениуса t = p + 1 - #E вычисляется по модулю 2 и малых простых l,
+    пока их произведение не превысит 4√p, и восстанавливается по китайской
+    теореме об остатках с учётом границы Хассе |t| ≤ 2√p.
+    """
+    p = curve.p
+    modulus = 2
+    primes = []
+    for l in _small_primes():
+        if modulus * modulus > 16 * p:
+            break
+        if l != p:
+            primes.append(l)
+            modulus *= l
+    psi = division_polynomials(curve, primes[-1]) if primes else []
+    residues = [(_trace_mod_2(curve), 2)] + [(_trace_mod_l(curve, l, psi[l]), l) for l in primes]
+    t = 0
+    for r, l in residues:
+        M = modulus // l
+        t = (t + r * M * mod_inverse(M, l)) % modulus
+    if t > modulus // 2:
+        t -= modulus
+    return p + 1 - t
+
+
+def random_point(curve):
+    """
+    Возвращает случайную точку кривой, отличную от бесконечно удалённой.
+    """
+    p = curve.p
+    while True:
+        x = random.randrange(p)
+        rhs = (pow(x, 3, p) + curve.a * x + curve.b) % p
+        if rhs == 0:
+            return ECPoint(curve, x, 0)
+        if legendre_symbol(rhs, p) == 1:
+            y = tonelli_shanks(rhs, p)
+            return ECPoint(curve, x, y if random.getrandbits(1) else -y)
+
+
+def _multiples_in_interval(P, lo, hi):
+    """
+    Находит все M из [lo, hi], для которых M * P = O, методом baby-step giant-step.
+    Возвращает None, если таких M больше MESTRE_MAX_CANDIDATES.
+    """
+    curve = P.curve
+    width = hi - lo + 1
+    m = math.isqrt(width) + 1
+    baby_steps = {}
+    for j, point in enumerate(point_progression(ECPointInf(curve), P, m)):
+        key = None if isinstance(point, ECPointInf) else (point.x, point.y)
+        baby_steps.setdefault(key, []).append(j)
+    found = []
+    start = lo * P
+    for i, gamma in enumerate(point_progression(start, m * P, width // m + 1)):
+        # (lo + i*m) * P + j * P = O  <=>  j * P = -gamma
+        target = point_neg(gamma)
+        key = None if isinstance(target, ECPointInf) else (target.x, target.y)
+        for j in baby_steps.get(key, ()):
+            M = lo + i * m + j
+            if M <= hi:
+                found.append(M)
+                if len(found) > MESTRE_MAX_CANDIDATES:
+                    return None
+    return found
+
+
+def mestre_order(curve, max_trials=10):
+    """
+    Подсчёт числа точек кривой методом Местре (baby-step giant-step в интервале Хассе).
+
+    Для случайных точек кривой E и её квадратичного кручения E' ищутся кратные их
+    порядков в интервале [p + 1 - 2√p, p + 1 + 2√p]; учитывая #E + #E' = 2p + 2,
+    кандидаты пересекаются, пока не останется единственный. По теореме Местре
+    при p > 229 точка с единственным кратным находится на E или на E'.
+    Если за max_trials попыток порядок не определён однозначно, возвращает None.
+    """
+    p = curve.p
+    lo = p + 1 - math.isqrt(4 * p)
+    hi = p + 1 + math.isqrt(4 * p)
+    d = 2
+    while legendre_symbol(d, p) != -1:
+        d += 1
+    twist = EllipticCurve(p, curve.a * d * d, curve.b * d ** 3)
+    candidates = None
+    for _ in range(max_trials):
+        for E, on_twist in ((curve, False), (twist, True)):
+            multiples = _multiples_in_interval(random_point(E), lo, hi)
+            if multiples is None:
+                continue
+            orders = {2 * p + 2 - M if on_twist else M for M in multiples}
+            candidates = orders if candidates is None else candidates & orders
+            if len(candidates) == 1:
+                return candidates.pop()
+    return None
@@ -0,0 +1,46 @@
+from EllipticCurve import EllipticCurve
+from ECPointInf import ECPointInf
+from PointCounting import schoof_order, mestre_order, division_polynomials, random_point
+from Tools import find_points, curve_order, naive_order
+import random
+import pytest
+
+
+@pytest.mark.parametrize(
+    'p, a, b', [
+        (5, 1, 1), (13, 4, 8), (17, 2, 2), (97, 2, 3), (101, 5, 13), (263, 0, 7), (1009, 1, 0), (4099, 11, 23)
+    ]
+)
+def test_schoof_matches_enumeration(p, a, b):
+    curve = EllipticCurve(p, a, b)
+    assert schoof_order(curve) == naive_order(curve)
+
+
+@pytest.mark.parametrize('p, a, b', [(263, 0, 7), (1009, 2, 3), (4099, 11, 23)])
+def test_mestre_matches_enumeration(p, a, b):
+    random.seed(p)
+    curve = EllipticCurve(p, a, b)
+    assert mestre_order(curve) == naive_order(curve)
+
+
+def test_division_polynomial_roots():
+    # Абсциссы точек порядка l являются корнями l-го многочлена деления.
+    curve = EllipticCurve(97, 2, 3)
+    psi = division_polynomials(curve, 7)
+    for point in find_points(curve)[1:]:
+        for l in (3, 5, 7):
+            value = sum(c * pow(point.x, i, curve.p) for i, c in enumerate(psi[l])) % curve.p
+            assert (value == 0) == isinstance(l * point, ECPointInf)
+
+
+def test_curve_order_strategies():
+    random.seed(1)
+    # 40-битное простое: порядок по Местре совпадает с порядком по Шуфу.
+    p = 1099511627791
+    curve = EllipticCurve(p, 3, 7)
+    order = curve_order(curve)
+    assert order == schoof_order(curve)
+    assert abs(p + 1 - order) <= 2 * p ** 0.5
+    # Порядок кривой уничтожает любую её точку.
+    P = random_point(curve)
+    assert isinstance(order * P, ECPointInf)
@@ -0,0 +1,125 @@
+import mmap
+import struct
+
+from ECPoint import coordinate_size
+from EllipticCurve import EllipticCurve
+from PointBatch import PointBatch
+
+# Сигнатура и версия формата файла точек.
+POINT_FILE_MAGIC = b'ECPTS\x00'
+POINT_FILE_VERSION = 1
+# Заголовок: сигнатура, версия, длина координаты в байтах, число записей.
+_HEADER = struct.Struct('>6sHIQ')
+
+
+def _header(curve, count):
+    """
+    Заголовок файла: фиксированная часть и параметры кривой p, a, b
+    (каждый - big-endian длины coordinate_size(curve)).
+    """
+    size = coordinate_size(curve)
+    return (_HEADER.pack(POINT_FILE_MAGIC, POINT_FILE_VERSION, size, count)
+            + b''.join(value.to_bytes(size, 'big') for value in (curve.p, curve.a, curve.b)))
+
+
+def save_points(path, curve, points):
+    """
+    Сохраняет точки (список точек или PointBatch) в файл path.
+
+    После заголовка идут записи фиксированной длины 1 + 2 * size в формате
+    PointBatch: запись аффинной точки совпадает с её кодировкой SEC1 без сжатия
+    (0x04 || X || Y), бесконечно удалённая точка - запись из нулевых байтов.
+    """
+    batch = points if isinstance(points, PointBatch) else PointBatch.from_points(curve, points)
+    if batch.curve != curve:
+        raise ValueError("Точки принадлежат другой кривой.")
+    with open(path, 'wb') as file:
+        file.write(_header(curve, len(batch)))
+        file.write(batch.buffer)
+    return len(batch)
+
+
+class PointFile:
+    """
+    Файл точек, отображённый в память (mmap).
+
+    Записи не копируются и не разбираются при открытии: batch - это PointBatch
+    поверх отображения, так что точки читаются по мере обращения к ним, а срезы
+    набора тоже не копируют данные. При validate=True все записи проверяются
+    на принадлежность кривой. Файл закрывается методом close или блоком with;
+    наборы, полученные из файла, после закрытия использовать нельзя.
+    """
+    def __init__(self, path, validate=False):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Файл точек пуст.")
+        try:
+            self._open(validate)
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self, validate):
+        if len(self._map) < _HEADER.size:
+            raise ValueError("Файл точек повреждён: неполный заголовок.")
+        magic, version, size, count = _HEADER.unpack_from(self._map)
+        if magic != POINT_FILE_MAGIC:
+            raise ValueError("Файл не является файлом точек.")
+        if version != POINT_FILE_VERSION:
+            raise ValueError(f"Неподдерживаемая версия файла точек: {version}.")
+        offset = _HEADER.size
+        p, a, b = (int.from_bytes(self._map[offset + i * size:offset + (i + 1) * size], 'big')
+                   for i in range(3))
+        self.curve = EllipticCurve(p, a, b)
+        if coordinate_size(self.curve) != size:
+            raise ValueError("Файл точек повреждён: длина координаты не соответствует p.")
+        offset += 3 * size
+        if len(self._map) != offset + count * (1 + 2 * size):
+            raise ValueError("Файл точек повреждён: размер не соответствует числу записей.")
+        self._view = memoryview(self._map)[offset:]
+        self.batch = PointBatch(self.curve, self._view, 0, count)
+        if validate and not self.batch.all_on_curve():
+            raise ValueError("Файл точек содержит точки вне кривой.")
+
+    def __len__(self):
+        return len(self.batch)
+
+    def __getitem__(self, index):
+        return self.batch[index]
+
+    def __iter__(self):
+        return iter(self.batch)
+
+    def close(self):
+        # Отображение нельзя закрыть, пока на него ссылаются memoryview.
+        batch = getattr(self, 'batch', None)
+        if batch is not None:
+            batch._view.release()
+            self.batch = None
+        view = getattr(self, '_view', None)
+        if view is not None:
+            view.release()
+            self._view = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # отображение ещё используют срезы набора; оно закроется вместе с ними
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def load_points(path, validate=True):
+    """
+    Читает файл точек целиком. Возвращает кривую и список точек.
+    """
+    with PointFile(path, validate) as points:
+        return points.curve, points.batch.to_points()
@@ -0,0 +1,103 @@
+from EllipticCurve import EllipticCurve
+from ECPoint import ECPoint, point_from_bytes
+from ECPointInf import ECPointInf
+from PointBatch import PointBatch
+from PointCounting import random_point
+from PointFile import PointFile, load_points, save_points
+from Tools import find_points
+import random
+import pytest
+
+CURVE = EllipticCurve(97, 2, 3)
+# Кривая P-256.
+P256 = EllipticCurve(0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff, -3,
+                     0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b)
+P256_G = ECPoint(P256, 0x6b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296,
+                 0x4fe342e2fe1a7f9b8ee7eb4a7c0f9e162bce33576b315ececbb6406837bf51f5)
+
+
+def test_sec1_round_trip():
+    for P in find_points(CURVE):
+        for compressed in (False, True):
+            assert point_from_bytes(CURVE, P.to_bytes(compressed)) == P
+            assert ECPoint.from_bytes(CURVE, P.to_bytes(compressed)) == P
+    assert ECPointInf(CURVE).to_bytes() == b'\x00'
+    assert ECPointInf(CURVE).to_bytes(compressed=True) == b'\x00'
+
+
+def test_sec1_p256_generator():
+    compressed = P256_G.to_bytes(compressed=True)
+    assert compressed.hex() == '036b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296'
+    assert len(P256_G.to_bytes()) == 65 and P256_G.to_bytes()[0] == 4
+    assert point_from_bytes(P256, compressed) == P256_G
+    random.seed(3)
+    P = random.randrange(1, 1 << 200) * P256_G
+    assert point_from_bytes(P256, P.to_bytes(compressed=True)) == P
+
+
+def test_sec1_invalid_encodings():
+    P = random_point(CURVE)
+    with pytest.raises(ValueError):
+        point_from_bytes(CURVE, b'')
+    with pytest.raises(ValueError):
+        point_from_bytes(CURVE, b'\x05' + P.to_bytes()[1:])
+    with pytest.raises(ValueError):
+        point_from_bytes(CURVE, P.to_bytes()[:-1])
+    with pytest.raises(ValueError):
+        point_from_bytes(CURVE, bytes([4, P.x, (P.y + 1) % CURVE.p]))  # точка вне кривой
+    xs = {Q.x for Q in find_points(CURVE) if not isinstance(Q, ECPointInf)}
+    x = next(x for x in range(CURVE.p) if x not in xs)
+    with pytest.raises(ValueError):
+        point_from_bytes(CURVE, bytes([2, x]))  # абсцисса точки кручения
+
+
+def test_point_file_round_trip(tmp_path):
+    path = tmp_path / 'points.bin'
+    points = find_points(CURVE)
+    assert save_points(path, CURVE, points) == len(points)
+    with PointFile(path, validate=True) as stored:
+        assert stored.curve == CURVE
+        assert len(stored) == len(points)
+        assert isinstance(stored.batch, PointBatch)
+        assert stored.batch.to_points() == points
+        assert stored[5] == points[5]
+        window = stored.batch[10:20]
+        assert window.buffer.obj is stored.batch.buffer.obj  # срез без копирования
+        assert window.to_points() == points[10:20]
+        # Запись аффинной точки совпадает с её кодировкой SEC1.
+        assert bytes(stored.batch[1:2].buffer) == points[1].to_bytes()
+        del window
+    assert load_points(path) == (CURVE, points)
+
+
+def test_point_file_batch_and_large_curve(tmp_path):
+    path = tmp_path / 'p256.bin'
+    random.seed(4)
+    points = [random.randrange(1, 1 << 64) * P256_G for _ in range(20)] + [ECPointInf(P256)]
+    save_points(path, P256, PointBatch.from_points(P256, points))
+    curve, loaded = load_points(path)
+    assert curve == P256 and loaded == points
+
+
+def test_point_file_rejects_corruption(tmp_path):
+    path = tmp_path / 'points.bin'
+    save_points(path, CURVE, find_points(CURVE))
+    data = path.read_bytes()
+    path.write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        PointFile(path)
+    path.write_bytes(b'XXXXXX' + data[6:])
+    with pytest.raises(ValueError):
+        PointFile(path)
+    corrupted = bytearray(data)
+    corrupted[-1] ^= 1
+    path.write_bytes(bytes(corrupted))
+    with pytest.raises(ValueError):
+        PointFile(path, validate=True)
+    with PointFile(path) as stored:  # без проверки файл открывается
+        assert len(stored) == len(find_points(CURVE))
+    corrupted = bytearray(data)
+    corrupted[-3] = 0x05  # байт-признак последней записи, координаты не тронуты
+    path.write_bytes(bytes(corrupted))
+    with pytest.raises(ValueError):
+        PointFile(path, validate=True)
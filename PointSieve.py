@@ -0,0 +1,134 @@
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для векторизованного перечисления точек
+    np = None
+
+from ModularArithmetic import legendre_symbol
+
+# Наибольший модуль, при котором произведения вычетов помещаются в int64.
+SIEVE_MAX_P = 2**31
+# До этого модуля квадратичные вычеты и корни берутся из таблицы квадратов,
+# при больших p - по критерию Эйлера и векторизованному алгоритму Тонелли-Шэнкса.
+SQUARES_TABLE_MAX_P = 2**22
+# Число абсцисс, обрабатываемых за один блок.
+SIEVE_BLOCK_SIZE = 1 << 16
+
+
+def _check_field(p):
+    if np is None:
+        raise ImportError("Для векторизованного перечисления точек требуется numpy.")
+    if p >= SIEVE_MAX_P:
+        raise ValueError(f"Векторизованное перечисление точек поддерживает только p < {SIEVE_MAX_P}.")
+
+
+def _pow_mod(base, e, p):
+    """
+    Поэлементно возводит массив base в степень e по модулю p.
+    """
+    result = np.ones_like(base)
+    base = base.copy()
+    while e:
+        if e & 1:
+            result = result * base % p
+        base = base * base % p
+        e >>= 1
+    return result
+
+
+def _sqrt_mod(values, p):
+    """
+    Векторизованный алгоритм Тонелли-Шэнкса: поэлементно извлекает квадратный
+    корень по модулю простого p из массива квадратичных вычетов.
+    """
+    if values.size == 0 or p % 4 == 3:
+        return _pow_mod(values, (p + 1) // 4, p)
+    Q, S = p - 1, 0
+    while Q % 2 == 0:
+        Q //= 2
+        S += 1
+    z = 2
+    while legendre_symbol(z, p) != -1:
+        z += 1
+    m = np.full(values.shape, S, dtype=np.int64)
+    c = np.full(values.shape, pow(z, Q, p), dtype=np.int64)
+    t = _pow_mod(values, Q, p)
+    root = _pow_mod(values, (Q + 1) // 2, p)
+    t[values == 0] = 1
+    active = t != 1
+    while active.any():
+        # Наименьшее i, при котором t^(2^i) = 1
+        i = np.zeros(values.shape, dtype=np.int64)
+        power = t.copy()
+        for k in range(1, S):
+            power = power * power % p
+            i[(power == 1) & (i == 0) & active] = k
+        # b = c^(2^(m - i - 1))
+        b = c.copy()
+        steps = np.where(active, m - i - 1, 0)
+        for r in range(int(steps.max())):
+            mask = steps > r
+            b[mask] = b[mask] * b[mask] % p
+        root = np.where(active, root * b % p, root)
+        c = np.where(active, b * b % p, c)
+        t = np.where(active, t * c % p, t)
+        m = np.where(active, i, m)
+        active = t != 1
+    return root
+
+
+def _squares_table(p):
+    """
+    Таблица корней: root[v] - квадратный корень из v, либо -1, если v - невычет.
+    """
+    root = np.full(p, -1, dtype=np.int64)
+    ys = np.arange(p // 2 + 1, dtype=np.int64)
+    root[ys * ys % p] = ys
+    return root
+
+
+def iter_point_blocks(curve, block_size=SIEVE_BLOCK_SIZE, x_start=0, x_stop=None):
+    """
+    Векторизованно перечисляет аффинные точки кривой блоками абсцисс.
+
+    Для каждого блока x вычисляется правая часть x³ + ax + b, квадратичные вычеты
+    отбираются по таблице квадратов (малые p) или по критерию Эйлера, корни
+    извлекаются векторизованно. Выдаёт пары массивов int64 (xs, ys) - координаты
+    точек блока в порядке возрастания x; бесконечно удалённая точка не выдаётся.
+    Объём памяти ограничен размером блока (и таблицей квадратов для малых p).
+    """
+    p = curve.p
+    _check_field(p)
+    if x_stop is None:
+        x_stop = p
+    table = _squares_table(p) if p <= SQUARES_TABLE_MAX_P else None
+    for start in range(x_start, x_stop, block_size):
+        x = np.arange(start, min(start + block_size, x_stop), dtype=np.int64)
+        rhs = (x * x % p * x % p + curve.a * x % p + curve.b) % p
+        if table is not None:
+            roots = table[rhs]
+            residue = roots > 0
+            roots = roots[residue]
+        else:
+            residue = _pow_mod(rhs, (p - 1) // 2, p) == 1
+            roots = _sqrt_mod(rhs[residue], p)
+        zero = rhs == 0
+        xs = np.concatenate([np.repeat(x[residue], 2), x[zero]])
+        ys = np.concatenate([np.stack([roots, p - roots], axis=1).ravel(),
+                             np.zeros(int(zero.sum()), dtype=np.int64)])
+        order = np.argsort(xs, kind='stable')
+        yield xs[order], ys[order]
+
+
+def find_points_arrays(curve, block_size=SIEVE_BLOCK_SIZE):
+    """
+    Все аффинные точки кривой в виде пары массивов (xs, ys).
+    """
+    blocks = list(iter_point_blocks(curve, block_size))
+    return np.concatenate([xs for xs, _ in blocks]), np.concatenate([ys for _, ys in blocks])
+
+
+def sieve_order(curve, block_size=SIEVE_BLOCK_SIZE):
+    """
+    Порядок группы точек кривой, подсчитанный векторизованным перебором.
+    """
+    return 1 + sum(len(xs) for xs, _ in iter_point_blocks(curve, block_size))
@@ -0,0 +1,35 @@
+from EllipticCurve import EllipticCurve
+from Tools import find_points, iter_points, naive_order
+import pytest
+
+np = pytest.importorskip("numpy")
+from PointSieve import find_points_arrays, iter_point_blocks, sieve_order
+
+
+def as_pairs(xs, ys):
+    return sorted(zip(xs.tolist(), ys.tolist()))
+
+
+@pytest.mark.parametrize('p, a, b', [(7, -2, 1), (17, 2, 2), (97, 2, 3), (1009, 1, 0), (65537, 3, 5)])
+def test_sieve_matches_find_points(p, a, b):
+    curve = EllipticCurve(p, a, b)
+    xs, ys = find_points_arrays(curve, block_size=100)
+    expected = sorted((P.x, P.y) for P in find_points(curve)[1:])
+    assert as_pairs(xs, ys) == expected
+    assert sieve_order(curve) == naive_order(curve)
+
+
+@pytest.mark.parametrize('p', [1000000007, 998244353])
+def test_sieve_tonelli_shanks_path(p):
+    # Для p > SQUARES_TABLE_MAX_P корни извлекаются векторизованным алгоритмом Тонелли-Шэнкса
+    # (998244353 = 119 * 2^23 + 1 требует многих итераций).
+    curve = EllipticCurve(p, 2, 3)
+    blocks = list(iter_point_blocks(curve, block_size=500, x_start=10**6, x_stop=10**6 + 2000))
+    got = sorted(pair for xs, ys in blocks for pair in zip(xs.tolist(), ys.tolist()))
+    expected = sorted((P.x, P.y) for P in iter_points(curve, 10**6, 10**6 + 2000))
+    assert got == expected
+
+
+def test_sieve_rejects_large_p():
+    with pytest.raises(ValueError):
+        next(iter_point_blocks(EllipticCurve(2**61 - 1, 2, 3)))
@@ -0,0 +1,120 @@
+import functools
+import math
+
+# Граница таблицы малых простых для предварительного отсева.
+PRESIEVE_BOUND = 1000
+# Основания Миллера-Рабина, при которых тест детерминирован для n < 3.3 * 10^24.
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+DETERMINISTIC_MAX = 3317044064679887385961981
+
+
+def primes_up_to(bound):
+    """
+    Список простых чисел, не превосходящих bound (решето Эратосфена).
+    """
+    sieve = bytearray([1]) * (bound + 1)
+    sieve[0:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(bound) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytearray(len(range(i * i, bound + 1, i)))
+    return [i for i in range(bound + 1) if sieve[i]]
+
+
+SMALL_PRIMES = primes_up_to(PRESIEVE_BOUND)
+
+
+def miller_rabin(n, base):
+    """
+    Сильный тест Миллера-Рабина нечётного n > 2 по основанию base.
+    """
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def _jacobi_symbol(a, n):
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def strong_lucas(n):
+    """
+    Сильный тест Люка нечётного n > 2, не являющегося квадратом, с параметрами
+    Селфриджа: D - первое из 5, -7, 9, -11, ... с символом Якоби (D/n) = -1, P = 1, Q = (1 - D) / 4.
+    """
+    D = 5
+    while True:
+        j = _jacobi_symbol(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    Q = (1 - D) // 4
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # Вычисление U_d, V_d, Q^d двоичным методом; деление на 2 - умножением на (n + 1) / 2.
+    half = (n + 1) // 2
+    U, V, Qk = 1, 1, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = (U + V) * half % n, (D * U + V) * half % n
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+@functools.lru_cache(maxsize=4096)
+def is_prime(n):
+    """
+    Проверка простоты n.
+
+    Сначала n делится на простые до PRESIEVE_BOUND. Далее при n < 3.3 * 10^24
+    (в том числе для всех 64-битных n) применяется детерминированный тест
+    Миллера-Рабина по первым 13 простым основаниям, а для больших n - тест BPSW
+    (Миллер-Рабин по основанию 2 и сильный тест Люка), контрпримеры к которому
+    неизвестны. Результаты последних проверок кэшируются.
+    """
+    if n < 2:
+        return False
+    for q in SMALL_PRIMES:
+        if n % q == 0:
+            return n == q
+    if n < PRESIEVE_BOUND ** 2:
+        return True
+    if n < DETERMINISTIC_MAX:
+        return all(miller_rabin(n, base) for base in MILLER_RABIN_BASES)
+    if not miller_rabin(n, 2):
+        return False
+    if math.isqrt(n) ** 2 == n:
+        return False
+    return strong_lucas(n)
@@ -0,0 +1,31 @@
+from Primality import is_prime, miller_rabin, strong_lucas, primes_up_to
+from Tools import is_prime as tools_is_prime
+import math
+
+
+def test_is_prime_small():
+    primes = set(primes_up_to(100000))
+    assert all(is_prime(n) == (n in primes) for n in range(-3, 100000))
+    assert not is_prime(0) and not is_prime(1)
+    assert tools_is_prime is is_prime
+
+
+def test_is_prime_large():
+    assert is_prime(2**61 - 1)
+    assert is_prime(2**255 - 19)
+    assert is_prime(2**256 - 2**224 + 2**192 + 2**96 - 1)  # модуль P-256
+    assert is_prime(2**521 - 1)
+    assert not is_prime((2**127 - 1) * (2**61 - 1))
+    assert not is_prime(2**64 + 1)
+    # Сильные псевдопростые по многим первым основаниям.
+    assert not is_prime(3825123056546413051)
+    assert not is_prime(3317044064679887385961981)
+    assert not is_prime((2**89 - 1) ** 2)
+
+
+def test_strong_lucas_matches_sieve():
+    primes = set(primes_up_to(20000))
+    for n in range(3, 20000, 2):
+        if math.isqrt(n) ** 2 == n:
+            continue
+        assert (miller_rabin(n, 2) and strong_lucas(n)) == (n in primes)
@@ -0,0 +1,293 @@
+import functools
+
+from ModularArithmetic import legendre_symbol, tonelli_shanks
+
+# Число полей, хранимых кэшем prime_field.
+FIELD_CACHE_SIZE = 256
+
+# Модуль кривой P-256 (FIPS 186): 2^256 - 2^224 + 2^192 + 2^96 - 1.
+P256 = 2**256 - 2**224 + 2**192 + 2**96 - 1
+
+
+def extended_gcd(a, b):
+    """
+    Вычисляет расширенный алгоритм Евклида для нахождения наибольшего общего делителя
+    двух чисел a и b, а также коэффициентов x и y, таких что a * x + b * y = gcd(a, b).
+    Алгоритм итеративный, поэтому глубина рекурсии не ограничивает длину чисел.
+
+    Аргументы:
+    a -- Первое целое число
+    b -- Второе целое число
+
+    Возвращает:
+    Кортеж (g, x, y), где:
+    g -- Наибольший общий делитель a и b,
+    x -- Коэффициент для a в линейном представлении НОД,
+    y -- Коэффициент для b в линейном представлении НОД.
+    """
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+def mod_inverse(a, p):
+    """
+    Обратный к a элемент по модулю p (встроенный pow(a, -1, p)).
+    Если обратного нет, возбуждается ValueError.
+    """
+    try:
+        return pow(a, -1, p)
+    except ValueError:
+        raise ValueError("Обратный элемент не существует.") from None
+
+
+class GenericReduction:
+    """
+    Приведение встроенным остатком от деления: для целых CPython это самый быстрый
+    способ при любом p, поэтому он используется по умолчанию.
+    """
+    name = 'generic'
+
+    def __init__(self, p):
+        self.p = p
+        self.reduce = p.__rmod__
+
+
+class PseudoMersenneReduction:
+    """
+    Приведение по модулю p = 2^k - c с малым c: так как 2^k ≡ c (mod p), старшая
+    часть числа сворачивается в младшую умножением на c, без деления.
+    """
+    name = 'pseudo_mersenne'
+
+    def __init__(self, p):
+        k = p.bit_length()
+        c = (1 << k) - p
+        if c.bit_length() > k // 2:
+            raise ValueError("Модуль не является псевдомерсенновым простым.")
+        self.p = p
+        self.k = k
+        self.c = c
+        self.mask = (1 << k) - 1
+
+    def reduce(self, value):
+        if value < 0:
+            return value % self.p
+        k, c, mask = self.k, self.c, self.mask
+        while value >> k:
+            value = (value & mask) + c * (value >> k)
+        return value - self.p if value >= self.p else value
+
+    def __rmod__(self, value):
+        return self.reduce(value)
+
+
+class NistP256Reduction:
+    """
+    Быстрое приведение Солинаса по модулю P-256 (FIPS 186, D.2.3): произведение
+    0 <= c < p² разбивается на 32-битные слова c0..c15, и остаток собирается
+    из восьми сумм слов без деления. Прочие значения приводятся обычным остатком.
+    """
+    name = 'nist_p256'
+
+    def __init__(self, p):
+        if p != P256:
+            raise ValueError("Приведение Солинаса реализовано только для модуля P-256.")
+        self.p = p
+        self.square = p * p
+
+    @staticmethod
+    def _number(*words):
+        # Слова перечисляются от старшего к младшему, как в стандарте.
+        value = 0
+        for word in words:
+            value = (value << 32) | word
+        return value
+
+    def reduce(self, value):
+        p = self.p
+        if not 0 <= value < self.square:
+            return value % p
+        c = [(value >> (32 * i)) & 0xffffffff for i in range(16)]
+        n = self._number
+        s1 = value & ((1 << 256) - 1)
+        s2 = n(c[15], c[14], c[13], c[12], c[11], 0, 0, 0)
+        s3 = n(0, c[15], c[14], c[13], c[12], 0, 0, 0)
+        s4 = n(c[15], c[14], 0, 0, 0, c[10], c[9], c[8])
+        s5 = n(c[8], c[13], c[15], c[14], c[13], c[11], c[10], c[9])
+        s6 = n(c[10], c[8], 0, 0, 0, c[13], c[12], c[11])
+        s7 = n(c[11], c[9], 0, 0, c[15], c[14], c[13], c[12])
+        s8 = n(c[12], 0, c[10], c[9], c[8], c[15], c[14], c[13])
+        s9 = n(c[13], 0, c[11], c[10], c[9], 0, c[15], c[14])
+        result = s1 + 2 * (s2 + s3) + s4 + s5 - s6 - s7 - s8 - s9
+        # Сумма лежит в (-4p, 5p), поэтому хватает нескольких поправок на p.
+        while result < 0:
+            result += p
+        while result >= p:
+            result -= p
+        return result
+
+    def __rmod__(self, value):
+        return self.reduce(value)
+
+
+class MontgomeryReduction:
+    """
+    Приведение Монтгомери с R = 2^(2k), k - длина p: REDC(T) = T * R^(-1) mod p
+    обходится сдвигами и масками для 0 <= T < pR, т. е. для произведений до трёх
+    элементов поля. Остаток в обычном представлении - это REDC(REDC(T) * R² mod p).
+
+    Для вычислений, остающихся в форме Монтгомери, служат to_montgomery,
+    from_montgomery и multiply.
+    """
+    name = 'montgomery'
+
+    def __init__(self, p):
+        if p % 2 == 0:
+            raise ValueError("Приведение Монтгомери требует нечётного модуля.")
+        self.p = p
+        self.shift = 2 * p.bit_length()
+        self.mask = (1 << self.shift) - 1
+        self.bound = p << self.shift
+        self.p_prime = -pow(p, -1, 1 << self.shift) & self.mask
+        self.r2 = pow(1 << self.shift, 2, p)
+
+    def redc(self, value):
+        m = ((value & self.mask) * self.p_prime) & self.mask
+        value = (value + m * self.p) >> self.shift
+        return value - self.p if value >= self.p else value
+
+    def reduce(self, value):
+        if not 0 <= value < self.bound:
+            return value % self.p
+        return self.redc(self.redc(value) * self.r2)
+
+    def __rmod__(self, value):
+        return self.reduce(value)
+
+    def to_montgomery(self, value):
+        return self.redc(value % self.p * self.r2)
+
+    def from_montgomery(self, value):
+        return self.redc(value)
+
+    def multiply(self, left, right):
+        return self.redc(left * right)
+
+
+REDUCTIONS = {
+    strategy.name: strategy
+    for strategy in (GenericReduction, PseudoMersenneReduction, NistP256Reduction, MontgomeryReduction)
+}
+
+
+def detect_reduction(p):
+    """
+    Подбирает специальное приведение для модуля p: Солинаса для P-256,
+    псевдомерсенново для p = 2^k - c с малым c, иначе обычное.
+    """
+    if p == P256:
+        return NistP256Reduction.name
+    if ((1 << p.bit_length()) - p).bit_length() <= p.bit_length() // 2:
+        return PseudoMersenneReduction.name
+    return GenericReduction.name
+
+
+class PrimeField:
+    """
+    Простое поле GF(p) с выбираемой стратегией приведения (см. REDUCTIONS).
+
+    Все методы принимают произвольные целые и возвращают приведённые элементы;
+    reduce - функция приведения выбранной стратегии. Формулы сложения точек
+    пишут value % field.modulus: при обычном приведении modulus - само число p,
+    и формулы не платят за вызов функции, а при специальном - объект стратегии,
+    выполняющий приведение в __rmod__.
+
+    reduction='auto' выбирает стратегию по виду p (detect_reduction); по умолчанию
+    используется обычный остаток, так как для целых CPython он быстрее приведений,
+    написанных на самом Python.
+    """
+    __slots__ = ('p', 'reduction', 'reducer', 'reduce', 'modulus', 'size', '_sqrt_exponent')
+
+    def __init__(self, p, reduction='generic'):
+        if reduction == 'auto':
+            reduction = detect_reduction(p)
+        strategy = REDUCTIONS.get(reduction)
+        if strategy is None:
+            raise ValueError(f"Неизвестная стратегия приведения: {reduction!r}.")
+        self.p = p
+        self.reduction = reduction
+        self.reducer = strategy(p)
+        self.reduce = self.reducer.reduce
+        self.modulus = p if strategy is GenericReduction else self.reducer
+        self.size = (p.bit_length() + 7) // 8
+        # При p ≡ 3 (mod 4) корень извлекается одним возведением в степень.
+        self._sqrt_exponent = (p + 1) // 4 if p % 4 == 3 else None
+
+    def __reduce__(self):
+        # При передаче в другой процесс поле берётся из кэша этого процесса.
+        return prime_field, (self.p, self.reduction)
+
+    def add(self, a, b):
+        return self.reduce(a + b)
+
+    def sub(self, a, b):
+        return self.reduce(a - b)
+
+    def neg(self, a):
+        return self.reduce(-a)
+
+    def mul(self, a, b):
+        return self.reduce(a * b)
+
+    def sqr(self, a):
+        return self.reduce(a * a)
+
+    def inv(self, a):
+        return mod_inverse(a, self.p)
+
+    def div(self, a, b):
+        return self.reduce(a * mod_inverse(b, self.p))
+
+    def pow(self, a, e):
+        return pow(a, e, self.p)
+
+    def is_square(self, a):
+        return legendre_symbol(a % self.p, self.p) != -1
+
+    def sqrt(self, a):
+        """
+        Квадратный корень из a либо None, если a - невычет.
+        """
+        a %= self.p
+        if a == 0:
+            return 0
+        if self._sqrt_exponent is not None:
+            root = pow(a, self._sqrt_exponent, self.p)
+            return root if root * root % self.p == a else None
+        return tonelli_shanks(a, self.p)
+
+    def __contains__(self, a):
+        return isinstance(a, int) and 0 <= a < self.p
+
+    def __repr__(self):
+        return f"GF({self.p})"
+
+
+def prime_field(p, reduction='generic'):
+    """
+    Поле GF(p) с заданной стратегией приведения; поля кэшируются, так что кривые
+    над одним p разделяют объект поля и его константы.
+    """
+    if reduction == 'auto':
+        reduction = detect_reduction(p)
+    return _cached_field(p, reduction)
+
+
+@functools.lru_cache(maxsize=FIELD_CACHE_SIZE)
+def _cached_field(p, reduction):
+    return PrimeField(p, reduction)
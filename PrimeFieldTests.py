@@ -0,0 +1,98 @@
+from EllipticCurve import EllipticCurve
+from ECPoint import ECPoint
+from PrimeField import (P256, PrimeField, REDUCTIONS, detect_reduction, extended_gcd,
+                        mod_inverse, prime_field)
+import pickle
+import random
+import pytest
+
+P256_A = -3
+P256_B = 0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b
+P256_G = (0x6b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296,
+          0x4fe342e2fe1a7f9b8ee7eb4a7c0f9e162bce33576b315ececbb6406837bf51f5)
+# 2^255 - 19 и модуль secp256k1 - псевдомерсенновы простые.
+P25519 = 2**255 - 19
+SECP256K1 = 2**256 - 2**32 - 977
+
+
+@pytest.mark.parametrize('p, reduction', [
+    (P256, 'generic'), (P256, 'nist_p256'), (P256, 'montgomery'),
+    (P25519, 'pseudo_mersenne'), (SECP256K1, 'pseudo_mersenne'), (1009, 'montgomery'),
+])
+def test_reductions_agree_with_remainder(p, reduction):
+    random.seed(p % 1000)
+    field = PrimeField(p, reduction)
+    values = [0, 1, p - 1, p, p * p - 1, -1, -p * p, 5 * p * p * p]
+    values += [random.randrange(p * p) for _ in range(300)]
+    values += [random.randrange(-p ** 3, p ** 3) for _ in range(100)]
+    for value in values:
+        assert field.reduce(value) == value % p
+        assert value % field.modulus == value % p
+
+
+def test_detect_reduction():
+    assert detect_reduction(P256) == 'nist_p256'
+    assert detect_reduction(P25519) == 'pseudo_mersenne'
+    assert detect_reduction(SECP256K1) == 'pseudo_mersenne'
+    assert detect_reduction(1009) == 'pseudo_mersenne'  # 1009 = 2^10 - 15
+    assert detect_reduction(613) == 'generic'
+    assert PrimeField(P25519, 'auto').reduction == 'pseudo_mersenne'
+    assert set(REDUCTIONS) == {'generic', 'pseudo_mersenne', 'nist_p256', 'montgomery'}
+    with pytest.raises(ValueError):
+        PrimeField(1009, 'nist_p256')
+    with pytest.raises(ValueError):
+        PrimeField(1009, 'karatsuba')
+
+
+def test_montgomery_form():
+    reducer = PrimeField(P256, 'montgomery').reducer
+    random.seed(7)
+    for _ in range(100):
+        a, b = random.randrange(P256), random.randrange(P256)
+        product = reducer.multiply(reducer.to_montgomery(a), reducer.to_montgomery(b))
+        assert reducer.from_montgomery(product) == a * b % P256
+
+
+def test_field_operations():
+    field = prime_field(1009)
+    assert prime_field(1009) is field  # поле кэшируется по p
+    assert EllipticCurve(1009, 2, 3).field is field
+    assert field.mul(500, 600) == 500 * 600 % 1009
+    assert field.sub(3, 5) == 1007 and field.neg(1) == 1008
+    assert field.mul(field.inv(123), 123) == 1
+    assert field.div(10, 5) == 2
+    for a in range(1, 1009):
+        root = field.sqrt(a)
+        assert (root is None) == (not field.is_square(a))
+        if root is not None:
+            assert root * root % 1009 == a
+    assert field.sqrt(0) == 0
+    assert pickle.loads(pickle.dumps(field)) is field
+
+
+def test_inverse_without_recursion_limit():
+    # Последовательные числа Фибоначчи - худший случай алгоритма Евклида:
+    # рекурсивная версия превышала предел глубины рекурсии.
+    a, b = 1, 1
+    for _ in range(5000):
+        a, b = b, a + b
+    g, x, y = extended_gcd(b, a)
+    assert g == 1 and b * x + a * y == 1
+    assert a * mod_inverse(a, b) % b == 1
+    with pytest.raises(ValueError):
+        mod_inverse(6, 9)
+
+
+@pytest.mark.parametrize('reduction', ['generic', 'nist_p256', 'montgomery'])
+def test_curve_arithmetic_with_reduction(reduction):
+    curve = EllipticCurve(P256, P256_A, P256_B, reduction)
+    assert curve.field.reduction == reduction
+    G = ECPoint(curve, *P256_G)
+    reference = ECPoint(EllipticCurve(P256, P256_A, P256_B), *P256_G)
+    random.seed(11)
+    for _ in range(5):
+        k = random.getrandbits(256)
+        R = k * G
+        expected = k * reference
+        assert (R.x, R.y) == (expected.x, expected.y)
+    assert ((G + G).x, (G + G).y) == (G.double().x, G.double().y)
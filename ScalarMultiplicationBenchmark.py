@@ -0,0 +1,105 @@
+import random
+import sys
+import time
+
+from ECPoint import ECPoint, mod_inverse, double_and_add
+from ECPointInf import ECPointInf
+from EllipticCurve import EllipticCurve
+from FixedBase import FixedBaseTable
+from MontgomeryLadder import montgomery_ladder, montgomery_ladder_x
+from MultiScalarMultiplication import multi_scalar_mul
+
+
+# Кривая secp256k1: y² = x³ + 7 над полем из 2^256 - 2^32 - 977 элементов.
+SECP256K1 = EllipticCurve(2**256 - 2**32 - 977, 0, 7)
+SECP256K1_G = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+               0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+
+# Кривая NIST P-256.
+P256 = EllipticCurve(0xFFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFF, -3,
+                     0x5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B)
+P256_G = (0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296,
+          0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5)
+
+
+def affine_double_and_add(P, scalar):
+    """
+    Исходный метод ECPoint.__mul__: правосторонний «удвоение-сложение»
+    в аффинных координатах с обращением на каждом шаге.
+    """
+    curve = P.curve
+    p = curve.p
+    result = ECPointInf(curve)
+    current = (P.x, P.y)
+    while scalar > 0:
+        if scalar % 2 == 1:
+            if isinstance(result, ECPointInf):
+                result = ECPoint(curve, *current)
+            else:
+                result = result + ECPoint(curve, *current)
+        x, y = current
+        if y == 0:
+            break
+        m = ((3 * x * x + curve.a) * mod_inverse(2 * y, p)) % p
+        x3 = (m * m - 2 * x) % p
+        current = (x3, (m * (x - x3) - y) % p)
+        scalar //= 2
+    return result
+
+
+def measure(label, multiply, scalars):
+    start = time.perf_counter()
+    for k in scalars:
+        multiply(k)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {len(scalars) / elapsed:10.1f} умн./с  {1000 * elapsed / len(scalars):8.3f} мс")
+
+
+def run(curve, generator, name, iterations):
+    G = ECPoint(curve, *generator)
+    scalars = [random.getrandbits(curve.p.bit_length()) for _ in range(iterations)]
+    expected = [affine_double_and_add(G, k) for k in scalars[:3]]
+    assert [repr(k * G) for k in scalars[:3]] == [repr(R) for R in expected]
+
+    print(f"{name} ({iterations} умножений):")
+    measure("аффинный double-and-add", lambda k: affine_double_and_add(G, k), scalars)
+    measure("якобиев double-and-add", lambda k: double_and_add(G, k), scalars)
+    measure("wNAF, временная таблица", lambda k: k * G, scalars)
+    for w in (4, 5, 6):
+        H = ECPoint(curve, *generator).precompute(w)
+        measure(f"wNAF w={w}, таблица точки", lambda k: k * H, scalars)
+    for w in (4, 6, 8):
+        table = FixedBaseTable(G, w)
+        measure(f"фиксированная точка, w={w}", table.multiply, scalars)
+    measure("лестница Монтгомери, только x", lambda k: montgomery_ladder_x(curve, G.x, k), scalars)
+    measure("лестница Монтгомери, x и y", lambda k: montgomery_ladder(G, k), scalars)
+
+
+def run_multi_scalar(curve, generator, name, sizes=(1, 4, 16, 64, 256)):
+    G = ECPoint(curve, *generator)
+    bits = curve.p.bit_length()
+    print(f"{name}, сумма n слагаемых k_i * P_i:")
+    for n in sizes:
+        points = [random.getrandbits(bits) * G for _ in range(n)]
+        scalars = [random.getrandbits(bits) for _ in range(n)]
+        start = time.perf_counter()
+        multi_scalar_mul(scalars, points)
+        combined = time.perf_counter() - start
+        start = time.perf_counter()
+        for k, P in zip(scalars, points):
+            k * P
+        separate = time.perf_counter() - start
+        print(f"  n={n:<4} multi_scalar_mul {1000 * combined / n:8.3f} мс/слагаемое, "
+              f"раздельно {1000 * separate / n:8.3f} мс/слагаемое")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    random.seed(1)
+    run(SECP256K1, SECP256K1_G, "secp256k1", iterations)
+    run(P256, P256_G, "P-256", iterations)
+    run_multi_scalar(SECP256K1, SECP256K1_G, "secp256k1")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,22 @@
 import math
-from ECPoint import ECPoint
+from array import array
+from CurveCache import get_cache
+from ECPoint import ECPoint, point_progression
 from ECPointInf import ECPointInf
+from Factorization import factorize
+from ModularArithmetic import legendre_symbol, tonelli_shanks
+from PointCounting import mestre_order, schoof_order
+from Primality import is_prime
+
+# Границы выбора алгоритма подсчёта точек в curve_order: полный перебор точек
+# при p < ENUMERATION_MAX_P, метод Местре при p < MESTRE_MAX_P, иначе алгоритм Шуфа.
+ENUMERATION_MAX_P = 2**12
+MESTRE_MAX_P = 2**64
+# Число точек, проверяемых prime_subgroup, прежде чем признать q-примарную часть
+# группы нециклической.
+SUBGROUP_RANK_SAMPLES = 32
+# Признак отсутствия значения в кэше (None хранится как значение).
+_MISSING = object()
 
 
 def point_neg(P):
@@ -10,216 +26,393 @@ def point_neg(P):
     """
     if isinstance(P, ECPointInf):
         return P
-    return ECPoint(P.curve, P.x, (-P.y) % P.curve.p)
+    return ECPoint._unchecked(P.curve, P.x, (-P.y) % P.curve.p)
 
 
-def legendre_symbol(a, p):
+def iter_points(curve, x_start=0, x_stop=None):
     """
-       Вычисляет символ Лежандра (a / p), который равен:
-       -1, если a является квадратичным вычетом по модулю p,
-       1, если a не является квадратичным вычетом по модулю p,
-       и 0, если a делится на p.
+    Лениво перечисляет точки кривой с абсциссами из диапазона [x_start, x_stop)
+    (по умолчанию - все точки), используя постоянный объём памяти.
+    Бесконечно удалённая точка выдаётся первой, если диапазон начинается с нуля,
+    поэтому перебор можно разбить на независимые части по диапазонам абсцисс.
 
-       Аргументы:
-       a -- Целое число, для которого вычисляется символ Лежандра
-       p -- Простое число, модуль
-
-       Возвращает:
-       1, -1 или 0 в зависимости от значения символа Лежандра.
-       """
-    ls = pow(a, (p - 1) // 2, p)
-    if ls == p - 1:
-        return -1
-    return ls
-
-
-def tonelli_shanks(n, p):
+    Координаты получаются извлечением корня из правой части уравнения кривой,
+    поэтому точки создаются без повторной проверки принадлежности кривой.
     """
-      Алгоритм Тонелли-Шэнкса для нахождения квадратичного корня по модулю простого числа p
-      при условии, что корень существует (символ Лежандра равен 1).
-
-      Аргументы:
-      n -- Число, для которого нужно найти квадратичный корень
-      p -- Простое число, модуль
-
-      Возвращает:
-      Квадратичный корень n по модулю p, если он существует, иначе None.
-      """
-    if legendre_symbol(n, p) != 1:
-        return None
-    if n == 0:
-        return 0
-    if p == 2:
-        return p
-    if p % 4 == 3:
-        x = pow(n, (p + 1) // 4, p)
-        return x
-    Q = p - 1
-    S = 0
-    while Q % 2 == 0:
-        Q //= 2
-        S += 1
-    z = 2
-    while legendre_symbol(z, p) != -1:
-        z += 1
-    c = pow(z, Q, p)
-    x = pow(n, (Q + 1) // 2, p)
-    t = pow(n, Q, p)
-    m = S
-    while t != 1:
-        i, temp = 0, t
-        while temp != 1 and i < m:
-            temp = pow(temp, 2, p)
-            i += 1
-        if i == m:
-            return None
-        b = pow(c, 1 << (m - i - 1), p)
-        x = (x * b) % p
-        t = (t * b * b) % p
-        c = (b * b) % p
-        m = i
-    return x
+    p = curve.p
+    if x_stop is None:
+        x_stop = p
+    if x_start == 0:
+        yield ECPointInf(curve)
+    for x in range(x_start, x_stop):
+        rhs = (pow(x, 3, p) + curve.a * x + curve.b) % p
+        if legendre_symbol(rhs, p) == 1:
+            y = tonelli_shanks(rhs, p)
+            yield ECPoint._unchecked(curve, x, y)
+            yield ECPoint._unchecked(curve, x, (-y) % p)
+        elif rhs == 0:
+            yield ECPoint._unchecked(curve, x, 0)
 
 
 def find_points(curve):
-    points = [ECPointInf(curve)]
-    for x in range(curve.p):
-        rhs = (pow(x, 3, curve.p) + curve.a * x + curve.b) % curve.p
-        if legendre_symbol(rhs, curve.p) == 1:
-            y = tonelli_shanks(rhs, curve.p)
-            points.append(ECPoint(curve, x, y))
-            points.append(ECPoint(curve, x, (-y) % curve.p))
-        elif rhs == 0:
-            points.append(ECPoint(curve, x, 0))
-    return points
+    return list(iter_points(curve))
 
 
 def naive_order(curve):
-    return len(find_points(curve))
+    return sum(1 for _ in iter_points(curve))
 
 
-def bsgs(curve, P, Q, n=None):
+class CompactBabyStepTable:
+    """
+    Компактная таблица baby-шагов: хеш-таблица с открытой адресацией поверх
+    массивов array('Q'). Хранит 64-битный отпечаток абсциссы и номер шага j
+    (16 байт на запись вместо словаря кортежей). Совпадение отпечатков не
+    гарантирует совпадения абсцисс, поэтому найденные кандидаты проверяются.
+    """
+    def __init__(self, size):
+        capacity = 1
+        while capacity < 2 * size:
+            capacity *= 2
+        self.mask = capacity - 1
+        self.keys = array('Q', bytes(8 * capacity))
+        self.values = array('Q', bytes(8 * capacity))
+
+    @staticmethod
+    def fingerprint(x):
+        return x % 0xFFFFFFFFFFFFFFFF + 1  # ноль обозначает пустую ячейку
+
+    def add(self, x, j):
+        key = self.fingerprint(x)
+        i = key & self.mask
+        while self.keys[i]:
+            i = (i + 1) & self.mask
+        self.keys[i] = key
+        self.values[i] = j
+
+    def get(self, x):
+        key = self.fingerprint(x)
+        i = key & self.mask
+        found = []
+        while self.keys[i]:
+            if self.keys[i] == key:
+                found.append(self.values[i])
+            i = (i + 1) & self.mask
+        return found
+
+
+def bsgs(curve, P, Q, n=None, max_table_size=None, compact=False):
     """
     Решает задачу дискретного логарифма в циклической подгруппе,
     порождённой точкой P, то есть ищет такое целое d, что
         d * P = Q.
-    Если порядок n подгруппы не задан (n=None), то он вычисляется наивно.
+    Если порядок n подгруппы не задан (n=None), то он вычисляется функцией point_order.
+    Для больших подгрупп см. DiscreteLog.discrete_log.
 
     Алгоритм:
-      1. Выбирается m = ceil(sqrt(n)).
-      2. Вычисляются baby-шаги: для j от 0 до m-1 сохраняется значение j*P.
-      3. Выполняются giant-шаги: ищется такое i, что
-             Q - i*(m*P)
-         встречается среди baby-шагов.
-         Тогда d = i*m + j.
-    """
-    # Если порядок n не задан, вычисляем его наивно (подойдёт для небольших кривых).
+      1. Выбирается m ≈ sqrt(n / 2).
+      2. Baby-шаги: последовательными сложениями вычисляются j*P для j от 1 до m,
+         в таблицу записывается только абсцисса: точки ±j*P имеют одну абсциссу,
+         поэтому таблица из m записей покрывает окно из 2m + 1 значений.
+      3. Giant-шаги с шагом s = 2m + 1: ищется такое i, что абсцисса
+             Q - i*(s*P)
+         встречается среди baby-шагов. Тогда d = i*s ± j (знак проверяется).
+    Если задан max_table_size < m, baby-шаги разбиваются на окна не более чем
+    по max_table_size значений j: таблица строится для каждого окна заново, и для
+    каждого окна повторяется полный проход giant-шагов. Память ограничена размером
+    окна, а число giant-шагов растёт пропорционально числу окон.
+    При compact=True таблица хранится в CompactBabyStepTable вместо словаря.
+    """
+    # Если порядок n не задан, вычисляем порядок точки P.
     if n is None:
-        current = P
-        n = 1
-        while not isinstance(current, ECPointInf):
-            current = current + P
-            n += 1
-            # Ограничение для предотвращения зацикливания на больших группах.
-            if n > curve.p + 5:
+        n = point_order(P)
+
+    m = math.isqrt(n // 2) + 1
+    s = 2 * m + 1
+    window = m if max_table_size is None else max(1, min(m, max_table_size))
+    neg_sP = point_neg(s * P)
+
+    for first in range(1, m + 1, window):
+        size = min(window, m + 1 - first)
+        # Baby-шаги окна: для j от first до first + size - 1 сохраняем абсциссу j * P.
+        baby_steps = CompactBabyStepTable(size) if compact else {}
+        exhausted = False
+        for j, point in enumerate(point_progression(first * P, P, size), start=first):
+            if isinstance(point, ECPointInf):
+                exhausted = True  # порядок P не больше j: дальнейшие шаги повторяют уже найденные
                 break
+            if compact:
+                baby_steps.add(point.x, j)
+            else:
+                baby_steps.setdefault(point.x, j)
 
-    m = int(math.ceil(math.sqrt(n)))
-
-    # Baby-шаги: для j от 0 до m-1 вычисляем j * P.
-    baby_steps = {}
-    for j in range(m):
-        point = j * P
-        key = 'inf' if isinstance(point, ECPointInf) else (point.x, point.y)
-        baby_steps[key] = j
-
-    mP = m * P
-    neg_mP = point_neg(mP)
-
-    # Giant-шаги: ищем i от 0 до m-1, для которого
-    # Q - i*(mP) встречается в baby_steps.
-    gamma = Q
-    for i in range(m):
-        key = 'inf' if isinstance(gamma, ECPointInf) else (gamma.x, gamma.y)
-        if key in baby_steps:
-            j = baby_steps[key]
-            d = i * m + j
-            return d % n  # возвращаем наименьшее неотрицательное решение
-        gamma = gamma + neg_mP  # эквивалентно: gamma = gamma - mP
+        d = _giant_steps(P, Q, n, s, neg_sP, baby_steps, compact)
+        if d is not None or exhausted:
+            return d
 
     return None  # если решение не найдено
 
 
+def _giant_steps(P, Q, n, s, neg_sP, baby_steps, compact):
+    """
+    Проход giant-шагов bsgs: ищет i, для которого Q - i*(sP) = ±j*P
+    при j из таблицы baby_steps, и возвращает d = i*s ± j или None.
+    """
+    for i, gamma in enumerate(point_progression(Q, neg_sP, n // s + 2)):
+        if isinstance(gamma, ECPointInf):
+            return (i * s) % n
+        if compact:
+            candidates = baby_steps.get(gamma.x)
+        else:
+            candidates = [baby_steps[gamma.x]] if gamma.x in baby_steps else []
+        for j in candidates:
+            for d in ((i * s + j) % n, (i * s - j) % n):
+                R = d * P
+                if not isinstance(R, ECPointInf) and R.x == Q.x and R.y == Q.y:
+                    return d  # возвращаем неотрицательное решение, меньшее n
+    return None
+
+
 def curve_order(curve, max_trials=10):
-    points = find_points(curve)
-    #if len(points) < 2 ** 10 or len(points) > 2 ** 512:
-    #    raise ValueError("Порядок кривой не входит в требуемый диапазон.")
-    return len(points)
+    """
+    Вычисляет порядок группы точек кривой, выбирая алгоритм по размеру p:
+    перебор точек для малых p, метод Местре (max_trials попыток подбора случайных
+    точек) для средних и алгоритм Шуфа для больших p или если метод Местре
+    не дал однозначного ответа. Результат хранится в кэше инвариантов кривой.
+    """
+    cache = get_cache()
+    order = cache.get(curve, 'order')
+    if order is None:
+        order = cache.put(curve, 'order', _compute_curve_order(curve, max_trials))
+    return order
+
+
+def _compute_curve_order(curve, max_trials):
+    p = curve.p
+    if p < ENUMERATION_MAX_P:
+        return naive_order(curve)
+    if p < MESTRE_MAX_P:
+        order = mestre_order(curve, max_trials)
+        if order is not None:
+            return order
+    return schoof_order(curve)
+
+
+class CyclicSubgroup:
+    """
+    Ленивая циклическая подгруппа <G> порядка n: k-й элемент равен k * G
+    (нулевой - бесконечно удалённая точка). Элементы не хранятся: индексация
+    выполняется скалярным умножением, перебор - последовательными сложениями,
+    проверка принадлежности - решением задачи дискретного логарифма bsgs.
+    """
+    def __init__(self, generator, order):
+        self.curve = generator.curve
+        self.generator = generator
+        self.order = order
+
+    def __len__(self):
+        return self.order
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(self.order)[k]]
+        if not -self.order <= k < self.order:
+            raise IndexError("Индекс вне подгруппы.")
+        return (k % self.order) * self.generator
+
+    def __iter__(self):
+        point = ECPointInf(self.curve)
+        for _ in range(self.order):
+            yield point
+            point = point + self.generator
+
+    def index(self, Q):
+        """
+        Возвращает k, такое что k * G = Q; если Q не лежит в подгруппе - ValueError.
+        """
+        if isinstance(Q, ECPointInf):
+            return 0
+        if isinstance(self.order * Q, ECPointInf):
+            k = bsgs(self.curve, self.generator, Q, self.order)
+            if k is not None:
+                return k
+        raise ValueError("Точка не принадлежит подгруппе.")
+
+    def __contains__(self, Q):
+        if Q.curve != self.curve:
+            return False
+        try:
+            self.index(Q)
+        except ValueError:
+            return False
+        return True
+
+    def __repr__(self):
+        return f"<{self.generator}> порядка {self.order}"
+
+
+def prime_subgroup(curve, q):
+    """
+    Подгруппа простого порядка q, делящего порядок кривой, в виде CyclicSubgroup.
+
+    Точка P умножается на кофактор order / q^v (v - кратность q в порядке), что даёт
+    элемент T q-примарной части группы; если T имеет порядок q^v, то q^(v-1) * T -
+    образующая единственной подгруппы порядка q. Если q-примарная часть не циклическая
+    (тогда все q² точек q-кручения рациональны, что возможно лишь при v ≥ 2 и q | p - 1),
+    точки порядка q не образуют одной подгруппы, и возвращается None.
+    При циклической q-примарной части элемент T случайной точки имеет порядок q^v
+    с вероятностью не меньше 1 - 1/q, поэтому нецикличность признаётся, только если
+    ни одна из SUBGROUP_RANK_SAMPLES точек не дала элемента порядка q^v.
+    Образующая сохраняется в кэше инвариантов кривой.
+    """
+    cache = get_cache()
+    name = f'subgroup:{q}'
+    generator = cache.get(curve, name, _MISSING)
+    if generator is _MISSING:
+        subgroup = _find_prime_subgroup(curve, q)
+        cache.put(curve, name, None if subgroup is None else [subgroup.generator.x, subgroup.generator.y])
+        return subgroup
+    if generator is None:
+        return None
+    return CyclicSubgroup(ECPoint(curve, *generator), q)
+
+
+def _primary_element(curve, order, q, v):
+    """
+    Элемент порядка q^v из q-примарной части группы (точка, умноженная на кофактор
+    order / q^v), либо None, если q-примарная часть не циклическая.
+
+    Нецикличность возможна лишь при v ≥ 2 и q | p - 1; тогда она признаётся, если ни одна
+    из SUBGROUP_RANK_SAMPLES точек не дала элемента порядка q^v. При циклической части
+    случайная точка даёт такой элемент с вероятностью не меньше 1 - 1/q.
+    """
+    cofactor = order // q ** v
+    may_split = v >= 2 and (curve.p - 1) % q == 0
+    samples = 0
+    for point in iter_points(curve):
+        T = cofactor * point
+        if isinstance(T, ECPointInf):
+            continue
+        if not isinstance((q ** (v - 1)) * T, ECPointInf):
+            return T
+        samples += 1
+        if may_split and samples >= SUBGROUP_RANK_SAMPLES:
+            break
+    return None
+
+
+def _find_prime_subgroup(curve, q):
+    order, factors = curve_order_factorization(curve)
+    v = factors.get(q, 0)
+    if v == 0:
+        return None
+    T = _primary_element(curve, order, q, v)
+    if T is None:
+        return None
+    return CyclicSubgroup((q ** (v - 1)) * T, q)
+
+
+def group_generator(curve):
+    """
+    Образующая группы точек кривой, если группа циклическая, иначе None.
+
+    Для каждого простого q, делящего порядок, ищется элемент порядка q^v в q-примарной
+    части (точка, умноженная на кофактор order / q^v); сумма этих элементов порождает
+    всю группу. Если хотя бы одна q-примарная часть не циклическая (см. prime_subgroup),
+    не циклична и группа. Результат сохраняется в кэше инвариантов кривой.
+    """
+    cache = get_cache()
+    generator = cache.get(curve, 'generator', _MISSING)
+    if generator is not _MISSING:
+        return None if generator is None else ECPoint(curve, *generator)
+    order, factors = curve_order_factorization(curve)
+    G = ECPointInf(curve)
+    for q, v in factors.items():
+        T = _primary_element(curve, order, q, v)
+        if T is None:
+            cache.put(curve, 'generator', None)
+            return None
+        G = G + T
+    cache.put(curve, 'generator', None if isinstance(G, ECPointInf) else [G.x, G.y])
+    return G
 
 
 def find_prime_subgroups_orders(curve):
-    order = curve_order(curve)
-    factors = {}
-    n = order
-    i = 2
-    while i * i <= n:
-        while n % i == 0:
-            factors[i] = factors.get(i, 0) + 1
-            n = n // i
-        i += 1
-    if n > 1:
-        factors[n] = 1
-    prime_factors = list(factors.keys())
-    subgroups = []
-    for p in prime_factors:
-        for point in find_points(curve):
-            if not isinstance(point, ECPointInf):
-                candidate = (order // p) * point
-                if isinstance(candidate, ECPointInf):
-                    subgroups.append(p)
-                    break
-    return subgroups
+    """
+    Простые делители q порядка кривой, для которых есть точка P ≠ O с (order / q) * P = O.
+    По теореме Коши такая точка существует при любом order / q > 1, поэтому
+    перебор точек не нужен: исключается лишь случай простого порядка кривой.
+    """
+    order, factors = curve_order_factorization(curve)
+    return [q for q in factors if q != order]
 
 
-def find_prime_subgroups(curve):
+def find_prime_subgroups(curve, lazy=False):
     """
     Нахождение простых подгрупп кривой.
     Возвращает список подгрупп, каждая из которых состоит из точек данной кривой,
     которые соответствуют простым делителям порядка кривой.
-    """
-    order = curve_order(curve)
-    factors = {}
-    n = order
-    i = 2
-    while i * i <= n:
-        while n % i == 0:
-            factors[i] = factors.get(i, 0) + 1
-            n = n // i
-        i += 1
-    if n > 1:
-        factors[n] = 1
-    prime_factors = list(factors.keys())
 
+    Для каждого простого q образующая строится функцией prime_subgroup за O(log order)
+    умножений, а элементы получаются последовательными сложениями, т.е. за O(q)
+    операций вместо перебора всех точек кривой. При lazy=True вместо списков
+    возвращаются ленивые объекты CyclicSubgroup.
+    """
+    order, factors = curve_order_factorization(curve)
     subgroups = []
-    for p in prime_factors:
+    for p in factors:
         if p == order:  # Исключаем порядок, равный самому порядку кривой, если он не является простым
             continue
-        subgroup = [ECPointInf(curve)]  # Подгруппа обязательно включает точку в бесконечности
-        for point in find_points(curve):
-            if isinstance(point, ECPointInf):
-                continue
-            if point_order(point) == p:
-                subgroup.append(point)
-        if len(subgroup) == p:  # В подгруппе должно быть p точек, включая точку в бесконечности
-            subgroups.append(subgroup)
+        subgroup = prime_subgroup(curve, p)
+        if subgroup is not None:
+            subgroups.append(subgroup if lazy else list(subgroup))
     return subgroups
 
 
-def point_order(P):
+def curve_order_factorization(curve):
+    """
+    Возвращает порядок группы точек кривой и его разложение {простое: кратность}.
+    Результат хранится в кэше инвариантов кривой (CurveCache), поэтому повторные
+    вызовы для той же кривой не пересчитывают ни порядок, ни разложение.
+    """
+    order = curve_order(curve)
+    cache = get_cache()
+    factors = cache.get(curve, 'factors')
+    if factors is None:
+        factors = cache.put(curve, 'factors', [list(item) for item in factorize(order).items()])
+    return order, {q: e for q, e in factors}
+
+
+def point_order(P, order=None):
     """
     Нахождение порядка точки P на эллиптической кривой.
     Порядок точки - минимальное целое число k, такое что k * P = O (точка в бесконечности).
-    Если точка P имеет бесконечный порядок, возвращается None.
+
+    Порядок точки делит порядок группы n (если он не задан, берётся из кэша
+    curve_order_factorization), поэтому из n поочерёдно исключаются простые
+    множители q, пока (n / q) * P = O. Требуется O(log n) умножений на каждый
+    простой множитель вместо O(ord P) сложений.
+    """
+    if isinstance(P, ECPointInf):
+        return 1
+    if order is None:
+        order, factors = curve_order_factorization(P.curve)
+    else:
+        factors = factorize(order)
+    if not isinstance(order * P, ECPointInf):
+        # n не является кратным порядка точки (например, при составном p)
+        return naive_point_order(P)
+    k = order
+    for q, e in factors.items():
+        for _ in range(e):
+            if not isinstance((k // q) * P, ECPointInf):
+                break
+            k //= q
+    return k
+
+
+def naive_point_order(P):
+    """
+    Порядок точки P, найденный последовательным прибавлением P до получения O.
     """
     if isinstance(P, ECPointInf):
         return 1
@@ -230,7 +423,6 @@ def point_order(P):
         k += 1
         if isinstance(P, ECPointInf):
             return k
-    return None
 
 
 def point_of_order(curve, order):
@@ -239,16 +431,9 @@ def point_of_order(curve, order):
     Возвращает точку P на кривой, такую что P * order = O.
     Если такой точки не существует, возвращает None.
     """
-    points = find_points(curve)
-    for point in points:
+    for point in iter_points(curve):
         if isinstance(point, ECPointInf):
             continue
         if point_order(point) == order:
             return point
     return None
-
-def is_prime(num):
-    for i in range(2, int(num**0.5) + 1):
-        if num % i == 0:
-            return False
-    return True
\ No newline at end of file
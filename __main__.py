@@ -1,3 +1,6 @@
+import argparse
+
+import BatchMode
 from ECPoint import ECPoint
 from ECPointInf import ECPointInf
 from EllipticCurve import EllipticCurve
@@ -83,7 +86,21 @@ def add_points(curve):
     print(f"Сумма точек P1 + P2 = {result_point}")
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Работа с эллиптическими кривыми над конечными полями.")
+    parser.add_argument('--batch', nargs='?', const='-', metavar='FILE',
+                        help="пакетный режим: запросы JSON Lines из файла (без имени - из stdin)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="число рабочих процессов пакетного режима")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.batch is not None:
+        BatchMode.run(args.batch, args.workers)
+        return
+
     print("Добро пожаловать в программу для работы с эллиптическими кривыми!")
 
     curve = introduce_curve()